@@ -0,0 +1,68 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from scrapy.utils.project import get_project_settings
+
+from gather_vision.obtain.core import data
+from gather_vision.obtain.core.job import WebDataJob
+from gather_vision.obtain.core.utils import GatherVisionException
+from gather_vision.obtain.place import web_data_registry
+
+
+class Command(BaseCommand):
+    help = "List, inspect, resume, or discard partial web data crawl jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "action",
+            choices=["list", "inspect", "resume", "discard"],
+            help="What to do with the crawl jobs.",
+        )
+        parser.add_argument(
+            "sources",
+            nargs="*",
+            help="The web data names or glob patterns. Uses all jobs if not given.",
+        )
+
+    def handle(self, *args, **options):
+        logger = logging.getLogger(__name__)
+        logger.info(f"Running {__name__}")
+
+        action = options.get("action")
+        settings = get_project_settings()
+
+        try:
+            names = set(web_data_registry.select(options.get("sources")))
+        except GatherVisionException as e:
+            raise CommandError(str(e)) from e
+
+        jobs = [i for i in WebDataJob.find_all(settings) if i.name in names]
+
+        if action == "list":
+            for job in jobs:
+                self.stdout.write(job.name)
+
+        elif action == "inspect":
+            for job in jobs:
+                info = job.info()
+                self.stdout.write(
+                    f"{info.name}: {info.pending_requests} pending requests, "
+                    f"{info.seen_requests} seen requests, "
+                    f"{info.size_bytes} bytes in '{info.path}'"
+                )
+
+        elif action == "discard":
+            for job in jobs:
+                job.discard()
+                self.stdout.write(f"Discarded {job.name}")
+
+        elif action == "resume":
+            if not jobs:
+                self.stdout.write("No crawl jobs to resume.")
+                return
+            web_data_sources = [web_data_registry.load(i.name) for i in jobs]
+            web_items = data.DataLoad().run_web(web_data_sources)
+            for web_item in web_items:
+                pass
+
+        logger.info(f"Finished {__name__}")
@@ -1,43 +1,51 @@
 import logging
 
-from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
-from gather_vision.services.data.manage import FixtureManager, DataLoaderManager
-
-from gather_vision.services.web.client import DownloadClient
+from gather_vision.obtain.core import data
+from gather_vision.obtain.core.utils import GatherVisionException
+from gather_vision.obtain.place import web_data_registry
 
 
 class Command(BaseCommand):
-    help = (
-        "Loads data for gather-vision. "
-        "Uses manually-specified data, raw data, and data obtained from the web."
-    )
+    help = "Load data from the web data sources."
 
     def add_arguments(self, parser):
-        pass
+        parser.add_argument(
+            "sources",
+            nargs="*",
+            help="The web data names or glob patterns to run. Runs all if not given.",
+        )
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            help="List the web data names and exit.",
+        )
 
     def handle(self, *args, **options):
-        logger = logging.getLogger("gathervision.core")
-        logger.info("Starting to load gather-vision data.")
-
-        # load all fixtures
-        fm = FixtureManager()
-        fm.run(settings.FIXTURE_DIRS)
-
-        # load data from files and web
-        pref = "gather_vision.services"
-        data_loaders = [
-            f"{pref}.water.au_bom_river_height.loaders.AuBomRiverHeights",
-            f"{pref}.water.au_qld_bcc_waterways.loaders.AuQldBccWaterways",
-            f"{pref}.petition.au_parliament.loaders.AuParliamentPetitions",
-        ]
-        dlm = DataLoaderManager()
-        dl_loaders = list(dlm.run(settings.VISION_DATA_DIR, data_loaders))
-
-        # run web loaders
-        logger.info(f"Running {len(dl_loaders)} downloaders.")
-        dl_client = DownloadClient()
-        dl_client.scrapy(*dl_loaders)
-
-        logger.info("Finished loading gather-vision data.")
+        logger = logging.getLogger(__name__)
+        logger.info(f"Running {__name__}")
+
+        if options.get("list"):
+            for name in web_data_registry.names():
+                self.stdout.write(name)
+            return
+
+        try:
+            web_data_sources = web_data_registry.load_selected(options.get("sources"))
+        except GatherVisionException as e:
+            raise CommandError(str(e)) from e
+
+        data_load = data.DataLoad()
+
+        # local
+        local_items = data_load.run_local([])
+        for local_item in local_items:
+            pass
+
+        # web
+        web_items = data_load.run_web(web_data_sources)
+        for web_item in web_items:
+            pass
+
+        logger.info(f"Finished {__name__}")
@@ -0,0 +1,45 @@
+import logging
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from gather_vision.obtain.core import reparse
+from gather_vision.obtain.core.utils import GatherVisionException
+from gather_vision.obtain.place import web_data_registry
+
+
+class Command(BaseCommand):
+    help = (
+        "Parse the stored responses for web data sources again, "
+        "from the HTTP cache or artifact store, without using the network."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "sources",
+            nargs="*",
+            help="The web data names or glob patterns. Uses all sources if not given.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="The number of web data sources to reparse at the same time.",
+        )
+
+    def handle(self, *args, **options):
+        logger = logging.getLogger(__name__)
+        logger.info(f"Running {__name__}")
+
+        try:
+            names = web_data_registry.select(options.get("sources"))
+        except GatherVisionException as e:
+            raise CommandError(str(e)) from e
+
+        for result in reparse.reparse_all(names, options.get("processes")):
+            self.stdout.write(
+                f"{result.name}: {result.responses} responses, "
+                f"{result.items} items, {result.missing} missing"
+            )
+
+        logger.info(f"Finished {__name__}")
@@ -4,10 +4,10 @@ from asgiref.sync import sync_to_async
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models as db_models
 from django.contrib.auth.models import AbstractUser
-from django.utils.text import slugify
 
 from gather_vision.obtain.core import models as core_models
 from gather_vision.obtain.core.data import GatherDataArea
+from gather_vision.obtain.core.text import TermMatcher, slug
 
 
 class CustomUser(AbstractUser):
@@ -170,7 +170,7 @@ class Area(
         # then use the area as the parent of the next area
         current: Area | None = None
         for d in definitions:
-            query = {"name": slugify(d.title), "level": d.level}
+            query = {"name": slug(d.title), "level": d.level}
             defaults = {"title": d.title}
             new_obj = Area(**{**defaults, **query})
 
@@ -182,6 +182,8 @@ class Area(
             current, created = await Area.objects.aget_or_create(
                 **query, defaults=defaults
             )
+            if created:
+                area_matcher.add(current)
 
         # return the last area, which is the 'most precise' area
         return current
@@ -230,7 +232,7 @@ class Origin(
     async def from_obtain_data(
         cls, title: str, description: str | None, url: str | None, area: Area | None
     ) -> "Origin":
-        query = {"name": slugify(title)}
+        query = {"name": slug(title)}
         defaults = {
             "title": title,
             "description": description,
@@ -287,7 +289,7 @@ class Gatherer(
         description: str,
         url: str | None = None,
     ) -> "Gatherer":
-        query = {"name": slugify(title), "gather_type": gather_type}
+        query = {"name": slug(title), "gather_type": gather_type}
         defaults = {"title": title, "description": description, "url": url}
 
         new_obj = Gatherer(**{**defaults, **query})
@@ -295,3 +297,92 @@ class Gatherer(
 
         obj, created = await Gatherer.objects.aget_or_create(**query, defaults=defaults)
         return obj
+
+
+class AreaMatcher:
+    """Find the titles of areas in text.
+
+    The area titles are kept in memory, so a text is searched in one scan.
+    The areas are loaded from the database by :meth:`arefresh`,
+    which only loads the areas added since the previous refresh.
+    Areas created by :meth:`Area.from_obtain_data` are added straight away.
+    """
+
+    def __init__(
+        self, levels: typing.Iterable[str] = (Area.LEVEL_NEIGHBOURHOOD,)
+    ) -> None:
+        self._levels = frozenset(levels)
+        self._matcher = TermMatcher()
+        self._titles: dict[int, str] = {}
+        self._areas: dict[str, list[int]] = {}
+        self._last_pk = 0
+
+    @property
+    def levels(self) -> frozenset[str]:
+        """The levels of the areas to find."""
+        return self._levels
+
+    def add(self, area: Area) -> bool:
+        """Add an area.
+
+        Args:
+            area: The area.
+
+        Returns:
+            True if the area is at one of the levels and was not already added.
+        """
+        if area.level not in self._levels:
+            return False
+        if not self._matcher.add(area.title, area.pk):
+            return False
+        self._titles[area.pk] = area.title
+        self._areas.setdefault(TermMatcher.normalise(area.title), []).append(area.pk)
+        return True
+
+    async def arefresh(self) -> int:
+        """Load the areas added to the database since the previous refresh.
+
+        Returns:
+            The number of areas loaded.
+        """
+        count = 0
+        query = Area.objects.filter(level__in=self._levels, pk__gt=self._last_pk)
+        async for area in query.only("pk", "title", "level").order_by("pk"):
+            if self.add(area):
+                count += 1
+            self._last_pk = area.pk
+        return count
+
+    def find(self, value: str) -> list[str]:
+        """Find the area titles in a text.
+
+        Args:
+            value: The text to search.
+
+        Returns:
+            The distinct titles, in the order they first appear.
+        """
+        titles = [self._titles[i.values[0]] for i in self._matcher.find(value or "")]
+        return list(dict.fromkeys(titles))
+
+    async def aresolve(self, titles: typing.Iterable[str]) -> list[Area]:
+        """Get the areas for titles found by :meth:`find`.
+
+        Args:
+            titles: The area titles.
+
+        Returns:
+            The areas, which can be more than one for each title.
+        """
+        pks = [
+            pk
+            for title in titles
+            for pk in self._areas.get(TermMatcher.normalise(title), [])
+        ]
+        if not pks:
+            return []
+        return [i async for i in Area.objects.filter(pk__in=pks).order_by("pk")]
+
+
+area_matcher = AreaMatcher()
+"""The shared matcher for suburbs and other neighbourhoods."""
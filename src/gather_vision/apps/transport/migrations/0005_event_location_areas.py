@@ -0,0 +1,26 @@
+# Generated by Django 5.1 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        (
+            "explore",
+            "0005_alter_area_name_alter_area_title_alter_gatherer_name_and_more",
+        ),
+        ("transport", "0004_alter_event_category_alter_event_name_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="location_areas",
+            field=models.ManyToManyField(
+                blank=True,
+                help_text="The areas described by the locations.",
+                related_name="transport_event_locations",
+                to="explore.area",
+            ),
+        ),
+    ]
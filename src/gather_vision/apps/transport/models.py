@@ -3,10 +3,10 @@ import typing
 from datetime import datetime
 
 from django.db import models as db_models
-from django.utils.text import slugify
 
 from gather_vision.apps.explore import models as explore_models
 from gather_vision.obtain.core import models as core_models, data
+from gather_vision.obtain.core.text import slug
 
 logger = logging.getLogger(__name__)
 
@@ -63,7 +63,7 @@ class Group(
 
     @classmethod
     async def from_obtain_data(cls, title: str, category: str) -> "Group":
-        query = {"name": slugify(title), "category": category}
+        query = {"name": slug(title), "category": category}
         defaults = {"title": title}
 
         new_obj = Group(**{**defaults, **query})
@@ -77,7 +77,7 @@ class Group(
         cls, raw: typing.Iterable[str]
     ) -> typing.Iterable[tuple[str, str]]:
         for item in raw:
-            value = slugify(item)
+            value = slug(item)
             if all([("ferry" in value or "ferries" in value)]):
                 yield item, cls.CATEGORY_FERRY
             if all([("tram" in value)]):
@@ -182,6 +182,12 @@ class Event(
         max_length=500,
         help_text="The locations covered by the event.",
     )
+    location_areas = db_models.ManyToManyField(
+        explore_models.Area,
+        blank=True,
+        related_name="transport_event_locations",
+        help_text="The areas described by the locations.",
+    )
 
     objects = EventManager()
 
@@ -219,8 +225,9 @@ class Event(
         category: str,
         severity: str,
         locations: list[str],
+        location_areas: list[explore_models.Area] | None = None,
     ):
-        query = {"name": slugify(title), "origin": origin}
+        query = {"name": slug(title), "origin": origin}
         defaults = {
             "title": title,
             "retrieved_date": retrieved_date,
@@ -234,7 +241,7 @@ class Event(
             "stop_date": stop_date,
             "category": category,
             "severity": severity,
-            "locations": "; ".join(locations),
+            "locations": cls.join_locations(locations),
         }
         new_obj = Event(**{**defaults, **query})
         await cls.do_validation(new_obj)
@@ -242,9 +249,24 @@ class Event(
         obj, created = await Event.objects.aget_or_create(**query, defaults=defaults)
 
         await obj.groups.aset(groups)
+        # keep the stored areas when none were found, such as before they are loaded
+        if location_areas:
+            await obj.location_areas.aset(location_areas)
 
         return obj
 
+    @classmethod
+    def join_locations(cls, locations: list[str]) -> str:
+        # keep the locations that fit, the location areas are not limited
+        max_length = cls._meta.get_field("locations").max_length
+        result = ""
+        for location in locations:
+            joined = f"{result}; {location}" if result else location
+            if len(joined) > max_length:
+                break
+            result = joined
+        return result or (locations[0][:max_length] if locations else "")
+
     _store_category_raw = set()
 
     @classmethod
@@ -252,7 +274,7 @@ class Event(
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug("%s category: %s", cls.__name__, raw)
 
-        entries: list[str] = slugify(raw or "").split("-")
+        entries: list[str] = slug(raw or "").split("-")
         if not entries or not [i for i in entries if i]:
             return None
 
@@ -264,11 +286,7 @@ class Event(
                 "%s category: %s", cls.__name__, sorted(cls._store_category_raw)
             )
 
-        for event_cat_option in event_cat_options:
-            if event_cat_option.check(entries):
-                return event_cat_option.label
-
-        return None
+        return event_cat_classifier.classify(entries)
 
         # is_park_n_ride_only = {"park", "n", "ride"}
         # is_station = {"station", "stations", "platform", "platforms", "entrance"}
@@ -369,3 +387,5 @@ event_cat_options = [
         allow_unmatched=True,
     ),
 ]
+
+event_cat_classifier = data.GatherDataClassifier(event_cat_options)
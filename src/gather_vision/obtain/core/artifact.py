@@ -0,0 +1,185 @@
+"""Keep raw downloaded files, so they can be parsed again without the network."""
+
+import contextlib
+import dataclasses
+import hashlib
+import json
+import logging
+import pathlib
+import tempfile
+import typing
+from datetime import datetime, timezone
+
+from scrapy import settings as scrapy_settings
+
+from gather_vision.obtain.core.stream import open_spooled
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class ArtifactRecord:
+    """The details of one stored download of an artifact."""
+
+    sha256: str
+    """The hash of the content, which is also the object name."""
+
+    url: str
+    """The url that provided the content."""
+
+    run: str
+    """The crawl run that downloaded the content."""
+
+    name: str
+    """The web data name."""
+
+    size: int
+    """The content size in bytes."""
+
+    content_type: str
+    """The response content type."""
+
+    stored_at: str
+    """The date and time the record was added, in ISO format."""
+
+
+class ArtifactStore:
+    """A content-addressed store of raw downloaded files.
+
+    Each distinct content is stored once, named by its sha256 hash.
+    An index records each url and run that provided the content.
+    """
+
+    index_name = "index.jsonl"
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self._path = path
+        self._by_url: dict[str, list[ArtifactRecord]] | None = None
+
+    @classmethod
+    def from_settings(
+        cls, settings: scrapy_settings.BaseSettings
+    ) -> "ArtifactStore | None":
+        """Create the artifact store using the FILES_STORE directory.
+
+        Args:
+            settings: The scrapy Settings.
+
+        Returns:
+            The artifact store, or None if it is not enabled.
+        """
+        files_store = settings.get("FILES_STORE")
+        if not settings.getbool("WEB_DATA_ARTIFACTS_ENABLED", True) or not files_store:
+            return None
+        return cls(pathlib.Path(files_store))
+
+    @property
+    def path(self) -> pathlib.Path:
+        """The store directory."""
+        return self._path
+
+    def put(
+        self, body: bytes, url: str, run: str, name: str, content_type: str = ""
+    ) -> ArtifactRecord:
+        """Store the content of a download.
+
+        Args:
+            body: The content.
+            url: The url that provided the content.
+            run: The crawl run.
+            name: The web data name.
+            content_type: The response content type.
+
+        Returns:
+            The record that was added to the index.
+        """
+        sha256 = hashlib.sha256(body).hexdigest()
+        object_path = self.object_path(sha256)
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=object_path.parent, suffix=".tmp", delete=False
+            ) as f:
+                f.write(body)
+            pathlib.Path(f.name).replace(object_path)
+            logger.info("Stored artifact %s from '%s'.", sha256, url)
+
+        record = ArtifactRecord(
+            sha256=sha256,
+            url=url,
+            run=run,
+            name=name,
+            size=len(body),
+            content_type=content_type,
+            stored_at=datetime.now(timezone.utc).isoformat(),
+        )
+        self._path.mkdir(parents=True, exist_ok=True)
+        with (self._path / self.index_name).open("a", encoding="utf-8") as f:
+            f.write(json.dumps(dataclasses.asdict(record), sort_keys=True) + "\n")
+        if self._by_url is not None:
+            self._by_url.setdefault(url, []).append(record)
+        return record
+
+    def records(self, name: str | None = None) -> typing.Iterator[ArtifactRecord]:
+        """Read the index records, oldest first.
+
+        Args:
+            name: Only include records for this web data name.
+
+        Returns:
+            An iterator of records.
+        """
+        index_path = self._path / self.index_name
+        if not index_path.exists():
+            return
+        with index_path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = ArtifactRecord(**json.loads(line))
+                if name is None or record.name == name:
+                    yield record
+
+    def find(self, url: str) -> ArtifactRecord | None:
+        """Find the most recent record for a url.
+
+        Args:
+            url: The url.
+
+        Returns:
+            The record, or None if the url has no stored content.
+        """
+        if self._by_url is None:
+            # read the index once, later records are added by put
+            self._by_url = {}
+            for record in self.records():
+                self._by_url.setdefault(record.url, []).append(record)
+
+        for record in reversed(self._by_url.get(url, [])):
+            if self.object_path(record.sha256).exists():
+                return record
+        return None
+
+    def object_path(self, sha256: str) -> pathlib.Path:
+        """Get the path to the stored content.
+
+        Args:
+            sha256: The content hash.
+
+        Returns:
+            The path to the object file.
+        """
+        return self._path / "objects" / sha256[:2] / sha256
+
+    @contextlib.contextmanager
+    def open(self, record: ArtifactRecord) -> typing.Iterator[typing.BinaryIO]:
+        """Open the stored content as a read-only binary file.
+
+        Args:
+            record: The artifact record.
+
+        Returns:
+            A context manager that provides the memory-mapped file.
+        """
+        with open_spooled(self.object_path(record.sha256)) as f:
+            yield f
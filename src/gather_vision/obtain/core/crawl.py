@@ -0,0 +1,314 @@
+"""Scrapy middleware and extensions that keep crawls from wasting time."""
+
+import collections
+import dataclasses
+import logging
+import time
+import typing
+
+import scrapy
+from scrapy import crawler as scrapy_crawler, http, signals
+from scrapy.exceptions import DontCloseSpider, IgnoreRequest, NotConfigured
+from scrapy.utils.httpobj import urlparse_cached
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class _Circuit:
+    outcomes: collections.deque
+    state: str = "closed"
+    opened_at: float = 0.0
+    probing: bool = False
+    failed_probes: int = 0
+
+
+class CircuitBreakerMiddleware:
+    """Stop sending requests to a domain that keeps failing.
+
+    Each domain has a circuit that tracks the recent request outcomes.
+    A circuit opens when too many of the recent requests have failed.
+    While it is open, requests to the domain are dropped or deferred.
+    A deferred request is taken out of the downloader,
+    so it does not hold a download slot,
+    and is scheduled again at the end of the cool-down.
+    After the cool-down, one request is sent as a probe.
+    The circuit closes if the probe succeeds, otherwise it opens again.
+    When too many probes in a row have failed,
+    the deferred requests for the domain are dropped,
+    and later requests are dropped until a probe succeeds.
+    """
+
+    def __init__(
+        self,
+        stats,
+        failures: int,
+        window: int,
+        cooldown: float,
+        mode: str,
+        http_codes: typing.Iterable[int],
+        probe_failures: int,
+        clock: typing.Callable[[], float] = time.monotonic,
+        crawler: scrapy_crawler.Crawler | None = None,
+    ) -> None:
+        if mode not in ("drop", "defer"):
+            raise ValueError(f"Unknown circuit breaker mode '{mode}'.")
+        if probe_failures < 1:
+            raise ValueError(
+                f"Invalid circuit breaker probe failures '{probe_failures}'."
+            )
+        self._stats = stats
+        self._failures = failures
+        self._window = window
+        self._cooldown = cooldown
+        self._mode = mode
+        self._http_codes = set(http_codes)
+        self._probe_failures = probe_failures
+        self._clock = clock
+        self._circuits: dict[str, _Circuit] = {}
+        self._crawler = crawler
+        self._deferred: dict[str, list[scrapy.Request]] = {}
+        self._releases: dict[str, typing.Any] = {}
+
+    @classmethod
+    def from_crawler(
+        cls, crawler: scrapy_crawler.Crawler
+    ) -> "CircuitBreakerMiddleware":
+        settings = crawler.settings
+        if not settings.getbool("WEB_DATA_BREAKER_ENABLED"):
+            raise NotConfigured()
+        middleware = cls(
+            stats=crawler.stats,
+            failures=settings.getint("WEB_DATA_BREAKER_FAILURES", 5),
+            window=settings.getint("WEB_DATA_BREAKER_WINDOW", 10),
+            cooldown=settings.getfloat("WEB_DATA_BREAKER_COOLDOWN", 300),
+            mode=settings.get("WEB_DATA_BREAKER_MODE", "defer"),
+            http_codes=[
+                int(i) for i in settings.getlist("WEB_DATA_BREAKER_HTTP_CODES")
+            ],
+            probe_failures=settings.getint("WEB_DATA_BREAKER_PROBE_FAILURES", 2),
+            crawler=crawler,
+        )
+        crawler.signals.connect(middleware.spider_idle, signal=signals.spider_idle)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def process_request(self, request: scrapy.Request, spider: scrapy.Spider) -> None:
+        domain = self._domain(request)
+        circuit = self._circuits.get(domain)
+        if circuit is None or circuit.state == "closed":
+            return None
+
+        remaining = circuit.opened_at + self._cooldown - self._clock()
+        if remaining <= 0 and not circuit.probing:
+            # send one request to find out if the domain has recovered
+            circuit.probing = True
+            self._set_state(spider, domain, circuit, "half-open")
+            self._stats_inc(spider, "probes")
+            return None
+
+        if self._mode == "drop" or self._given_up(circuit):
+            self._stats_inc(spider, "dropped")
+            raise IgnoreRequest(f"Circuit for '{domain}' is {circuit.state}.")
+
+        # schedule the request again after the cool-down, or after the probe
+        delay = remaining if remaining > 0 else self._cooldown / 10
+        self._defer(domain, request, delay)
+        self._stats_inc(spider, "deferred")
+        raise IgnoreRequest(f"Circuit for '{domain}' is {circuit.state}, deferred.")
+
+    def spider_idle(self, spider: scrapy.Spider) -> None:
+        # keep the crawl open until the deferred requests are scheduled again
+        if self._deferred:
+            raise DontCloseSpider()
+
+    def spider_closed(self, spider: scrapy.Spider) -> None:
+        for call in self._releases.values():
+            if call.active():
+                call.cancel()
+        self._releases.clear()
+        self._deferred.clear()
+
+    def process_response(
+        self, request: scrapy.Request, response: http.Response, spider: scrapy.Spider
+    ) -> http.Response:
+        failed = response.status in self._http_codes
+        self._record(spider, self._domain(request), failed)
+        return response
+
+    def process_exception(
+        self, request: scrapy.Request, exception: Exception, spider: scrapy.Spider
+    ) -> None:
+        if not isinstance(exception, IgnoreRequest):
+            self._record(spider, self._domain(request), True)
+        return None
+
+    def _record(self, spider: scrapy.Spider, domain: str, failed: bool) -> None:
+        circuit = self._circuits.get(domain)
+        if circuit is None:
+            circuit = _Circuit(collections.deque(maxlen=self._window))
+            self._circuits[domain] = circuit
+
+        circuit.outcomes.append(failed)
+
+        if circuit.state == "half-open":
+            circuit.probing = False
+            if failed:
+                circuit.failed_probes += 1
+                self._open(spider, domain, circuit)
+                if self._given_up(circuit):
+                    self._drop_deferred(spider, domain)
+            else:
+                circuit.failed_probes = 0
+                circuit.outcomes.clear()
+                self._set_state(spider, domain, circuit, "closed")
+                self._stats_inc(spider, "closed")
+                logger.info("Circuit for '%s' closed.", domain)
+
+        elif circuit.state == "closed" and sum(circuit.outcomes) >= self._failures:
+            self._open(spider, domain, circuit)
+
+    def _open(self, spider: scrapy.Spider, domain: str, circuit: _Circuit) -> None:
+        circuit.opened_at = self._clock()
+        self._set_state(spider, domain, circuit, "open")
+        self._stats_inc(spider, "opened")
+        logger.warning(
+            "Circuit for '%s' opened for %s seconds after %s failures.",
+            domain,
+            self._cooldown,
+            sum(circuit.outcomes),
+        )
+
+    def _set_state(
+        self, spider: scrapy.Spider, domain: str, circuit: _Circuit, state: str
+    ) -> None:
+        circuit.state = state
+        if self._stats:
+            key = f"gather_vision/breaker/state/{domain}"
+            self._stats.set_value(key, state, spider=spider)
+
+    def _stats_inc(self, spider: scrapy.Spider, key: str) -> None:
+        if self._stats:
+            self._stats.inc_value(f"gather_vision/breaker/{key}", spider=spider)
+
+    def _defer(self, domain: str, request: scrapy.Request, delay: float) -> None:
+        # the request has already been through the duplicate filter
+        self._deferred.setdefault(domain, []).append(request.replace(dont_filter=True))
+        if domain not in self._releases:
+            self._releases[domain] = self._call_later(delay, self._release, domain)
+
+    def _given_up(self, circuit: _Circuit) -> bool:
+        return circuit.failed_probes >= self._probe_failures
+
+    def _drop_deferred(self, spider: scrapy.Spider, domain: str) -> None:
+        # a domain that does not recover would otherwise keep the crawl open
+        call = self._releases.pop(domain, None)
+        if call is not None and call.active():
+            call.cancel()
+        requests = self._deferred.pop(domain, [])
+        for _ in requests:
+            self._stats_inc(spider, "dropped")
+        logger.warning(
+            "Dropped %s deferred requests for '%s' after %s failed probes.",
+            len(requests),
+            domain,
+            self._probe_failures,
+        )
+
+    def _release(self, domain: str) -> None:
+        self._releases.pop(domain, None)
+        for request in self._deferred.pop(domain, []):
+            self._crawler.engine.crawl(request)
+
+    def _call_later(self, seconds: float, func: typing.Callable, *args):
+        from twisted.internet import reactor
+
+        return reactor.callLater(seconds, func, *args)
+
+    def _domain(self, request: scrapy.Request) -> str:
+        return urlparse_cached(request).hostname or ""
+
+
+class WebDataBudget:
+    """Close a web data crawl when it has used up its budget.
+
+    Each web data can set 'budget_seconds', 'budget_requests', and 'budget_bytes'.
+    When an attribute is None, the WEB_DATA_BUDGET_* setting is used.
+    A budget of 0 is no limit.
+
+    When a budget is used up, no more requests are scheduled,
+    and the requests in progress are finished.
+    The items that have already been provided are processed as usual.
+    """
+
+    kinds = ("seconds", "requests", "bytes")
+
+    def __init__(self, crawler: scrapy_crawler.Crawler) -> None:
+        self._crawler = crawler
+        self._budgets: dict[str, float] = {}
+        self._used = {"requests": 0, "bytes": 0}
+        self._timer = None
+        self._closing = False
+
+    @classmethod
+    def from_crawler(cls, crawler: scrapy_crawler.Crawler) -> "WebDataBudget":
+        extension = cls(crawler)
+        crawler.signals.connect(extension.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(extension.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(
+            extension.response_received, signal=signals.response_received
+        )
+        return extension
+
+    def spider_opened(self, spider: scrapy.Spider) -> None:
+        settings = self._crawler.settings
+        for kind in self.kinds:
+            value = getattr(spider, f"budget_{kind}", None)
+            if value is None:
+                value = settings.getfloat(f"WEB_DATA_BUDGET_{kind.upper()}", 0)
+            if value and value > 0:
+                self._budgets[kind] = value
+                self._set_stat(spider, f"{kind}/limit", value)
+
+        seconds = self._budgets.get("seconds")
+        if seconds:
+            from twisted.internet import reactor
+
+            self._timer = reactor.callLater(
+                seconds, self._exceeded, spider, "seconds", seconds
+            )
+
+    def spider_closed(self, spider: scrapy.Spider) -> None:
+        if self._timer and self._timer.active():
+            self._timer.cancel()
+        self._timer = None
+
+    def response_received(
+        self, response: http.Response, request: scrapy.Request, spider: scrapy.Spider
+    ) -> None:
+        self._used["requests"] += 1
+        self._used["bytes"] += len(response.body)
+        for kind, used in self._used.items():
+            budget = self._budgets.get(kind)
+            if budget and used >= budget:
+                self._exceeded(spider, kind, used)
+
+    def _exceeded(self, spider: scrapy.Spider, kind: str, used: float) -> None:
+        if self._closing:
+            return
+        self._closing = True
+        self._set_stat(spider, "exceeded", kind)
+        logger.warning(
+            "Closing '%s' because the %s budget of %s was used up (%s).",
+            spider.name,
+            kind,
+            self._budgets[kind],
+            used,
+        )
+        self._crawler.engine.close_spider(spider, f"budget_exceeded_{kind}")
+
+    def _set_stat(self, spider: scrapy.Spider, key: str, value) -> None:
+        if self._crawler.stats:
+            self._crawler.stats.set_value(
+                f"gather_vision/budget/{key}", value, spider=spider
+            )
@@ -1,6 +1,9 @@
 import abc
+import contextlib
 import dataclasses
+import functools
 import gzip
+import hashlib
 import json
 import logging
 import pathlib
@@ -8,18 +11,30 @@ import re
 import typing
 from datetime import datetime
 import zoneinfo
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
 import parsel
 import scrapy
 
 from django.conf import settings as proj_django_settings
-from django.utils.dateparse import parse_datetime
 from itemadapter import ItemAdapter
 from scrapy import crawler as scrapy_crawler, http, settings as scrapy_settings
 from scrapy.utils.project import get_project_settings
 from twisted.internet.defer import Deferred
 
+from gather_vision.obtain.core.artifact import ArtifactStore
+from gather_vision.obtain.core.datetimes import datetime_parser, get_zone
+from gather_vision.obtain.core.job import WebDataJob
+from gather_vision.obtain.core.pool import run_offload, shutdown_pool
+from gather_vision.obtain.core.seen import WebDataSeen
+from gather_vision.obtain.core.state import WebDataState
+from gather_vision.obtain.core.stream import (
+    CsvHeader,
+    JsonPath,
+    iter_csv_chunks,
+    iter_json_items,
+    open_body,
+)
 from gather_vision.obtain.core.utils import xml_to_data
 
 logger = logging.getLogger(__name__)
@@ -38,17 +53,8 @@ class WebDataAvailable:
     response_url: str
     """The url that provided the response."""
 
-    body_text: str
-    """The raw response body text."""
-
-    body_raw: bytes
-    """The raw response body text."""
-
-    body_data: list | dict | None
-    """The structure body data from json or xml."""
-
-    selector: typing.Optional[parsel.Selector]
-    """The selector for obtaining parts of the body data."""
+    body_raw: bytes | None
+    """The raw response body bytes."""
 
     status: int
     """The response status code."""
@@ -59,6 +65,77 @@ class WebDataAvailable:
     meta: typing.Optional[dict] = None
     """The metadata associated with the request and response."""
 
+    json_items_path: typing.Optional[JsonPath] = None
+    """The path to the json array that is read one element at a time,
+    see :meth:`json_items`."""
+
+    response: typing.Optional[http.Response] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
+    """The response that provides the body text, data, and selector."""
+
+    @functools.cached_property
+    def content_type(self) -> str:
+        """The lower case response content type."""
+        value = (self.headers or {}).get("Content-Type") or b""
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return value.lower()
+
+    @functools.cached_property
+    def body_text(self) -> str | None:
+        """The response body text.
+        Decoded on first access."""
+        if isinstance(self.response, http.TextResponse):
+            return self.response.text
+        return None
+
+    @functools.cached_property
+    def body_data(self) -> list | dict | None:
+        """The structure body data from json or xml.
+        Built on first access."""
+        if not isinstance(self.response, http.TextResponse):
+            return None
+        if "json" in self.content_type or self.response_url.endswith(".json"):
+            return self.response.json()
+        if "xml" in self.content_type:
+            return xml_to_data(self.body_text)
+        return None
+
+    @functools.cached_property
+    def selector(self) -> typing.Optional[parsel.Selector]:
+        """The selector for obtaining parts of the body data.
+        Built on first access."""
+        if isinstance(self.response, http.TextResponse):
+            return self.response.selector
+        return None
+
+    @contextlib.contextmanager
+    def open_body(self) -> typing.Iterator[typing.BinaryIO]:
+        """Open the raw response body as a binary file.
+
+        The file reads from the body bytes, without copying them.
+
+        Returns:
+            A context manager that provides the file.
+        """
+        with open_body(self.body_raw) as f:
+            yield f
+
+    def json_items(self) -> typing.Iterator[typing.Any]:
+        """Read the elements of the json array at the json items path.
+
+        The elements are decoded one at a time,
+        instead of building the whole body data.
+
+        Returns:
+            An iterator of the array elements.
+        """
+        if self.json_items_path is None:
+            raise ValueError(f"No json items path for '{self.response_url}'.")
+        with self.open_body() as f:
+            yield from iter_json_items(f, self.json_items_path)
+
 
 class IsDataclass(typing.Protocol):
     """Allows specifying type to be any dataclass."""
@@ -98,41 +175,31 @@ class GatherDataItem(abc.ABC):
 
     @classmethod
     def datetime_parse(
-        cls, value: str, timezone: str, formats: list[str] | None = None
+        cls,
+        value: str,
+        timezone: str,
+        formats: list[str] | None = None,
+        field: str | None = None,
     ) -> datetime | None:
-        value = (value or "").strip()
-        if not value:
-            return None
-
-        tz = zoneinfo.ZoneInfo(timezone)
-
-        options = [
-            *(formats or []),
-            "%d/%m/%Y %I:%M %p",
-            "%I:%M %p",
-            "%a, %d %b %Y %H:%M:%S %z",
-            "%d/%m/%Y",
-        ]
-        for option in options:
-            try:
-                return datetime.strptime(value, option).replace(tzinfo=tz)
-            except ValueError:
-                continue
-
-        logger.warning("Cannot parse '%s' using %s.", value, options)
+        """Parse a date and time using the given and default formats.
 
-        try:
-            parsed = parse_datetime(value)
-            if parsed:
-                return parsed.replace(tzinfo=tz)
-        except ValueError:
-            pass
+        Args:
+            value: The text to parse.
+            timezone: The timezone to set on the result.
+            formats: The formats to try before the default formats.
+            field: The item field, used with the item class
+                to remember the format that worked.
 
-        raise ValueError(f"Cannot parse datetime '{value}'.")
+        Returns:
+            The date and time, or None if the value is empty.
+        """
+        return datetime_parser.parse(
+            value, timezone, formats, key=(cls.__qualname__, field)
+        )
 
     @classmethod
     def datetime_now(cls, timezone: str) -> datetime:
-        return datetime.now().replace(tzinfo=zoneinfo.ZoneInfo(timezone))
+        return datetime.now().replace(tzinfo=get_zone(timezone))
 
 
 @dataclasses.dataclass(frozen=True)
@@ -146,6 +213,28 @@ class GatherDataRequest(abc.ABC):
     """The arbitrary data to include in the response."""
 
 
+@dataclasses.dataclass(frozen=True)
+class GatherDataOffload:
+    """A CPU-bound parsing step to run in the shared process pool.
+
+    The result of the function is given to the callback,
+    which provides urls and/or items in the same way as
+    :meth:`WebData.web_resources`.
+    """
+
+    func: typing.Callable[..., typing.Any]
+    """A module-level function. It must be able to be pickled."""
+
+    args: tuple
+    """The arguments for the function. They must be able to be pickled."""
+
+    callback: typing.Callable[
+        [typing.Any],
+        typing.Iterable[typing.Union[GatherDataRequest, GatherDataItem, None]],
+    ]
+    """Called in the crawl process with the result of the function."""
+
+
 @dataclasses.dataclass(frozen=True)
 class GatherDataOrigin:
     title: str
@@ -215,6 +304,120 @@ class GatherDataContainerCheck:
         return True
 
 
+class GatherDataClassifier:
+    """Find the label of the first check that accepts some entries.
+
+    Gives the same label as calling :meth:`GatherDataContainerCheck.check`
+    for each check in order, using a precomputed form of the checks.
+    The checks that need one of a list of entries are only tried
+    when the entries include one of them.
+    The labels for recent sets of entries are remembered.
+    """
+
+    def __init__(
+        self, checks: typing.Iterable[GatherDataContainerCheck], memo_size: int = 1024
+    ) -> None:
+        self._checks = list(checks)
+        self._rules = [self._compile(i) for i in self._checks]
+
+        # the checks to try for each entry, and the checks to always try
+        self._index: dict[str, set[int]] = {}
+        self._always = set()
+        for index, check in enumerate(self._checks):
+            rqeo = check.required_one
+            if rqeo and not callable(rqeo):
+                for item in rqeo:
+                    self._index.setdefault(item, set()).add(index)
+            else:
+                self._always.add(index)
+
+        self._classify_cached = functools.lru_cache(maxsize=memo_size)(self._classify)
+
+    @property
+    def checks(self) -> list[GatherDataContainerCheck]:
+        """The checks, in the order they are tried."""
+        return list(self._checks)
+
+    def cache_info(self):
+        """Get the hits and misses of the remembered labels."""
+        return self._classify_cached.cache_info()
+
+    def classify(self, entries: typing.Iterable[str]) -> str | None:
+        """Get the label of the first check that accepts the entries.
+
+        Args:
+            entries: The entries to check.
+
+        Returns:
+            The label, or None if no check accepts the entries.
+        """
+        entry_set = frozenset(entries or [])
+        if not any(entry_set):
+            return None
+        return self._classify_cached(entry_set)
+
+    def _classify(self, entry_set: frozenset[str]) -> str | None:
+        candidates = set(self._always)
+        for entry in entry_set:
+            candidates.update(self._index.get(entry, ()))
+
+        # each predicate is applied to the entries at most once
+        predicates: dict[typing.Callable, tuple[bool, ...]] = {}
+
+        def apply(func: typing.Callable[[str], bool]) -> tuple[bool, ...]:
+            result = predicates.get(func)
+            if result is None:
+                result = tuple(bool(func(entry)) for entry in entry_set)
+                predicates[func] = result
+            return result
+
+        for index in sorted(candidates):
+            label, forb, reqa, rqeo, allo = self._rules[index]
+            if isinstance(forb, frozenset):
+                if not entry_set.isdisjoint(forb):
+                    continue
+            elif forb and any(apply(forb)):
+                continue
+
+            if isinstance(reqa, frozenset):
+                if not reqa <= entry_set:
+                    continue
+            elif reqa and not all(apply(reqa)):
+                continue
+
+            if isinstance(rqeo, frozenset):
+                if entry_set.isdisjoint(rqeo):
+                    continue
+            elif rqeo and not any(apply(rqeo)):
+                continue
+
+            if isinstance(allo, frozenset):
+                if not allo <= entry_set:
+                    continue
+            elif allo and not all(apply(allo)):
+                continue
+
+            return label
+        return None
+
+    @staticmethod
+    def _compile(check: GatherDataContainerCheck) -> tuple:
+        def compile_option(value):
+            if not value:
+                return None
+            if callable(value):
+                return value
+            return frozenset(value)
+
+        return (
+            check.label,
+            compile_option(check.forbidden),
+            compile_option(check.required_all),
+            compile_option(check.required_one),
+            None if check.allow_unmatched else compile_option(check.allowed),
+        )
+
+
 class BaseData(abc.ABC):
     """The essential information for an approach to obtaining data."""
 
@@ -237,11 +440,114 @@ class WebData(BaseData, scrapy.Spider, abc.ABC):
     converts it into data items and/or additional urls.
     """
 
+    unchanged_response: typing.Literal["parse", "skip", "requests"] = "parse"
+    """What to do with a response body that is the same as the previous run.
+    'parse' provides requests and items as usual,
+    'skip' does not parse the response,
+    and 'requests' provides only the requests."""
+
+    artifact_suffixes: tuple[str, ...] = ()
+    """The url path suffixes of the responses to keep in the artifact store."""
+
+    json_items_paths: dict[str, JsonPath] = {}
+    """The path to the json array to read one element at a time, by response url.
+    Available to :meth:`web_resources` as :meth:`WebDataAvailable.json_items`."""
+
+    budget_seconds: float | None = None
+    """The longest time the crawl can run.
+    Uses the WEB_DATA_BUDGET_SECONDS setting if None. 0 is no limit."""
+
+    budget_requests: int | None = None
+    """The most responses the crawl can download.
+    Uses the WEB_DATA_BUDGET_REQUESTS setting if None. 0 is no limit."""
+
+    budget_bytes: int | None = None
+    """The most response body bytes the crawl can download.
+    Uses the WEB_DATA_BUDGET_BYTES setting if None. 0 is no limit."""
+
     @property
     @abc.abstractmethod
     def name(self) -> str:
         raise NotImplementedError("Must specify data_descr.")
 
+    @classmethod
+    def web_data_name(cls) -> str:
+        """Get the name of the web data without creating an instance.
+
+        Returns:
+            The web data name.
+        """
+        name = cls.name
+        if isinstance(name, property):
+            name = name.fget(cls)
+        return name
+
+    @classmethod
+    def from_crawler(cls, crawler: scrapy_crawler.Crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider._state = WebDataState.from_settings(crawler.settings, spider.name)
+        spider._final_urls = WebDataSeen.from_settings(crawler.settings, spider.name)
+        spider._artifacts = ArtifactStore.from_settings(crawler.settings)
+        spider._run = datetime.now(zoneinfo.ZoneInfo("UTC")).strftime("%Y%m%dT%H%M%SZ")
+        return spider
+
+    @property
+    def state(self) -> WebDataState:
+        """The state that is kept between runs of this web data source."""
+        if getattr(self, "_state", None) is None:
+            self._state = WebDataState()
+        return self._state
+
+    def state_unchanged(self, key: str, fingerprint: str) -> bool:
+        """Check whether a fingerprint is the same as the previous run.
+
+        A match is counted in the crawl stats as a skip.
+
+        Args:
+            key: The state key.
+            fingerprint: The current fingerprint for the key.
+
+        Returns:
+            True if the fingerprint matches the stored fingerprint.
+        """
+        if self.state.get(key) != fingerprint:
+            return False
+        self._stats_inc("state/skipped")
+        return True
+
+    @property
+    def final_urls(self) -> WebDataSeen:
+        """The urls that are final, which are not requested again."""
+        if getattr(self, "_final_urls", None) is None:
+            self._final_urls = WebDataSeen()
+        return self._final_urls
+
+    def mark_final(self, url: str) -> None:
+        """Mark a url as final, so it is not requested in later runs.
+
+        Only use this for urls whose content will never change.
+
+        Args:
+            url: The requested url.
+
+        Returns:
+            None
+        """
+        self.final_urls.add(url)
+        self._stats_inc("seen/marked")
+
+    def closed(self, reason: str) -> None:
+        """Called when the spider is closed.
+
+        Args:
+            reason: The reason the spider was closed.
+
+        Returns:
+            None
+        """
+        self.state.save()
+        self.final_urls.save()
+
     @abc.abstractmethod
     def initial_urls(self) -> typing.Iterable[str]:
         """Get the initial urls.
@@ -254,14 +560,19 @@ class WebData(BaseData, scrapy.Spider, abc.ABC):
     @abc.abstractmethod
     def web_resources(
         self, web_data: WebDataAvailable
-    ) -> typing.Iterable[typing.Union[GatherDataRequest, GatherDataItem]]:
+    ) -> typing.Iterable[
+        typing.Union[GatherDataRequest, GatherDataItem, GatherDataOffload]
+    ]:
         """Parse a web response and provide urls and items.
 
+        CPU-bound parsing steps can be provided as a :class:`GatherDataOffload`,
+        to run in a process pool instead of the crawl process.
+
         Args:
             web_data: The web data available for parsing.
 
         Returns:
-            An iterable of urls and/or data items from the web data.
+            An iterable of urls, data items, and/or offloaded steps.
         """
         raise NotImplementedError("Must implement 'web_resources'.")
 
@@ -279,9 +590,9 @@ class WebData(BaseData, scrapy.Spider, abc.ABC):
                     callback=self.parse,
                 )
 
-    def parse(
+    async def parse(
         self, response: http.Response, **kwargs
-    ) -> typing.Iterable[typing.Union[scrapy.Request, GatherDataItem]]:
+    ) -> typing.AsyncIterator[typing.Union[scrapy.Request, GatherDataItem]]:
         """Parse a web response.
 
         Args:
@@ -289,10 +600,8 @@ class WebData(BaseData, scrapy.Spider, abc.ABC):
             **kwargs: Additional arguments.
 
         Returns:
-            An iterable of requests and/or data items.
+            An async iterable of requests and/or data items.
         """
-        content_type_header = response.headers["Content-Type"].decode("utf-8").lower()
-
         if logger.isEnabledFor(logging.INFO):
             log_response_flags = (
                 " [" + ",".join(sorted(response.flags)) + "]" if response.flags else ""
@@ -304,52 +613,192 @@ class WebData(BaseData, scrapy.Spider, abc.ABC):
                 log_response_flags,
             )
 
-        if isinstance(response, http.TextResponse):
-            if "json" in content_type_header or response.url.endswith(".json"):
-                body_data = response.json()
-            elif "xml" in content_type_header:
-                body_data = xml_to_data(response.text)
-            else:
-                body_data = None
-            body_text = response.text
-            selector = response.selector
-        else:
-            body_text = None
-            body_data = None
-            selector = None
+        # responses without validators are compared using a hash of the body
+        body_key = f"body:{response.url}"
+        body_hash = None
+        requests_only = False
+        if self.unchanged_response != "parse":
+            body_hash = hashlib.sha256(response.body).hexdigest()
+            if self.state.get(body_key) == body_hash:
+                self._stats_inc(f"unchanged/{self.unchanged_response}")
+                if self.unchanged_response == "skip":
+                    logger.debug("Skipping unchanged response '%s'.", response.url)
+                    return
+                requests_only = True
+
+        self._store_artifact(response)
 
         web_data = WebDataAvailable(
             request_url=response.request.url,
             request_method=response.request.method,
             response_url=response.url,
-            body_text=body_text,
             body_raw=response.body,
-            body_data=body_data,
-            selector=selector,
             status=response.status,
             headers=response.headers,
             meta=response.cb_kwargs,
+            json_items_path=self.json_items_paths.get(response.url),
+            response=response,
         )
-        for i in self.web_resources(web_data):
+        results = self.web_resources(web_data)
+        async for i in self._parse_results(results, requests_only):
+            yield i
+
+        # only record the hash once the response has been parsed without errors
+        if body_hash:
+            self.state.set(body_key, body_hash)
+
+    async def _parse_results(
+        self,
+        results: typing.Iterable[
+            typing.Union[GatherDataRequest, GatherDataItem, GatherDataOffload, None]
+        ],
+        requests_only: bool = False,
+    ) -> typing.AsyncIterator[typing.Union[scrapy.Request, GatherDataItem]]:
+        for i in results:
             if i and isinstance(i, GatherDataItem):
-                yield i
+                if not requests_only:
+                    yield i
             elif i and isinstance(i, GatherDataRequest):
                 yield scrapy.Request(
                     url=i.url,
                     callback=self.parse,
                     cb_kwargs={**i.data},
                 )
+            elif i and isinstance(i, GatherDataOffload):
+                if requests_only:
+                    # offloaded steps are expected to provide items
+                    continue
+                self._stats_inc("offload/count")
+                try:
+                    value = await run_offload(
+                        getattr(self, "settings", None), i.func, i.args
+                    )
+                except TimeoutError:
+                    self._stats_inc("offload/timeout")
+                    raise
+                async for j in self._parse_results(i.callback(value), requests_only):
+                    yield j
             elif i is None:
                 pass
             else:
                 raise ValueError(i)
 
+    def _store_artifact(self, response: http.Response) -> None:
+        artifacts = getattr(self, "_artifacts", None)
+        if not artifacts or not self.artifact_suffixes:
+            return
+        url_path = urlparse(response.url).path.lower()
+        if not url_path.endswith(self.artifact_suffixes):
+            return
+
+        content_type = response.headers.get("Content-Type") or b""
+        artifacts.put(
+            body=response.body,
+            url=response.url,
+            run=getattr(self, "_run", ""),
+            name=self.name,
+            content_type=content_type.decode("utf-8", errors="replace"),
+        )
+        self._stats_inc("artifact/stored")
+        self._stats_inc("artifact/bytes", len(response.body))
+
+    def _stats_inc(self, key: str, count: int = 1) -> None:
+        crawler = getattr(self, "crawler", None)
+        if crawler and crawler.stats:
+            crawler.stats.inc_value(f"gather_vision/{key}", count, spider=self)
+
     def _make_abs_url(self, base: str, suffix: str) -> str:
         # https://results.ecq.qld.gov.au/elections/
         # state/State2017/results/summary.html
         return urljoin(base, suffix)
 
 
+class CsvWebData(WebData, abc.ABC):
+    """A web data that reads large csv downloads as chunks of rows.
+
+    The rows are read from the response body,
+    without decoding the whole body to text.
+    Responses that are not csv are given to :meth:`other_resources`.
+    """
+
+    csv_encoding: str = "utf-8-sig"
+    """The text encoding of the csv downloads."""
+
+    csv_header_required: tuple[str, ...] = ()
+    """The column names that identify the header row."""
+
+    csv_chunk_size: int = 1000
+    """The maximum number of rows given to :meth:`csv_resources` at once."""
+
+    def web_resources(
+        self, web_data: WebDataAvailable
+    ) -> typing.Iterable[
+        typing.Union[GatherDataRequest, GatherDataItem, GatherDataOffload, None]
+    ]:
+        if not self.is_csv(web_data):
+            yield from self.other_resources(web_data)
+            return
+
+        with web_data.open_body() as body:
+            chunks = iter_csv_chunks(
+                body,
+                chunk_size=self.csv_chunk_size,
+                encoding=self.csv_encoding,
+                required=self.csv_header_required,
+            )
+            for header, rows in chunks:
+                self._stats_inc("csv/rows", len(rows))
+                yield from self.csv_resources(web_data, header, rows)
+
+    def is_csv(self, web_data: WebDataAvailable) -> bool:
+        """Check whether a response is a csv file.
+
+        Args:
+            web_data: The response data.
+
+        Returns:
+            True if the content type or url path is csv.
+        """
+        return "csv" in web_data.content_type or urlparse(
+            web_data.response_url
+        ).path.lower().endswith(".csv")
+
+    def other_resources(
+        self, web_data: WebDataAvailable
+    ) -> typing.Iterable[
+        typing.Union[GatherDataRequest, GatherDataItem, GatherDataOffload, None]
+    ]:
+        """Get the requests and items from a response that is not csv.
+
+        Args:
+            web_data: The response data.
+
+        Returns:
+            An iterable of requests and/or data items.
+        """
+        raise ValueError(
+            f"Unexpected response that is not csv '{web_data.response_url}'."
+        )
+
+    @abc.abstractmethod
+    def csv_resources(
+        self, web_data: WebDataAvailable, header: CsvHeader, rows: list[list[str]]
+    ) -> typing.Iterable[
+        typing.Union[GatherDataRequest, GatherDataItem, GatherDataOffload, None]
+    ]:
+        """Get the requests and items from a chunk of csv rows.
+
+        Args:
+            web_data: The response data.
+            header: The csv header.
+            rows: The rows in this chunk.
+
+        Returns:
+            An iterable of requests and/or data items.
+        """
+        raise NotImplementedError()
+
+
 class LocalData(BaseData, abc.ABC):
     """A class that loads local data and converts it into data items."""
 
@@ -441,14 +890,41 @@ class DataLoad:
             settings=settings, install_root_handler=True
         )
 
+        crawlers = []
         for data_source in data_sources:
-            process.crawl(data_source)
+            # each web data has its own persisted queue and dupefilter,
+            # so an interrupted crawl continues from where it stopped
+            crawl_settings = settings.copy()
+            job = WebDataJob.from_settings(settings, data_source.web_data_name())
+            if job:
+                crawl_settings.set("JOBDIR", str(job.path))
+                if job.exists():
+                    logger.info("Resuming crawl job '%s'.", job.path)
+
+            crawler = scrapy_crawler.Crawler(data_source, crawl_settings)
+            crawlers.append((crawler, job))
+            process.crawl(crawler)
 
         # logging.getLogger("scrapy").setLevel("ERROR")
         # logging.getLogger("py.warnings").setLevel("CRITICAL")
 
         # the script will block here until the crawling is finished
-        process.start()
+        try:
+            process.start()
+        finally:
+            shutdown_pool()
+
+        # a job that finished has nothing left to resume
+        for crawler, job in crawlers:
+            finish_reason = crawler.stats.get_value("finish_reason")
+            if job and finish_reason == "finished":
+                job.discard()
+            elif job:
+                logger.warning(
+                    "Crawl job '%s' stopped with reason '%s' and can be resumed.",
+                    job.path,
+                    finish_reason,
+                )
 
     def _load_feed_items(
         self, settings: scrapy_settings.Settings
@@ -0,0 +1,171 @@
+"""Parse date and time text using a list of formats."""
+
+import functools
+import logging
+import re
+import typing
+import zoneinfo
+from datetime import datetime
+
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FORMATS = (
+    "%d/%m/%Y %I:%M %p",
+    "%I:%M %p",
+    "%a, %d %b %Y %H:%M:%S %z",
+    "%d/%m/%Y",
+)
+"""The formats that are tried after any formats given by the caller."""
+
+# Loose patterns for the strptime directives.
+# Each pattern matches at least everything strptime accepts,
+# so a value that does not match cannot be parsed using the format.
+_directive_patterns = {
+    **{i: r"\s?\d+" for i in "dmyHIMSfjUWuwGVg"},
+    "Y": r"\d+",
+    **{i: r".+?" for i in "aAbBpz"},
+    "Z": r".*?",
+    "%": "%",
+}
+_directive = re.compile(r"%(.)|(\s+)|([^%\s]+)|(%)", re.DOTALL)
+
+
+@functools.lru_cache(maxsize=None)
+def get_zone(name: str) -> zoneinfo.ZoneInfo:
+    """Get a timezone.
+
+    Args:
+        name: The IANA timezone name.
+
+    Returns:
+        The timezone.
+    """
+    return zoneinfo.ZoneInfo(name)
+
+
+@functools.lru_cache(maxsize=256)
+def format_pattern(value: str) -> re.Pattern | None:
+    """Build a pattern that screens values before trying a strptime format.
+
+    Args:
+        value: The strptime format.
+
+    Returns:
+        The compiled pattern, or None if the format cannot be screened.
+    """
+    parts = []
+    for match in _directive.finditer(value):
+        directive, space, literal, incomplete = match.groups()
+        if incomplete is not None:
+            # a format that ends with a lone '%' is left to strptime
+            return None
+        if directive is not None:
+            part = _directive_patterns.get(directive)
+            if part is None:
+                return None
+            parts.append(part)
+        elif space is not None:
+            parts.append(r"\s+")
+        else:
+            parts.append(re.escape(literal))
+    return re.compile("".join(parts), re.IGNORECASE)
+
+
+class DateTimeParser:
+    """Parse date and time text using a list of formats.
+
+    The formats are tried in order, and the first format that works is used.
+    Formats are screened using a pattern before being given to strptime,
+    to avoid the cost of a strptime failure.
+
+    The format that last worked is remembered for each key,
+    and is tried first for the next value.
+    The formats before it are only screened, using one combined pattern,
+    and the full order is used if any of them could match.
+    This gives the same result as trying all the formats in order.
+    """
+
+    def __init__(self) -> None:
+        self._memo: dict[typing.Hashable, tuple[str, re.Pattern | None]] = {}
+
+    def parse(
+        self,
+        value: str | None,
+        timezone: str,
+        formats: typing.Iterable[str] | None = None,
+        key: typing.Hashable = None,
+    ) -> datetime | None:
+        """Parse a date and time.
+
+        Args:
+            value: The text to parse.
+            timezone: The timezone to set on the result.
+            formats: The formats to try before the default formats.
+            key: Identifies the caller and field, to remember the format.
+
+        Returns:
+            The date and time, or None if the value is empty.
+        """
+        value = (value or "").strip()
+        if not value:
+            return None
+
+        tz = get_zone(timezone)
+        options = (*(formats or ()), *DEFAULT_FORMATS)
+
+        memo_key = (key, options)
+        remembered = self._memo.get(memo_key)
+        if remembered is not None:
+            option, earlier = remembered
+            if earlier is None or not earlier.fullmatch(value):
+                result = self._parse_format(value, option)
+                if result is not None:
+                    return result.replace(tzinfo=tz)
+
+        for index, option in enumerate(options):
+            result = self._parse_format(value, option)
+            if result is not None:
+                if remembered is None or remembered[0] != option:
+                    self._remember(memo_key, options, index)
+                return result.replace(tzinfo=tz)
+
+        logger.warning("Cannot parse '%s' using %s.", value, list(options))
+
+        try:
+            parsed = parse_datetime(value)
+            if parsed:
+                return parsed.replace(tzinfo=tz)
+        except ValueError:
+            pass
+
+        raise ValueError(f"Cannot parse datetime '{value}'.")
+
+    def _remember(
+        self, memo_key: typing.Hashable, options: tuple[str, ...], index: int
+    ) -> None:
+        patterns = [format_pattern(i) for i in options[:index]]
+        if any(i is None for i in patterns):
+            # an earlier format cannot be screened, so it must always be tried
+            self._memo.pop(memo_key, None)
+            return
+        earlier = None
+        if patterns:
+            earlier = re.compile(
+                "|".join(f"(?:{i.pattern})" for i in patterns), re.IGNORECASE
+            )
+        self._memo[memo_key] = (options[index], earlier)
+
+    def _parse_format(self, value: str, option: str) -> datetime | None:
+        pattern = format_pattern(option)
+        if pattern is not None and not pattern.fullmatch(value):
+            return None
+        try:
+            return datetime.strptime(value, option)
+        except ValueError:
+            return None
+
+
+datetime_parser = DateTimeParser()
+"""The shared parser, which remembers formats across all callers."""
@@ -0,0 +1,80 @@
+"""Extract rows of fields from html and xml pages using XPath."""
+
+import typing
+
+from lxml import etree
+
+
+class ExtractField:
+    """A value to extract from a row.
+
+    The path is an XPath expression relative to the row element.
+    It can select text nodes or attributes, or be a string expression.
+    """
+
+    def __init__(self, path: str, many: bool = False) -> None:
+        """Create a field.
+
+        Args:
+            path: The XPath expression.
+            many: Whether to provide all the results as a list,
+                instead of the first result or None.
+        """
+        self.path = path
+        self.many = many
+        self._xpath = etree.XPath(path, smart_strings=False)
+
+    def extract(self, node) -> str | list[str] | None:
+        """Get the value of the field.
+
+        Args:
+            node: The row element.
+
+        Returns:
+            The value.
+        """
+        result = self._xpath(node)
+        if not isinstance(result, list):
+            return str(result)
+        if self.many:
+            return [str(i) for i in result]
+        return str(result[0]) if result else None
+
+
+class ExtractSpec:
+    """Rows of named fields to extract from a page.
+
+    The XPath expressions are compiled once, when the spec is created,
+    so a spec is usually a class attribute of a web data.
+    A field can also be a spec, which provides a list of rows
+    relative to the row element.
+    """
+
+    def __init__(
+        self, rows: str, fields: dict[str, typing.Union[ExtractField, "ExtractSpec"]]
+    ) -> None:
+        """Create a spec.
+
+        Args:
+            rows: The XPath expression that selects the row elements.
+            fields: The fields to extract from each row.
+        """
+        self.rows = rows
+        self.fields = fields
+        self._xpath = etree.XPath(rows, smart_strings=False)
+
+    def extract(self, source) -> list[dict[str, typing.Any]]:
+        """Extract the rows.
+
+        Args:
+            source: A parsel selector or lxml element.
+
+        Returns:
+            A dict of the field values for each row, in document order.
+        """
+        root = getattr(source, "root", source)
+        fields = list(self.fields.items())
+        return [
+            {name: field.extract(node) for name, field in fields}
+            for node in self._xpath(root)
+        ]
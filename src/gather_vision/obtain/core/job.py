@@ -0,0 +1,151 @@
+"""Persisted crawl jobs, so an interrupted crawl can be resumed."""
+
+import dataclasses
+import json
+import logging
+import pathlib
+import shutil
+import struct
+
+from scrapy import settings as scrapy_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class WebDataJobInfo:
+    """A summary of a partial crawl job."""
+
+    name: str
+    """The web data name."""
+
+    path: pathlib.Path
+    """The job directory."""
+
+    pending_requests: int
+    """The number of requests waiting in the persisted queue."""
+
+    seen_requests: int
+    """The number of request fingerprints in the persisted dupefilter."""
+
+    size_bytes: int
+    """The total size of the job files."""
+
+
+class WebDataJob:
+    """The persisted scheduler queue and dupefilter for one web data source.
+
+    Scrapy reads and writes the files in the job directory
+    when the JOBDIR setting is set to the job path.
+    """
+
+    def __init__(self, name: str, path: pathlib.Path) -> None:
+        self._name = name
+        self._path = path
+
+    @classmethod
+    def from_settings(
+        cls, settings: scrapy_settings.BaseSettings, name: str
+    ) -> "WebDataJob | None":
+        """Get the crawl job for a web data source.
+
+        Args:
+            settings: The scrapy Settings.
+            name: The web data name.
+
+        Returns:
+            The crawl job, or None if crawl jobs are not enabled.
+        """
+        jobs_dir = settings.get("WEB_DATA_JOBS_DIR")
+        if not settings.getbool("WEB_DATA_JOBS_ENABLED", True) or not jobs_dir:
+            return None
+        return cls(name, pathlib.Path(jobs_dir) / name)
+
+    @classmethod
+    def find_all(cls, settings: scrapy_settings.BaseSettings) -> list["WebDataJob"]:
+        """Find the partial crawl jobs.
+
+        Args:
+            settings: The scrapy Settings.
+
+        Returns:
+            The crawl jobs that have files, sorted by name.
+        """
+        jobs_dir = settings.get("WEB_DATA_JOBS_DIR")
+        if not jobs_dir or not pathlib.Path(jobs_dir).is_dir():
+            return []
+        return [
+            cls(i.name, i)
+            for i in sorted(pathlib.Path(jobs_dir).iterdir())
+            if i.is_dir() and any(i.iterdir())
+        ]
+
+    @property
+    def name(self) -> str:
+        """The web data name."""
+        return self._name
+
+    @property
+    def path(self) -> pathlib.Path:
+        """The job directory."""
+        return self._path
+
+    def exists(self) -> bool:
+        """Check whether there is a partial job.
+
+        Returns:
+            True if the job directory has files.
+        """
+        return self._path.is_dir() and any(self._path.iterdir())
+
+    def info(self) -> WebDataJobInfo:
+        """Read a summary of the job files.
+
+        Returns:
+            The job summary.
+        """
+        seen_path = self._path / "requests.seen"
+        seen_requests = 0
+        if seen_path.exists():
+            with seen_path.open("rb") as f:
+                seen_requests = sum(1 for line in f if line.strip())
+
+        size_bytes = sum(i.stat().st_size for i in self._path.rglob("*") if i.is_file())
+
+        return WebDataJobInfo(
+            name=self._name,
+            path=self._path,
+            pending_requests=self._pending_requests(),
+            seen_requests=seen_requests,
+            size_bytes=size_bytes,
+        )
+
+    def discard(self) -> None:
+        """Remove the job files.
+
+        Returns:
+            None
+        """
+        if self._path.exists():
+            shutil.rmtree(self._path)
+            logger.info("Discarded crawl job '%s'.", self._path)
+
+    def _pending_requests(self) -> int:
+        queue_dir = self._path / "requests.queue"
+        active_path = queue_dir / "active.json"
+        if not active_path.exists():
+            return 0
+
+        count = 0
+        for priority in json.loads(active_path.read_text(encoding="utf-8")):
+            queue_path = queue_dir / str(priority)
+            if queue_path.is_dir():
+                # fifo disk queues are a directory with an info file
+                info = json.loads((queue_path / "info.json").read_text("utf-8"))
+                count += info.get("size", 0)
+            elif queue_path.is_file():
+                # lifo disk queues are a file that starts with the size
+                with queue_path.open("rb") as f:
+                    (size,) = struct.unpack(">L", f.read(4))
+                count += size
+        return count
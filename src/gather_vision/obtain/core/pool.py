@@ -0,0 +1,100 @@
+"""Run CPU-bound parsing steps in a process pool shared by all web data."""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import typing
+from concurrent import futures
+
+from scrapy import settings as scrapy_settings
+
+logger = logging.getLogger(__name__)
+
+_pool: futures.ProcessPoolExecutor | None = None
+_pool_size: int | None = None
+
+
+def _init_worker() -> None:
+    # the functions run in the pool can use the Django models
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "gather_vision.proj.settings")
+    import django
+
+    django.setup()
+
+
+def get_pool(size: int) -> futures.ProcessPoolExecutor:
+    """Get the shared process pool, creating it if needed.
+
+    Args:
+        size: The number of worker processes.
+
+    Returns:
+        The process pool.
+    """
+    global _pool, _pool_size
+    if _pool is not None and _pool_size != size:
+        raise ValueError(
+            f"The process pool already has {_pool_size} workers, not {size}."
+        )
+    if _pool is None:
+        logger.info("Starting process pool with %s workers.", size)
+        _pool = futures.ProcessPoolExecutor(
+            max_workers=size,
+            # forking a process that is running the reactor is not safe
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        _pool_size = size
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the shared process pool, if it was started.
+
+    Returns:
+        None
+    """
+    global _pool, _pool_size
+    if _pool is None:
+        return
+    logger.info("Stopping process pool.")
+    _pool.shutdown(wait=True, cancel_futures=True)
+    _pool = None
+    _pool_size = None
+
+
+async def run_offload(
+    settings: scrapy_settings.BaseSettings | None,
+    func: typing.Callable[..., typing.Any],
+    args: typing.Sequence[typing.Any],
+) -> typing.Any:
+    """Run a function in the shared process pool and wait for the result.
+
+    The function and the arguments must be able to be pickled.
+    When the pool size is 0, the function is run in the current process.
+
+    Args:
+        settings: The scrapy Settings.
+        func: A module-level function.
+        args: The arguments for the function.
+
+    Returns:
+        The value returned by the function.
+    """
+    size = settings.getint("WEB_DATA_POOL_SIZE", 0) if settings else 0
+    if size < 1:
+        return func(*args)
+
+    timeout = settings.getfloat("WEB_DATA_POOL_TIMEOUT", 0) or None
+    future = get_pool(size).submit(func, *args)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except asyncio.TimeoutError as e:
+        # a task that has started cannot be stopped,
+        # it will finish in the background and the result is discarded
+        future.cancel()
+        raise TimeoutError(
+            f"Process pool task '{func.__qualname__}' "
+            f"did not finish within {timeout} seconds."
+        ) from e
@@ -0,0 +1,128 @@
+"""Find and import web data sources when they are needed."""
+
+import fnmatch
+import importlib
+import logging
+import typing
+
+from gather_vision.obtain.core.utils import GatherVisionException
+
+logger = logging.getLogger(__name__)
+
+
+def import_path(value: str) -> typing.Any:
+    """Import an attribute from a module.
+
+    Args:
+        value: The path in the form 'package.module:Attribute'.
+
+    Returns:
+        The attribute.
+    """
+    module_name, _, attr_name = value.partition(":")
+    if not module_name or not attr_name:
+        raise GatherVisionException(f"Invalid import path '{value}'.")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr_name)
+
+
+class WebDataRegistry:
+    """A registry of web data sources keyed by name.
+
+    The module for a source is only imported when that source is loaded.
+    """
+
+    def __init__(
+        self, sources: dict[str, str], items: typing.Iterable[str] | None = None
+    ) -> None:
+        """Create a new registry.
+
+        Args:
+            sources: The web data name and import path for each web data class.
+            items: The import path for each data item class.
+        """
+        self._sources = dict(sources)
+        self._items = list(items or [])
+        self._loaded: dict[str, type] = {}
+
+    def names(self) -> list[str]:
+        """Get the names of all the web data sources.
+
+        Returns:
+            The sorted web data names.
+        """
+        return sorted(self._sources.keys())
+
+    def select(self, patterns: typing.Iterable[str] | None = None) -> list[str]:
+        """Select web data names using names or glob patterns.
+
+        Args:
+            patterns: Names or glob patterns. Selects all sources if empty.
+
+        Returns:
+            The selected web data names, in registry order.
+        """
+        patterns = [i for i in (patterns or []) if i]
+        if not patterns:
+            return list(self._sources.keys())
+
+        unmatched = [i for i in patterns if not fnmatch.filter(self._sources.keys(), i)]
+        if unmatched:
+            opts = ", ".join(self.names())
+            raise GatherVisionException(
+                f"No web data matched '{', '.join(unmatched)}'. "
+                f"Expected one of '{opts}'."
+            )
+
+        return [
+            name
+            for name in self._sources.keys()
+            if any(fnmatch.fnmatchcase(name, i) for i in patterns)
+        ]
+
+    def load(self, name: str) -> type:
+        """Import the web data class for a name.
+
+        Args:
+            name: The web data name.
+
+        Returns:
+            The web data class.
+        """
+        if name in self._loaded:
+            return self._loaded[name]
+
+        path = self._sources.get(name)
+        if not path:
+            raise GatherVisionException(f"Unknown web data '{name}'.")
+
+        logger.debug("Loading web data '%s' from '%s'.", name, path)
+        web_data_class = import_path(path)
+
+        actual_name = web_data_class.web_data_name()
+        if actual_name != name:
+            raise GatherVisionException(
+                f"Web data '{path}' has name '{actual_name}', expected '{name}'."
+            )
+
+        self._loaded[name] = web_data_class
+        return web_data_class
+
+    def load_selected(self, patterns: typing.Iterable[str] | None = None) -> list[type]:
+        """Import the web data classes selected by names or glob patterns.
+
+        Args:
+            patterns: Names or glob patterns. Selects all sources if empty.
+
+        Returns:
+            The web data classes.
+        """
+        return [self.load(name) for name in self.select(patterns)]
+
+    def load_items(self) -> list[type]:
+        """Import all the data item classes.
+
+        Returns:
+            The data item classes.
+        """
+        return [import_path(i) for i in self._items]
@@ -0,0 +1,219 @@
+"""Parse stored responses again, without using the network."""
+
+import asyncio
+import dataclasses
+import inspect
+import logging
+import typing
+
+import scrapy
+from scrapy import crawler as scrapy_crawler, http, settings as scrapy_settings, signals
+from scrapy.exceptions import DropItem
+from scrapy.responsetypes import responsetypes
+from scrapy.statscollectors import MemoryStatsCollector
+from scrapy.utils.conf import build_component_list
+from scrapy.utils.misc import build_from_crawler, load_object
+from scrapy.utils.project import get_project_settings
+from scrapy.utils.reactor import install_reactor
+from twisted.internet import defer
+
+from gather_vision.obtain.core import data, pool
+from gather_vision.obtain.core.artifact import ArtifactStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class ReparseResult:
+    """The outcome of parsing the stored responses for a web data source."""
+
+    name: str
+    """The web data name."""
+
+    responses: int
+    """The number of stored responses that were parsed."""
+
+    missing: int
+    """The number of requests that had no stored response."""
+
+    items: int
+    """The number of items given to the item pipeline."""
+
+
+class WebDataReparse:
+    """Parse the stored responses for a web data source.
+
+    The requests start from the initial urls and follow the requests
+    provided by the web data, in the same way as a crawl.
+    The response for each request is read from the HTTP cache,
+    or from the artifact store if the cache does not have it.
+    The spider opened and closed signals are sent as in a crawl,
+    and the items are given to the ITEM_PIPELINES.
+
+    The state, final urls, and artifact store are not changed,
+    and unchanged responses are not skipped.
+    """
+
+    def __init__(
+        self,
+        web_data_class: type[data.WebData],
+        settings: scrapy_settings.BaseSettings,
+    ) -> None:
+        self._artifacts = ArtifactStore.from_settings(settings)
+
+        settings = settings.copy()
+        settings.set("WEB_DATA_STATE_ENABLED", False)
+        settings.set("WEB_DATA_SEEN_ENABLED", False)
+        settings.set("WEB_DATA_ARTIFACTS_ENABLED", False)
+        # the reparse is already run in a separate process
+        settings.set("WEB_DATA_POOL_SIZE", 0)
+
+        crawler = scrapy_crawler.Crawler(web_data_class, settings)
+        crawler.stats = MemoryStatsCollector(crawler)
+        crawler.request_fingerprinter = build_from_crawler(
+            load_object(settings["REQUEST_FINGERPRINTER_CLASS"]), crawler
+        )
+        self._crawler = crawler
+
+        self._spider = web_data_class.from_crawler(crawler)
+        self._spider.unchanged_response = "parse"
+        crawler.spider = self._spider
+
+        self._cache = load_object(settings["HTTPCACHE_STORAGE"])(settings)
+        self._pipelines = [
+            build_from_crawler(load_object(i), crawler)
+            for i in build_component_list(settings.getwithbase("ITEM_PIPELINES"))
+        ]
+
+    async def run(self) -> ReparseResult:
+        """Parse the stored responses and save the items.
+
+        Returns:
+            The outcome of the reparse.
+        """
+        spider = self._spider
+        self._cache.open_spider(spider)
+        for pipeline in self._pipelines:
+            await self._call(pipeline, "open_spider", spider)
+        await self._send(signals.spider_opened, spider=spider)
+
+        fingerprinter = self._crawler.request_fingerprinter
+        pending = list(spider.start_requests())
+        seen = set()
+        responses = missing = items = 0
+        try:
+            while pending:
+                request = pending.pop()
+                fingerprint = fingerprinter.fingerprint(request)
+                if fingerprint in seen:
+                    continue
+                seen.add(fingerprint)
+
+                response = self._retrieve(request)
+                if response is None:
+                    missing += 1
+                    logger.debug("No stored response for '%s'.", request.url)
+                    continue
+
+                responses += 1
+                async for result in spider.parse(response, **request.cb_kwargs):
+                    if isinstance(result, scrapy.Request):
+                        pending.append(result)
+                    else:
+                        items += 1
+                        await self._process_item(result)
+        finally:
+            # the same order as the crawl engine
+            for pipeline in self._pipelines:
+                await self._call(pipeline, "close_spider", spider)
+            await self._send(signals.spider_closed, spider=spider, reason="finished")
+            self._cache.close_spider(spider)
+
+        result = ReparseResult(
+            name=spider.name, responses=responses, missing=missing, items=items
+        )
+        logger.info("Reparsed %s.", result)
+        return result
+
+    async def _send(self, signal, **kwargs) -> None:
+        result = self._crawler.signals.send_catch_log_deferred(signal, **kwargs)
+        await result.asFuture(asyncio.get_running_loop())
+
+    async def _process_item(self, item: data.GatherDataItem) -> None:
+        # each pipeline gets the item returned by the previous pipeline
+        for pipeline in self._pipelines:
+            try:
+                item = await self._call(pipeline, "process_item", item, self._spider)
+            except DropItem as e:
+                logger.debug("Dropped item: %s", e)
+                return
+
+    async def _call(self, pipeline, method: str, *args):
+        func = getattr(pipeline, method, None)
+        if func is None:
+            return args[0]
+        result = func(*args)
+        if isinstance(result, defer.Deferred):
+            return await result.asFuture(asyncio.get_running_loop())
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+    def _retrieve(self, request: scrapy.Request) -> http.Response | None:
+        response = self._cache.retrieve_response(self._spider, request)
+        if response is None and self._artifacts:
+            record = self._artifacts.find(request.url)
+            if record:
+                with self._artifacts.open(record) as f:
+                    body = f.read()
+                headers = {"Content-Type": record.content_type}
+                response_class = responsetypes.from_args(
+                    headers=headers, url=record.url, body=body
+                )
+                response = response_class(url=record.url, headers=headers, body=body)
+        if response is None:
+            return None
+        return response.replace(request=request)
+
+
+def reparse_web_data(name: str) -> ReparseResult:
+    """Parse the stored responses for a web data source.
+
+    This is run in the process pool.
+
+    Args:
+        name: The web data name.
+
+    Returns:
+        The outcome of the reparse.
+    """
+    from gather_vision.obtain.place import web_data_registry
+
+    web_data_class = web_data_registry.load(name)
+    settings = get_project_settings()
+    # async signal handlers and pipelines need the configured reactor
+    if settings.get("TWISTED_REACTOR"):
+        install_reactor(settings["TWISTED_REACTOR"])
+    reparse = WebDataReparse(web_data_class, settings)
+    return asyncio.run(reparse.run())
+
+
+def reparse_all(names: typing.Iterable[str], processes: int) -> list[ReparseResult]:
+    """Parse the stored responses for web data sources, in parallel.
+
+    Args:
+        names: The web data names.
+        processes: The number of processes to use.
+
+    Returns:
+        The outcome for each web data source.
+    """
+    names = list(names)
+    if processes < 2 or len(names) < 2:
+        return [reparse_web_data(name) for name in names]
+
+    try:
+        executor = pool.get_pool(min(processes, len(names)))
+        return list(executor.map(reparse_web_data, names))
+    finally:
+        pool.shutdown_pool()
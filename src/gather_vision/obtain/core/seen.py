@@ -0,0 +1,244 @@
+"""Remember urls that never change, so later runs do not request them again."""
+
+import hashlib
+import logging
+import math
+import pathlib
+import struct
+
+from scrapy import settings as scrapy_settings
+from scrapy.dupefilters import RFPDupeFilter
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """A compact set that can have false positives, but no false negatives.
+
+    Checking for a value that was added is always True.
+    Checking for a value that was not added is usually False,
+    with a chance of True that grows as more values are added.
+    """
+
+    _magic = b"GVBF"
+    _version = 1
+    _header = struct.Struct(">4sBQBQ")
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        """Create a new empty filter.
+
+        Args:
+            capacity: The number of values expected to be added.
+            error_rate: The chance of a false positive at capacity.
+        """
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("Capacity must be positive and error rate between 0-1.")
+        bit_count = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        hash_count = max(1, round(bit_count / capacity * math.log(2)))
+        self._setup(bit_count, hash_count, 0, bytearray(math.ceil(bit_count / 8)))
+        self.capacity = capacity
+
+    def _setup(self, bit_count: int, hash_count: int, count: int, bits: bytearray):
+        self._bit_count = bit_count
+        self._hash_count = hash_count
+        self._count = count
+        self._bits = bits
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, value: str) -> bool:
+        bits = self._bits
+        return all(bits[i >> 3] & (1 << (i & 7)) for i in self._indexes(value))
+
+    def add(self, value: str) -> bool:
+        """Add a value.
+
+        Args:
+            value: The value to add.
+
+        Returns:
+            True if the value was not already present.
+        """
+        added = False
+        bits = self._bits
+        for index in self._indexes(value):
+            mask = 1 << (index & 7)
+            if not bits[index >> 3] & mask:
+                bits[index >> 3] |= mask
+                added = True
+        if added:
+            self._count += 1
+        return added
+
+    def to_bytes(self) -> bytes:
+        """Get the filter as bytes.
+
+        Returns:
+            The header and bits.
+        """
+        header = self._header.pack(
+            self._magic, self._version, self._bit_count, self._hash_count, self._count
+        )
+        return header + bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, value: bytes, capacity: int) -> "BloomFilter":
+        """Create a filter from bytes.
+
+        Args:
+            value: The bytes from :meth:`to_bytes`.
+            capacity: The number of values expected to be added.
+
+        Returns:
+            The filter.
+        """
+        size = cls._header.size
+        if len(value) < size:
+            raise ValueError("Bloom filter data is too short.")
+        magic, version, bit_count, hash_count, count = cls._header.unpack(value[:size])
+        bits = bytearray(value[size:])
+        if magic != cls._magic or version != cls._version:
+            raise ValueError("Bloom filter data has an unknown format.")
+        if len(bits) != math.ceil(bit_count / 8):
+            raise ValueError("Bloom filter data has the wrong length.")
+
+        result = cls.__new__(cls)
+        result._setup(bit_count, hash_count, count, bits)
+        result.capacity = capacity
+        return result
+
+    def _indexes(self, value: str) -> list[int]:
+        # two hashes from one digest give all the indexes (double hashing)
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        bit_count = self._bit_count
+        return [(first + i * second) % bit_count for i in range(self._hash_count)]
+
+
+class WebDataSeen:
+    """The urls for a web data source that are final and do not need requesting.
+
+    When no path is given, the urls are only kept in memory.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path | None = None,
+        capacity: int = 100000,
+        error_rate: float = 0.0001,
+    ) -> None:
+        self._path = path
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._filter: BloomFilter | None = None
+        self._changed = False
+
+    @classmethod
+    def from_settings(
+        cls, settings: scrapy_settings.BaseSettings, name: str
+    ) -> "WebDataSeen":
+        """Create the final url store for a web data source.
+
+        Args:
+            settings: The scrapy Settings.
+            name: The web data name.
+
+        Returns:
+            A new final url store.
+        """
+        capacity = settings.getint("WEB_DATA_SEEN_CAPACITY", 100000)
+        error_rate = settings.getfloat("WEB_DATA_SEEN_ERROR_RATE", 0.0001)
+        seen_dir = settings.get("WEB_DATA_SEEN_DIR")
+        if not settings.getbool("WEB_DATA_SEEN_ENABLED", True) or not seen_dir:
+            return cls(None, capacity, error_rate)
+        path = pathlib.Path(seen_dir) / f"{name}.bloom"
+        return cls(path, capacity, error_rate)
+
+    @property
+    def path(self) -> pathlib.Path | None:
+        """The path to the file that stores the urls."""
+        return self._path
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._load()
+
+    def add(self, url: str) -> None:
+        """Mark a url as final.
+
+        Args:
+            url: The url.
+
+        Returns:
+            None
+        """
+        items = self._load()
+        if items.add(url):
+            self._changed = True
+            if len(items) == items.capacity + 1:
+                logger.warning(
+                    "Final urls in '%s' are over capacity %s, "
+                    "so more urls will be wrongly skipped.",
+                    self._path,
+                    items.capacity,
+                )
+
+    def save(self) -> None:
+        """Write the urls to the file, if there are changes.
+
+        Returns:
+            None
+        """
+        if not self._path or not self._changed:
+            return
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self._path.with_suffix(".tmp")
+        temp_path.write_bytes(self._filter.to_bytes())
+        temp_path.replace(self._path)
+        self._changed = False
+
+        logger.info("Saved %s final urls to '%s'.", len(self._filter), self._path)
+
+    def _load(self) -> BloomFilter:
+        if self._filter is not None:
+            return self._filter
+
+        if self._path and self._path.exists():
+            try:
+                self._filter = BloomFilter.from_bytes(
+                    self._path.read_bytes(), self._capacity
+                )
+                return self._filter
+            except ValueError:
+                logger.warning("Ignoring invalid final urls file '%s'.", self._path)
+
+        self._filter = BloomFilter(self._capacity, self._error_rate)
+        return self._filter
+
+
+class SeenUrlDupeFilter(RFPDupeFilter):
+    """A dupefilter that also drops requests for urls that are final.
+
+    The final urls are kept by each web data, see :meth:`WebData.mark_final`.
+    """
+
+    _crawler = None
+
+    @classmethod
+    def from_crawler(cls, crawler) -> "SeenUrlDupeFilter":
+        dupefilter = super().from_crawler(crawler)
+        dupefilter._crawler = crawler
+        return dupefilter
+
+    def request_seen(self, request) -> bool:
+        spider = getattr(self._crawler, "spider", None)
+        final_urls = getattr(spider, "final_urls", None)
+        if isinstance(final_urls, WebDataSeen) and request.url in final_urls:
+            if self._crawler.stats:
+                self._crawler.stats.inc_value(
+                    "gather_vision/seen/dropped", spider=spider
+                )
+            return True
+        return super().request_seen(request)
@@ -0,0 +1,119 @@
+"""Persisted state for web data sources."""
+
+import json
+import logging
+import pathlib
+import typing
+
+from scrapy import settings as scrapy_settings
+
+logger = logging.getLogger(__name__)
+
+
+class WebDataState:
+    """A key/value store that is kept between runs of a web data source.
+
+    Values must be able to be serialised to json.
+    When no path is given, the state is only kept in memory.
+    """
+
+    def __init__(self, path: pathlib.Path | None = None) -> None:
+        self._path = path
+        self._data: dict[str, typing.Any] | None = None
+        self._changed = False
+
+    @classmethod
+    def from_settings(
+        cls, settings: scrapy_settings.BaseSettings, name: str
+    ) -> "WebDataState":
+        """Create the state store for a web data source.
+
+        Args:
+            settings: The scrapy Settings.
+            name: The web data name.
+
+        Returns:
+            A new state store.
+        """
+        state_dir = settings.get("WEB_DATA_STATE_DIR")
+        if not settings.getbool("WEB_DATA_STATE_ENABLED", True) or not state_dir:
+            return cls()
+        return cls(pathlib.Path(state_dir) / f"{name}.json")
+
+    @property
+    def path(self) -> pathlib.Path | None:
+        """The path to the file that stores the state."""
+        return self._path
+
+    def get(self, key: str, default: typing.Any = None) -> typing.Any:
+        """Get the value for a key.
+
+        Args:
+            key: The key.
+            default: The value to return if the key is not present.
+
+        Returns:
+            The stored value or the default.
+        """
+        return self._load().get(key, default)
+
+    def set(self, key: str, value: typing.Any) -> None:
+        """Set the value for a key.
+
+        Args:
+            key: The key.
+            value: The value to store.
+
+        Returns:
+            None
+        """
+        items = self._load()
+        if items.get(key) != value:
+            items[key] = value
+            self._changed = True
+
+    def delete(self, key: str) -> None:
+        """Remove a key.
+
+        Args:
+            key: The key.
+
+        Returns:
+            None
+        """
+        items = self._load()
+        if key in items:
+            del items[key]
+            self._changed = True
+
+    def save(self) -> None:
+        """Write the state to the file, if there are changes.
+
+        Returns:
+            None
+        """
+        if not self._path or not self._changed:
+            return
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self._path.with_suffix(".tmp")
+        temp_path.write_text(
+            json.dumps(self._data, sort_keys=True, indent=0), encoding="utf-8"
+        )
+        temp_path.replace(self._path)
+        self._changed = False
+
+        logger.info("Saved %s state entries to '%s'.", len(self._data), self._path)
+
+    def _load(self) -> dict[str, typing.Any]:
+        if self._data is not None:
+            return self._data
+
+        self._data = {}
+        if self._path and self._path.exists():
+            try:
+                self._data = json.loads(self._path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                logger.warning("Ignoring invalid state file '%s'.", self._path)
+
+        return self._data
@@ -0,0 +1,510 @@
+"""Read large web response bodies without keeping extra copies in memory."""
+
+import contextlib
+import csv
+import dataclasses
+import io
+import json
+import mmap
+import pathlib
+import typing
+
+from defusedxml.ElementTree import iterparse
+
+from gather_vision.obtain.core.utils import xml_to_data
+
+
+class MappedFile(io.RawIOBase):
+    """A read-only binary file that reads from a memory map."""
+
+    def __init__(self, mapped: mmap.mmap) -> None:
+        super().__init__()
+        self._mapped = mapped
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._mapped.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._mapped.seek(offset, whence)
+        return self._mapped.tell()
+
+    def tell(self) -> int:
+        return self._mapped.tell()
+
+
+@contextlib.contextmanager
+def open_spooled(path: pathlib.Path) -> typing.Iterator[typing.BinaryIO]:
+    """Open a spooled file as a read-only memory map.
+
+    Args:
+        path: The path to the spooled file.
+
+    Returns:
+        A context manager that provides the memory-mapped file.
+    """
+    with path.open("rb") as f:
+        if path.stat().st_size < 1:
+            # an empty file cannot be memory-mapped
+            yield f
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with io.BufferedReader(MappedFile(mapped)) as reader:
+                yield reader
+
+
+@contextlib.contextmanager
+def open_body(value: bytes | None) -> typing.Iterator[typing.BinaryIO]:
+    """Open a response body as a binary file.
+
+    Args:
+        value: The body bytes.
+
+    Returns:
+        A context manager that provides the file.
+    """
+    with io.BytesIO(value or b"") as f:
+        yield f
+
+
+FeedItem = dict[str, str | list[str]]
+"""A feed item, where each key is an element tag without the namespace."""
+
+_feed_item_tags = {"item", "entry"}
+_feed_channel_tags = {"channel", "feed"}
+
+
+def local_tag(tag: str) -> str:
+    """Get an xml element tag without the namespace.
+
+    Args:
+        tag: The element tag.
+
+    Returns:
+        The tag without the namespace.
+    """
+    return tag.rsplit("}", maxsplit=1)[-1]
+
+
+def feed_values(item: FeedItem, key: str) -> list[str]:
+    """Get all the values for a key in a feed item.
+
+    Args:
+        item: The feed item.
+        key: The key.
+
+    Returns:
+        The values, which is an empty list if the key is not present.
+    """
+    value = item.get(key)
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def iter_feed_items(source: typing.BinaryIO) -> typing.Iterator[FeedItem]:
+    """Read the items from an RSS or Atom feed one at a time.
+
+    Each child element of an item or entry becomes a key,
+    with the element text as the value.
+    The 'href' or 'url' attribute is used for elements with no text.
+    Elements that occur more than once in an item have a list of values.
+    The child elements of the channel or feed that are before an item
+    are included with the prefix 'channel_'.
+
+    Elements are released once they have been read,
+    so memory use does not grow with the size of the feed.
+    Documents with entity declarations or external references are rejected.
+
+    Args:
+        source: The feed as a binary file.
+
+    Returns:
+        An iterator of feed items.
+    """
+    channel: dict[str, str] = {}
+    stack = []
+    for event, element in iterparse(source, events=("start", "end")):
+        if event == "start":
+            stack.append(element)
+            continue
+
+        stack.pop()
+        tag = local_tag(element.tag)
+        parent = stack[-1] if stack else None
+        parent_tag = local_tag(parent.tag) if parent is not None else None
+
+        if tag in _feed_item_tags:
+            item: FeedItem = {f"channel_{k}": v for k, v in channel.items()}
+            for child in element:
+                _feed_item_add(item, local_tag(child.tag), _feed_element_value(child))
+            yield item
+
+        elif parent_tag in _feed_channel_tags:
+            channel[tag] = _feed_element_value(element)
+
+        else:
+            # keep the children of items until the item is complete
+            continue
+
+        element.clear()
+        if parent is not None:
+            parent.remove(element)
+
+
+def _feed_element_value(element) -> str:
+    value = element.text
+    if value is None or not value.strip():
+        value = element.attrib.get("href") or element.attrib.get("url") or value
+    return value or ""
+
+
+def _feed_item_add(item: FeedItem, key: str, value: str) -> None:
+    if key not in item:
+        item[key] = value
+    elif isinstance(item[key], list):
+        item[key].append(value)
+    else:
+        item[key] = [item[key], value]
+
+
+@dataclasses.dataclass(frozen=True)
+class XmlRecord:
+    """A completed xml element that was read from a larger document."""
+
+    kind: str
+    """The kind of record."""
+
+    data: dict
+    """The element converted using xml_to_data."""
+
+    context: dict[str, dict[str, str]]
+    """The attributes of the enclosing records, by kind."""
+
+
+def iter_xml_records(
+    source: typing.BinaryIO, kinds: dict[str, str]
+) -> typing.Iterator[XmlRecord]:
+    """Read records from an xml document as each record element is completed.
+
+    Records can be nested, such as booths inside an electorate.
+    A nested record is provided before the record that contains it,
+    and is not included in the data of the containing record.
+
+    Record elements, and elements that are not inside a record,
+    are released once they have been read,
+    so memory use does not grow with the size of the document.
+    Documents with entity declarations or external references are rejected.
+
+    Args:
+        source: The xml as a binary file.
+        kinds: The kind of record for each element tag, without the namespace.
+
+    Returns:
+        An iterator of records.
+    """
+    stack = []
+    context: list[tuple[str, dict[str, str]]] = []
+    for event, element in iterparse(source, events=("start", "end")):
+        kind = kinds.get(local_tag(element.tag))
+        if event == "start":
+            stack.append(element)
+            if kind:
+                context.append((kind, dict(element.attrib)))
+            continue
+
+        stack.pop()
+        if not kind:
+            # elements inside a record are kept until the record is complete
+            if not context:
+                element.clear()
+                if stack:
+                    stack[-1].remove(element)
+            continue
+
+        context.pop()
+        yield XmlRecord(
+            kind=kind,
+            data=xml_to_data(element),
+            context={k: v for k, v in context},
+        )
+
+        element.clear()
+        if stack:
+            stack[-1].remove(element)
+
+
+SheetCells = list[tuple[int, typing.Any]]
+"""The column number and value of each non-empty cell in a sheet row."""
+
+
+@dataclasses.dataclass(frozen=True)
+class SheetRow:
+    """A body row from a workbook sheet."""
+
+    sheet: str
+    """The sheet name."""
+
+    row: int
+    """The row number."""
+
+    cells: list[tuple[typing.Any, typing.Any]]
+    """The header and value of each non-empty cell."""
+
+
+def iter_sheet_rows(
+    source: typing.BinaryIO,
+    row_kind: typing.Callable[[SheetCells], typing.Optional[str]],
+) -> typing.Iterator[SheetRow]:
+    """Read the body rows from each sheet of a workbook.
+
+    Only the cell values are read, and each row is provided as it is read.
+    The row kind function decides whether a row is a 'header' row,
+    a 'body' row, or is skipped (None).
+    The headers are the values from the header rows by column,
+    and are added to the body rows that come after them.
+
+    Args:
+        source: The xlsx workbook as a binary file.
+        row_kind: Get the kind of a row from its non-empty cells.
+
+    Returns:
+        An iterator of body rows.
+    """
+    # openpyxl is only needed by the sources that read workbooks
+    from openpyxl import load_workbook
+
+    wb = load_workbook(filename=source, data_only=True, read_only=True)
+    try:
+        for sheet_name in wb.sheetnames:
+            headers: dict[int, typing.Any] = {}
+            rows = wb[sheet_name].iter_rows(values_only=True)
+            for row_number, values in enumerate(rows, start=1):
+                cells = [(col, value) for col, value in enumerate(values, 1) if value]
+                kind = row_kind(cells)
+                if kind == "header":
+                    headers.update(cells)
+                elif kind == "body":
+                    yield SheetRow(
+                        sheet=sheet_name,
+                        row=row_number,
+                        cells=[(headers.get(col), value) for col, value in cells],
+                    )
+    finally:
+        wb.close()
+
+
+@dataclasses.dataclass(frozen=True)
+class CsvHeader:
+    """The column names of a csv file, and the position of each name."""
+
+    names: tuple[str, ...]
+    """The column names, in order."""
+
+    index: dict[str, int]
+    """The position of each column name.
+    When a name is repeated, the first position is used."""
+
+    @classmethod
+    def from_row(cls, row: list[str]) -> "CsvHeader":
+        names = tuple(i.strip() for i in row)
+        index = {}
+        for position, name in enumerate(names):
+            index.setdefault(name, position)
+        return cls(names=names, index=index)
+
+
+def iter_csv_chunks(
+    source: typing.BinaryIO,
+    chunk_size: int = 1000,
+    encoding: str = "utf-8-sig",
+    required: typing.Iterable[str] = (),
+) -> typing.Iterator[tuple[CsvHeader, list[list[str]]]]:
+    """Read the rows of a csv file in chunks.
+
+    The header is the first row that has all the required column names,
+    or the first row that is not blank if there are no required names.
+    The rows before the header are skipped, as are blank rows.
+
+    The file is decoded as it is read,
+    so the whole text is never in memory.
+
+    Args:
+        source: The csv as a binary file.
+        chunk_size: The maximum number of rows in each chunk.
+        encoding: The text encoding.
+        required: The column names that identify the header row.
+
+    Returns:
+        An iterator of the header and a list of rows.
+    """
+    required = {i.strip() for i in required}
+    text = io.TextIOWrapper(source, encoding=encoding, newline="")
+    try:
+        reader = csv.reader(text)
+        header = None
+        for row in reader:
+            if not any(row):
+                continue
+            candidate = CsvHeader.from_row(row)
+            if required.issubset(candidate.index):
+                header = candidate
+                break
+        if header is None:
+            return
+
+        chunk = []
+        for row in reader:
+            if not any(row):
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield header, chunk
+                chunk = []
+        if chunk:
+            yield header, chunk
+    finally:
+        # leave the source open for the caller to close
+        text.detach()
+
+
+JsonPath = tuple[str | int, ...]
+"""The object keys and array positions that lead to a value in a json document."""
+
+_json_decoder = json.JSONDecoder()
+_json_whitespace = " \t\n\r"
+
+
+class _JsonReader:
+    """Read json values from a text file, keeping only part of the text."""
+
+    def __init__(self, source: typing.TextIO, read_size: int) -> None:
+        self._source = source
+        self._read_size = read_size
+        self._text = ""
+        self._position = 0
+        self._finished = False
+
+    def _more(self) -> bool:
+        if self._finished:
+            return False
+        # drop the text that has been read
+        if self._position:
+            self._text = self._text[self._position :]
+            self._position = 0
+        value = self._source.read(self._read_size)
+        if not value:
+            self._finished = True
+            return False
+        self._text += value
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and get the next character, or '' at the end."""
+        while True:
+            text = self._text
+            position = self._position
+            while position < len(text) and text[position] in _json_whitespace:
+                position += 1
+            self._position = position
+            if position < len(text):
+                return text[position]
+            if not self._more():
+                return ""
+
+    def expect(self, values: str) -> str:
+        """Read the next character, which must be one of the values."""
+        value = self.peek()
+        if not value or value not in values:
+            raise ValueError(
+                f"Expected one of '{values}' in json but found '{value or 'end'}'."
+            )
+        self._position += 1
+        return value
+
+    def value(self) -> typing.Any:
+        """Read the next json value."""
+        self.peek()
+        while True:
+            try:
+                result, end = _json_decoder.raw_decode(self._text, self._position)
+            except json.JSONDecodeError:
+                # the value might continue in the text that has not been read
+                if self._more():
+                    continue
+                raise
+            # a number at the end of the text might have more digits
+            if end >= len(self._text) and self._more():
+                continue
+            self._position = end
+            return result
+
+
+def iter_json_items(
+    source: typing.BinaryIO,
+    path: JsonPath = (),
+    encoding: str = "utf-8-sig",
+    read_size: int = 65536,
+) -> typing.Iterator[typing.Any]:
+    """Read the elements of a json array one at a time.
+
+    The array is found by following the path from the top-level value.
+    Each element is decoded when it is reached,
+    so the whole document is never decoded at once.
+    Values that are not on the path are decoded and discarded.
+
+    Args:
+        source: The json as a binary file.
+        path: The object keys and array positions that lead to the array.
+        encoding: The text encoding.
+        read_size: The number of characters to read at a time.
+
+    Returns:
+        An iterator of the array elements.
+    """
+    text = io.TextIOWrapper(source, encoding=encoding)
+    try:
+        reader = _JsonReader(text, read_size)
+        for step in path:
+            _json_find(reader, step, path)
+
+        reader.expect("[")
+        if reader.peek() == "]":
+            return
+        while True:
+            yield reader.value()
+            if reader.expect(",]") == "]":
+                return
+    finally:
+        # leave the source open for the caller to close
+        text.detach()
+
+
+def _json_find(reader: _JsonReader, step: str | int, path: JsonPath) -> None:
+    is_key = isinstance(step, str)
+    reader.expect("{" if is_key else "[")
+    index = 0
+    if reader.peek() not in "}]":
+        while True:
+            if is_key:
+                key = reader.value()
+                reader.expect(":")
+                if key == step:
+                    return
+            elif index == step:
+                return
+            reader.value()
+            index += 1
+            if reader.expect(",}" if is_key else ",]") in "}]":
+                break
+    raise ValueError(f"Cannot find '{step}' of json path {list(path)}.")
@@ -0,0 +1,408 @@
+"""Find and match terms in text."""
+
+import collections
+import dataclasses
+import functools
+import re
+import typing
+
+from django.utils.text import slugify
+
+
+@dataclasses.dataclass(frozen=True)
+class KeywordMatches:
+    """The keywords found in a text, and the text without them."""
+
+    residual: str
+    """The text with the keywords removed."""
+
+    hits: dict[str, list[str]]
+    """The distinct keywords found for each category, lower case and sorted."""
+
+
+class KeywordExtractor:
+    """Find and remove categorised keywords from text in one scan.
+
+    The keywords for all the categories are combined into one pattern,
+    with a named group for each category.
+    Each keyword is a regular expression that must match whole words.
+    When keywords overlap, the earlier category is preferred.
+
+    Keywords are only found in the original text,
+    not in text that is joined up by removing another keyword.
+    """
+
+    def __init__(
+        self, categories: dict[str, typing.Iterable[str]], flags: int = re.IGNORECASE
+    ) -> None:
+        self._categories = list(categories.keys())
+        self._groups = {f"k{index}": name for index, name in enumerate(categories)}
+        alternatives = "|".join(
+            f"(?P<k{index}>{'|'.join(values)})"
+            for index, values in enumerate(categories.values())
+        )
+        self._pattern = re.compile(rf"\b(?:{alternatives})\b", flags)
+
+    @property
+    def pattern(self) -> re.Pattern:
+        """The combined pattern."""
+        return self._pattern
+
+    def extract(self, value: str) -> KeywordMatches:
+        """Find the keywords in a text.
+
+        The text is the same as removing the keywords one at a time,
+        in category order, and joining the stripped text on either side
+        of each keyword with a single space.
+
+        Args:
+            value: The text to search.
+
+        Returns:
+            The keywords found and the remaining text.
+        """
+        found = {name: set() for name in self._categories}
+        pieces = []
+        position = 0
+        # the last keyword to be removed decides the outer spaces
+        last_category = -1
+        last_before = 0
+        for match in self._pattern.finditer(value):
+            group = match.lastgroup
+            found[self._groups[group]].add(match.group(group).strip().lower())
+
+            piece = value[position : match.start()].strip()
+            if piece:
+                pieces.append(piece)
+            position = match.end()
+
+            category = int(group[1:])
+            if category >= last_category:
+                last_category = category
+                last_before = len(pieces)
+
+        if last_category < 0:
+            residual = value
+        else:
+            piece = value[position:].strip()
+            if piece:
+                pieces.append(piece)
+            if not pieces:
+                residual = " "
+            else:
+                prefix = " " if last_before == 0 else ""
+                suffix = " " if last_before == len(pieces) else ""
+                residual = prefix + " ".join(pieces) + suffix
+
+        return KeywordMatches(
+            residual=residual,
+            hits={name: sorted(values) for name, values in found.items()},
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class PatternMatch:
+    """The pattern that matched a text, and its named groups."""
+
+    index: int
+    """The position of the pattern in the dispatch."""
+
+    groups: dict[str, str | None]
+    """The named groups of the pattern."""
+
+
+class PatternDispatch:
+    """Match a text using the first of a list of patterns that matches.
+
+    The patterns are combined into one pattern that is tried once.
+    Each pattern is an alternative, and its group names are prefixed,
+    so the patterns can use the same group names.
+    The alternatives are tried in order, so the result is the same
+    as trying each pattern in turn.
+
+    The number of texts matched by each pattern is counted.
+    """
+
+    _group_name = re.compile(r"\(\?P([<=])(\w+)([>)])")
+
+    def __init__(self, patterns: typing.Iterable[re.Pattern]) -> None:
+        self._patterns = list(patterns)
+        self._names = [list(i.groupindex.keys()) for i in self._patterns]
+        self._hits = collections.Counter()
+        self._misses = 0
+
+        flags = {i.flags for i in self._patterns}
+        alternatives = []
+        for index, pattern in enumerate(self._patterns):
+            source = self._group_name.sub(
+                lambda m: f"(?P{m.group(1)}p{index}_{m.group(2)}{m.group(3)}",
+                pattern.pattern,
+            )
+            alternatives.append(f"(?P<p{index}>{source})")
+
+        # numbered back references would refer to the wrong groups
+        self._combined = None
+        if len(flags) == 1 and not any(
+            re.search(r"\\[1-9]", i.pattern) for i in self._patterns
+        ):
+            try:
+                self._combined = re.compile("|".join(alternatives), flags.pop())
+            except re.error:
+                # some patterns, such as those with inline flags, cannot be combined
+                self._combined = None
+
+    @property
+    def patterns(self) -> list[re.Pattern]:
+        """The patterns, in the order they are tried."""
+        return list(self._patterns)
+
+    @property
+    def hits(self) -> dict[int, int]:
+        """The number of matches for each pattern index."""
+        return dict(self._hits)
+
+    @property
+    def misses(self) -> int:
+        """The number of texts that no pattern matched."""
+        return self._misses
+
+    def match(self, value: str) -> PatternMatch | None:
+        """Match a text from the start.
+
+        Args:
+            value: The text to match.
+
+        Returns:
+            The match, or None if no pattern matches.
+        """
+        result = None
+        if self._combined is not None:
+            match = self._combined.match(value)
+            if match:
+                index = int(match.lastgroup[1:])
+                groups = {i: match.group(f"p{index}_{i}") for i in self._names[index]}
+                result = PatternMatch(index=index, groups=groups)
+        else:
+            for index, pattern in enumerate(self._patterns):
+                match = pattern.match(value)
+                if match:
+                    result = PatternMatch(index=index, groups=match.groupdict())
+                    break
+
+        if result is None:
+            self._misses += 1
+        else:
+            self._hits[result.index] += 1
+        return result
+
+
+@dataclasses.dataclass(frozen=True)
+class TermMatch:
+    """A term found in a text."""
+
+    start: int
+    """The position of the first character in the text."""
+
+    end: int
+    """The position after the last character in the text."""
+
+    term: str
+    """The normalised term."""
+
+    values: tuple[typing.Hashable, ...]
+    """The values added with the term."""
+
+
+def _fold(value: str) -> str:
+    # keep one character for each character, so positions stay the same
+    folded = value.lower()
+    return folded if len(folded) == 1 else value
+
+
+class TermMatcher:
+    """Find whole-word terms in a text in one scan.
+
+    The terms are kept in an Aho-Corasick automaton,
+    so the scan takes the same time however many terms there are.
+    Matching ignores case,
+    and a run of whitespace in the text matches a space in a term.
+    When found terms overlap, the first and then the longest is used.
+
+    Terms can be added at any time.
+    A new term is added to the existing tree of terms.
+    The links between partial matches are then built again for all terms
+    before the next scan, so add many terms before searching when possible.
+    """
+
+    def __init__(
+        self, terms: typing.Iterable[tuple[str, typing.Hashable]] = ()
+    ) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._depth: list[int] = [0]
+        self._terms: list[str | None] = [None]
+        self._values: list[list[typing.Hashable]] = [[]]
+        self._output: list[tuple[int, ...]] = [()]
+        self._count = 0
+        self._stale = False
+        for term, value in terms:
+            self.add(term, value)
+
+    def __len__(self) -> int:
+        """The number of distinct terms."""
+        return self._count
+
+    @staticmethod
+    def normalise(value: str) -> str:
+        """Get the form of a term that is matched.
+
+        Args:
+            value: The term.
+
+        Returns:
+            The lower case term with single spaces.
+        """
+        return "".join(_fold(i) for i in " ".join(value.split()))
+
+    def add(self, term: str, value: typing.Hashable) -> bool:
+        """Add a term.
+
+        Args:
+            term: The term to find.
+            value: A value to provide when the term is found.
+
+        Returns:
+            True if the term and value were not already added.
+        """
+        term = self.normalise(term)
+        if not term:
+            return False
+
+        node = 0
+        for char in term:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][char] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._depth.append(self._depth[node] + 1)
+                self._terms.append(None)
+                self._values.append([])
+                self._output.append(())
+                self._stale = True
+            node = child
+
+        if self._terms[node] is None:
+            self._terms[node] = term
+            self._count += 1
+            self._stale = True
+        if value in self._values[node]:
+            return False
+        self._values[node].append(value)
+        return True
+
+    def find(self, value: str) -> list[TermMatch]:
+        """Find the terms in a text.
+
+        Args:
+            value: The text to search.
+
+        Returns:
+            The terms found, in the order they appear, without overlaps.
+        """
+        if self._stale:
+            self._build()
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        depth = self._depth
+
+        state = 0
+        positions = []
+        found = []
+        previous_space = False
+        for index, char in enumerate(value):
+            if char.isspace():
+                if previous_space:
+                    continue
+                previous_space = True
+                char = " "
+            else:
+                previous_space = False
+                char = _fold(char)
+            positions.append(index)
+
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for node in output[state]:
+                start = positions[-depth[node]]
+                end = index + 1
+                # only whole words
+                if start > 0 and value[start - 1].isalnum():
+                    continue
+                if end < len(value) and value[end].isalnum():
+                    continue
+                found.append((start, -end, node))
+
+        results = []
+        position = 0
+        for start, end, node in sorted(found):
+            if start < position:
+                continue
+            position = -end
+            results.append(
+                TermMatch(
+                    start=start,
+                    end=position,
+                    term=self._terms[node],
+                    values=tuple(self._values[node]),
+                )
+            )
+        return results
+
+    def _build(self) -> None:
+        # rebuild the links for every node, as a new term can change any of them
+        goto = self._goto
+        fail = self._fail
+        terms = self._terms
+        output = self._output
+
+        queue = collections.deque()
+        for child in goto[0].values():
+            fail[child] = 0
+            output[child] = (child,) if terms[child] is not None else ()
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                link = fail[node]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                fail[child] = goto[link].get(char, 0)
+                own = (child,) if terms[child] is not None else ()
+                output[child] = own + output[fail[child]]
+                queue.append(child)
+
+        self._stale = False
+
+
+@functools.lru_cache(maxsize=4096)
+def slug(value: str) -> str:
+    """Convert a text to a slug.
+
+    The same as Django's slugify.
+    The most recent slugs are remembered,
+    see ``slug.cache_info()`` for the hits and misses.
+
+    Args:
+        value: The text to convert.
+
+    Returns:
+        The slug.
+    """
+    return slugify(value)
@@ -4,7 +4,9 @@ import pathlib
 import typing
 import importlib_metadata
 import importlib_resources
+from defusedxml import EntitiesForbidden
 from defusedxml.ElementTree import fromstring
+from lxml import etree
 
 
 def get_name_dash() -> str:
@@ -102,14 +104,87 @@ class GatherVisionException(Exception):
     pass
 
 
-def xml_to_data(value):
+def xml_to_data(value, fast: bool = False) -> dict:
+    """Convert xml to nested dicts.
+
+    Each element becomes a dict with the keys
+    'attrs', 'tag', 'tail', 'text', and 'children'.
+    The conversion does not use recursion,
+    so deeply nested documents do not reach the Python recursion limit.
+
+    Args:
+        value: An xml string or bytes, or a parsed element.
+        fast: Whether to parse the xml using lxml instead of defusedxml.
+            The lxml parser does not resolve entities or access the network,
+            and does not allow nesting deeper than 256 elements.
+
+    Returns:
+        The root element as a dict.
+    """
+    if isinstance(value, (str, bytes)) and fast:
+        return _xml_lxml_to_data(_xml_lxml_fromstring(value))
+    if isinstance(value, (str, bytes)):
+        value = fromstring(value)
+    if isinstance(value, etree._Element):
+        return _xml_lxml_to_data(value)
+
+    result = _xml_item(value, value.attrib)
+    pending = [(value, result)]
+    while pending:
+        element, item = pending.pop()
+        children = item["children"]
+        for child in element:
+            # the attrs are the element's own dict, so there is no copy
+            child_item = _xml_item(child, child.attrib)
+            children.append(child_item)
+            pending.append((child, child_item))
+    return result
+
+
+def _xml_item(element, attrs: dict) -> dict:
+    return {
+        "attrs": attrs,
+        "tag": element.tag,
+        "tail": element.tail,
+        "text": element.text,
+        "children": [],
+    }
+
+
+def _xml_lxml_to_data(root) -> dict:
+    # lxml provides the elements in document order and can find the parent,
+    # which avoids keeping a stack of pending elements
+    result = _xml_item(root, dict(root.items()))
+    children = {root: result["children"]}
+    elements = root.iter(etree.Element)
+    next(elements)
+    for element in elements:
+        item = _xml_item(element, dict(element.items()))
+        children[element.getparent()].append(item)
+        children[element] = item["children"]
+    return result
+
+
+def _xml_lxml_fromstring(value: str | bytes):
+    parser = etree.XMLParser(
+        encoding="utf-8" if isinstance(value, str) else None,
+        resolve_entities=False,
+        no_network=True,
+        load_dtd=False,
+        dtd_validation=False,
+        huge_tree=False,
+        remove_comments=True,
+        remove_pis=True,
+    )
     if isinstance(value, str):
-        return xml_to_data(fromstring(value))
-    else:
-        return {
-            "attrs": value.attrib,
-            "tag": value.tag,
-            "tail": value.tail,
-            "text": value.text,
-            "children": [xml_to_data(i) for i in value],
-        }
+        value = value.encode("utf-8")
+    root = etree.fromstring(value, parser=parser)
+
+    # match defusedxml, which does not allow entity declarations
+    dtd = root.getroottree().docinfo.internalDTD
+    for entity in dtd.iterentities() if dtd is not None else []:
+        raise EntitiesForbidden(
+            entity.name, entity.content, None, entity.system_url, None, None
+        )
+
+    return root
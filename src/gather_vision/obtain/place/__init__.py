@@ -1,83 +1,64 @@
-from gather_vision.obtain.place.au.qld.bcc.government import (
-    BrisbaneCityCouncilGovernmentPersonItem,
-    BrisbaneCityCouncilGovernmentSittingDateItem,
-    BrisbaneCityCouncilGovernmentMeetingPersonAttendanceItem,
-    BrisbaneCityCouncilGovernmentMeetingVoteItem,
-    BrisbaneCityCouncilGovernmentWebData,
-)
-from gather_vision.obtain.place.au.qld.bcc.petition import (
-    BrisbaneCityCouncilPetitionsWebData,
-    BrisbaneCityCouncilPetitionItem,
-)
-from gather_vision.obtain.place.au.qld.bcc.transport import (
-    BrisbaneTranslinkNoticesWebData,
-    BrisbaneTranslinkNoticesItem,
-)
-from gather_vision.obtain.place.au.qld.bcc.water import (
-    BrisbaneCityCouncilWaterQualityItem,
-    BrisbaneCityCouncilWaterLevelItem,
-    BrisbaneCityCouncilWaterWebData,
-)
-from gather_vision.obtain.place.au.qld.air import (
-    QueenslandAirItem,
-    QueenslandAirWebData,
-)
-from gather_vision.obtain.place.au.qld.election import (
-    QueenslandGovernmentElectionsWebData,
-)
-from gather_vision.obtain.place.au.qld.electricity import (
-    QueenslandEnergexElectricityItem,
-    QueenslandEnergexElectricityWebData,
-    QueenslandErgonEnergyElectricityItem,
-    QueenslandErgonEnergyElectricityWebData,
-)
-from gather_vision.obtain.place.au.qld.petition import (
-    QueenslandGovernmentPetitionItem,
-    QueenslandGovernmentPetitionsWebData,
-)
-from gather_vision.obtain.place.au.qld.transport import (
-    QueenslandFuelItem,
-    QueenslandFuelWebData,
-    QueenslandRailEvents,
-)
-from gather_vision.obtain.place.au.election import (
-    AustraliaElectionItem,
-    AustraliaElectionWebData,
-)
-from gather_vision.obtain.place.au.petition import (
-    AustralianGovernmentPetitionItem,
-    AustralianGovernmentPetitionsWebData,
+from gather_vision.obtain.core.registry import WebDataRegistry
+
+_au = "gather_vision.obtain.place.au"
+_au_qld = f"{_au}.qld"
+_au_qld_bcc = f"{_au_qld}.bcc"
+
+# The place modules are imported only when a web data source is selected.
+web_data_registry = WebDataRegistry(
+    sources={
+        "au-qld-bcc-government": (
+            f"{_au_qld_bcc}.government:BrisbaneCityCouncilGovernmentWebData"
+        ),
+        "au-qld-bcc-petitions": (
+            f"{_au_qld_bcc}.petition:BrisbaneCityCouncilPetitionsWebData"
+        ),
+        "au-qld-bcc-translink-notices": (
+            f"{_au_qld_bcc}.transport:BrisbaneTranslinkNoticesWebData"
+        ),
+        "au-qld-bcc-water": f"{_au_qld_bcc}.water:BrisbaneCityCouncilWaterWebData",
+        "au-qld-air": f"{_au_qld}.air:QueenslandAirWebData",
+        "au-qld-energex-electricity": (
+            f"{_au_qld}.electricity:QueenslandEnergexElectricityWebData"
+        ),
+        "au-qld-ergon-electricity": (
+            f"{_au_qld}.electricity:QueenslandErgonEnergyElectricityWebData"
+        ),
+        "au-qld-elections": (
+            f"{_au_qld}.election:QueenslandGovernmentElectionsWebData"
+        ),
+        "au-qld-petitions": (
+            f"{_au_qld}.petition:QueenslandGovernmentPetitionsWebData"
+        ),
+        "au-qld-fuel": f"{_au_qld}.transport:QueenslandFuelWebData",
+        "au-election": f"{_au}.election:AustraliaElectionWebData",
+        "au-petitions": f"{_au}.petition:AustralianGovernmentPetitionsWebData",
+    },
+    items=[
+        f"{_au_qld_bcc}.government:BrisbaneCityCouncilGovernmentPersonItem",
+        f"{_au_qld_bcc}.government:BrisbaneCityCouncilGovernmentSittingDateItem",
+        f"{_au_qld_bcc}.government:"
+        f"BrisbaneCityCouncilGovernmentMeetingPersonAttendanceItem",
+        f"{_au_qld_bcc}.government:BrisbaneCityCouncilGovernmentMeetingVoteItem",
+        f"{_au_qld_bcc}.petition:BrisbaneCityCouncilPetitionItem",
+        f"{_au_qld_bcc}.water:BrisbaneCityCouncilWaterQualityItem",
+        f"{_au_qld_bcc}.water:BrisbaneCityCouncilWaterLevelItem",
+        f"{_au_qld_bcc}.transport:BrisbaneTranslinkNoticesItem",
+        f"{_au_qld}.air:QueenslandAirItem",
+        f"{_au_qld}.electricity:QueenslandEnergexElectricityItem",
+        f"{_au_qld}.electricity:QueenslandErgonEnergyElectricityItem",
+        f"{_au_qld}.petition:QueenslandGovernmentPetitionItem",
+        f"{_au_qld}.transport:QueenslandFuelItem",
+        f"{_au}.election:AustraliaElectionItem",
+        f"{_au}.petition:AustralianGovernmentPetitionItem",
+    ],
 )
 
-# all
-available_web_data = [
-    BrisbaneCityCouncilGovernmentWebData,
-    BrisbaneCityCouncilPetitionsWebData,
-    BrisbaneTranslinkNoticesWebData,
-    BrisbaneCityCouncilWaterWebData,
-    QueenslandAirWebData,
-    QueenslandEnergexElectricityWebData,
-    QueenslandErgonEnergyElectricityWebData,
-    QueenslandGovernmentElectionsWebData,
-    QueenslandGovernmentPetitionsWebData,
-    QueenslandFuelWebData,
-    AustraliaElectionWebData,
-    AustralianGovernmentPetitionsWebData,
-]
-available_web_items = [
-    BrisbaneCityCouncilGovernmentPersonItem,
-    BrisbaneCityCouncilGovernmentSittingDateItem,
-    BrisbaneCityCouncilGovernmentMeetingPersonAttendanceItem,
-    BrisbaneCityCouncilGovernmentMeetingVoteItem,
-    BrisbaneCityCouncilPetitionItem,
-    BrisbaneCityCouncilWaterQualityItem,
-    BrisbaneCityCouncilWaterLevelItem,
-    BrisbaneTranslinkNoticesItem,
-    QueenslandAirItem,
-    QueenslandEnergexElectricityItem,
-    QueenslandErgonEnergyElectricityItem,
-    QueenslandGovernmentPetitionItem,
-    QueenslandFuelItem,
-    AustraliaElectionItem,
-    AustralianGovernmentPetitionItem,
-]
+
+def __getattr__(name: str):
+    # all
+    if name == "available_web_data":
+        return web_data_registry.load_selected()
+    if name == "available_web_items":
+        return web_data_registry.load_items()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
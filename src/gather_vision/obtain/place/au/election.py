@@ -1,15 +1,31 @@
 import dataclasses
+import operator
+import re
 import typing
 
 from gather_vision.obtain.core import data
+from gather_vision.obtain.core.stream import CsvHeader
 
 
 @dataclasses.dataclass(frozen=True)
 class AustraliaElectionItem(data.GatherDataItem):
-    pass
+    election_id: str
+    state: str
+    division_id: str
+    division_name: str
+    ordinary_votes: int
+    absent_votes: int
+    provisional_votes: int
+    pre_poll_votes: int
+    postal_votes: int
+    total_votes: int
+    total_percentage: float
+
+    async def save_models(self) -> None:
+        pass
 
 
-class AustraliaElectionWebData(data.WebData):
+class AustraliaElectionWebData(data.CsvWebData):
     # https://results.aec.gov.au/
     # name: div#fedArchive li a[text]
     # url: div#fedArchive li a[href]
@@ -18,6 +34,22 @@ class AustraliaElectionWebData(data.WebData):
     # could also gather links from the page using the link titles or file paths
     # https://results.aec.gov.au/13745/Website/Downloads/HouseVotesCountedByDivisionDownload-13745.csv
 
+    # the downloads start with a title line before the header
+    csv_header_required = (
+        "StateAb",
+        "DivisionID",
+        "DivisionNm",
+        "OrdinaryVotes",
+        "AbsentVotes",
+        "ProvisionalVotes",
+        "PrePollVotes",
+        "PostalVotes",
+        "TotalVotes",
+        "TotalPercentage",
+    )
+
+    _re_election_id = re.compile(r"-(?P<election_id>\d+)\.csv$", re.IGNORECASE)
+
     @property
     def name(self) -> str:
         return "au-election"
@@ -30,7 +62,45 @@ class AustraliaElectionWebData(data.WebData):
     ) -> typing.Generator[typing.Union[str, data.IsDataclass], typing.Any, typing.Any]:
         pass
 
-    def web_resources(
-        self, web_data: data.WebDataAvailable
+    def csv_resources(
+        self,
+        web_data: data.WebDataAvailable,
+        header: CsvHeader,
+        rows: list[list[str]],
     ) -> typing.Iterable[typing.Union[data.GatherDataRequest, data.GatherDataItem]]:
-        yield None
+        match = self._re_election_id.search(web_data.response_url)
+        election_id = match.group("election_id") if match else ""
+
+        # find the column positions once for each chunk
+        columns = operator.itemgetter(
+            *[header.index[i] for i in self.csv_header_required]
+        )
+
+        for row in rows:
+            (
+                state,
+                division_id,
+                division_name,
+                ordinary,
+                absent,
+                provisional,
+                pre_poll,
+                postal,
+                total,
+                percentage,
+            ) = columns(row)
+            # TODO: create the election models
+            yield AustraliaElectionItem(
+                gather_name=self.name,
+                election_id=election_id,
+                state=state.strip(),
+                division_id=division_id.strip(),
+                division_name=division_name.strip(),
+                ordinary_votes=int(ordinary),
+                absent_votes=int(absent),
+                provisional_votes=int(provisional),
+                pre_poll_votes=int(pre_poll),
+                postal_votes=int(postal),
+                total_votes=int(total),
+                total_percentage=float(percentage),
+            )
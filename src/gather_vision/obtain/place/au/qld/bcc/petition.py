@@ -2,7 +2,7 @@ import dataclasses
 from datetime import datetime, timezone
 import typing
 
-from gather_vision.obtain.core import data
+from gather_vision.obtain.core import data, extract
 
 
 @dataclasses.dataclass(frozen=True)
@@ -33,6 +33,31 @@ class BrisbaneCityCouncilPetitionsWebData(data.WebData):
     sign_url = f"{list_url}/petition/sign/pid"
     closed_fmt = "%a, %d %b %Y"
 
+    # the petition pages send no validators
+    unchanged_response = "requests"
+
+    # the rows of the petition list tables
+    petitions_table = extract.ExtractSpec(
+        rows=(
+            "//table[contains(concat(' ', normalize-space(@class), ' '), "
+            "' petitions ')]//tr[count(td) >= 3]"
+        ),
+        fields={
+            "title": extract.ExtractField("td[1]/descendant-or-self::text()"),
+            "href": extract.ExtractField("(td[1]/descendant-or-self::a)[1]/@href"),
+            "principal": extract.ExtractField("td[2]/descendant-or-self::text()"),
+            "closed": extract.ExtractField("td[3]/descendant-or-self::text()"),
+            "cells": extract.ExtractSpec(
+                rows="td",
+                fields={
+                    "text": extract.ExtractField(
+                        "descendant-or-self::text()", many=True
+                    )
+                },
+            ),
+        },
+    )
+
     def initial_urls(self) -> typing.Iterable[str]:
         # TODO: add archived petitions?
         return [self.list_url]
@@ -45,6 +70,12 @@ class BrisbaneCityCouncilPetitionsWebData(data.WebData):
         if url in [self.list_url, self.archive_url]:
             # the initial urls provide basic lists of petitions their item urls
             for raw in self._parse_petitions_table(web_data):
+                # the detail page only needs to be requested
+                # when the listing row has changed since the previous run
+                if self.state_unchanged(
+                    raw.get("listing_key"), raw.get("listing_fingerprint")
+                ):
+                    continue
                 yield data.GatherDataRequest(
                     url=self._make_abs_url(self.item_url, raw.get("item_id")),
                     data=raw,
@@ -66,6 +97,11 @@ class BrisbaneCityCouncilPetitionsWebData(data.WebData):
                 retrieved_at=raw.get("retrieved_at"),
                 closed_at=raw.get("closed_at"),
             )
+            # the listing key is only available when the request came from a listing
+            meta = web_data.meta or {}
+            listing_key = meta.get("listing_key")
+            if listing_key:
+                self.state.set(listing_key, meta.get("listing_fingerprint"))
 
         elif url.startswith(self.signed_url):
             # TODO: consider gathering the suburbs from the signature list?
@@ -80,22 +116,20 @@ class BrisbaneCityCouncilPetitionsWebData(data.WebData):
             raise ValueError(f"Unexpected url '{url}'.")
 
     def _parse_petitions_table(self, web_data: data.WebDataAvailable):
-        for table_petition in web_data.selector.css("table.petitions"):
-            for table_row in table_petition.css("tr"):
-                table_cells = table_row.css("td")
-                if len(table_cells) < 3:
-                    continue
-                title = table_cells[0].css("::text").get()
-                item_id = table_cells[0].css("a").attrib.get("href").split("/")[-1]
-                principal = table_cells[1].css("::text").get()
-                closed_raw = table_cells[2].css("::text").get()
-
-                yield {
-                    "title": title,
-                    "item_id": item_id,
-                    "principal": principal,
-                    "closed_at": datetime.strptime(closed_raw, self.closed_fmt),
-                }
+        for row in self.petitions_table.extract(web_data.selector):
+            item_id = row["href"].split("/")[-1]
+            listing = [
+                self.str_collapse(" ".join(cell["text"])) for cell in row["cells"]
+            ]
+
+            yield {
+                "title": row["title"],
+                "item_id": item_id,
+                "principal": row["principal"],
+                "closed_at": datetime.strptime(row["closed"], self.closed_fmt),
+                "listing_key": f"listing:{item_id}",
+                "listing_fingerprint": "|".join(listing),
+            }
 
     def _parse_petition(self, web_data: data.WebDataAvailable):
         meta = web_data.meta
@@ -4,9 +4,12 @@ import re
 import typing
 from datetime import datetime
 
+import scrapy
+from scrapy import http
+
 from gather_vision.apps.explore import models as explore_models
 from gather_vision.apps.transport import models as transport_models
-from gather_vision.obtain.core import data
+from gather_vision.obtain.core import data, stream, text
 from gather_vision.obtain.place.au import area_au
 from gather_vision.obtain.place.au.qld import area_qld
 from gather_vision.obtain.place.au.qld.bcc import (
@@ -31,6 +34,8 @@ class BrisbaneTranslinkNoticesItem(data.GatherDataItem):
     category: str
     severity: str
     locations: list[str]
+    """The titles of the areas found in the notice,
+    see `gather_vision.apps.explore.models.AreaMatcher`."""
 
     groups: list[tuple[str, str]]
     """A list of groups.
@@ -96,6 +101,7 @@ class BrisbaneTranslinkNoticesItem(data.GatherDataItem):
             category=self.category,
             severity=self.severity,
             locations=self.locations,
+            location_areas=await explore_models.area_matcher.aresolve(self.locations),
         )
 
 
@@ -121,88 +127,93 @@ class BrisbaneTranslinkNoticesWebData(data.WebData):
     # areas - locations affected by the event
     # origin - where the data was sourced from
 
-    _descr_patterns = [
-        re.compile(
-            r"^\((?P<type>[^)]+)\)\s*(?P<description>.+)\.\s*"
-            r"Starts\s*affecting:\s*(?P<start_date>.+)\s*"
-            r"Finishes affecting:\s*(?P<stop_date>.+)$"
-        ),
-        re.compile(
-            r"^Start\s*date:\s*(?P<start_date>[^a-z]+),\s*"
-            r"End\s*date:\s*(?P<stop_date>[^a-z]+),\s*"
-            r"Services:\s*(?P<services>.+)$"
-        ),
-        re.compile(
-            r"^\((?P<type>[^)]+)\)\s*(?P<description>.+)\.\s*"
-            r"Starts\s*affecting:\s*(?P<start_date>.+)$"
-        ),
-        re.compile(
-            r"^Start\s*date:\s*(?P<start_date>[^a-z]+),\s*"
-            r"Services:\s*(?P<services>.+)$"
-        ),
-        re.compile(
-            r"^Affects\s*services:\s*(?P<start_date>[^a-z]+)\s*"
-            r"Services:\s*(?P<services>.+)$"
-        ),
-    ]
-
-    _pattern_group_name = "found"
-
-    @staticmethod
-    def _build_re(group_name: str, values: typing.Iterable[str]) -> re.Pattern:
-        definition = "|".join(values)
-        return re.compile(rf"\b(?P<{group_name}>{definition})\b", re.IGNORECASE)
-
-    _event_durations = _build_re(
-        _pattern_group_name,
-        [
-            "temporary",
-            "extended",
-            "permanent",
-            "weekend",
-            "weekday",
-            "evening",
-            "late night",
-        ],
-    )
-    _event_affected = _build_re(
-        _pattern_group_name,
+    _descr_patterns = text.PatternDispatch(
         [
-            r"bus\s*stops?",
-            "stops?",
-            r"bus\s*stations?",
-            "stations?",
-            r"park\s*('?n'?|and)\s*rides?",
-            "tracks?",
-            "entrances?",
-            r"bus\s*services?",
-            "services?",
-            "timetables?",
-            "platforms?",
-            r"bus\s*routes?",
-            "routes?",
-            r"bus\s*lines?",
-            "lines?",
-        ],
+            re.compile(
+                r"^\((?P<type>[^)]+)\)\s*(?P<description>.+)\.\s*"
+                r"Starts\s*affecting:\s*(?P<start_date>.+)\s*"
+                r"Finishes affecting:\s*(?P<stop_date>.+)$"
+            ),
+            re.compile(
+                r"^Start\s*date:\s*(?P<start_date>[^a-z]+),\s*"
+                r"End\s*date:\s*(?P<stop_date>[^a-z]+),\s*"
+                r"Services:\s*(?P<services>.+)$"
+            ),
+            re.compile(
+                r"^\((?P<type>[^)]+)\)\s*(?P<description>.+)\.\s*"
+                r"Starts\s*affecting:\s*(?P<start_date>.+)$"
+            ),
+            re.compile(
+                r"^Start\s*date:\s*(?P<start_date>[^a-z]+),\s*"
+                r"Services:\s*(?P<services>.+)$"
+            ),
+            re.compile(
+                r"^Affects\s*services:\s*(?P<start_date>[^a-z]+)\s*"
+                r"Services:\s*(?P<services>.+)$"
+            ),
+        ]
     )
-    _event_changes = _build_re(
-        _pattern_group_name,
-        [
-            "closures?",
-            "changes?",
-            "disruptions?",
-            "diversions?",
-            "relocations?",
-            "reduced",
-            "missed",
-            "re-?opened",
-            "more",
-            "delays?",
-            "additional",
-            r"free\s*travel",
-        ],
+
+    _title_keywords = text.KeywordExtractor(
+        {
+            "event_durations": [
+                "temporary",
+                "extended",
+                "permanent",
+                "weekend",
+                "weekday",
+                "evening",
+                "late night",
+            ],
+            "event_affected": [
+                r"bus\s*stops?",
+                "stops?",
+                r"bus\s*stations?",
+                "stations?",
+                r"park\s*('?n'?|and)\s*rides?",
+                "tracks?",
+                "entrances?",
+                r"bus\s*services?",
+                "services?",
+                "timetables?",
+                "platforms?",
+                r"bus\s*routes?",
+                "routes?",
+                r"bus\s*lines?",
+                "lines?",
+            ],
+            "event_changes": [
+                "closures?",
+                "changes?",
+                "disruptions?",
+                "diversions?",
+                "relocations?",
+                "reduced",
+                "missed",
+                "re-?opened",
+                "more",
+                "delays?",
+                "additional",
+                r"free\s*travel",
+            ],
+        }
     )
 
+    _areas_loaded = False
+
+    async def parse(
+        self, response: http.Response, **kwargs
+    ) -> typing.AsyncIterator[scrapy.Request | data.GatherDataItem]:
+        # load the areas before the first notices are parsed,
+        # in a crawl and when the stored responses are parsed again
+        if not self._areas_loaded:
+            count = await explore_models.area_matcher.arefresh()
+            self._stats_inc("areas/loaded", count)
+            self._areas_loaded = True
+
+        async for i in super().parse(response, **kwargs):
+            yield i
+
     @property
     def name(self):
         return "au-qld-bcc-translink-notices"
@@ -213,48 +224,23 @@ class BrisbaneTranslinkNoticesWebData(data.WebData):
     def web_resources(
         self, web_data: data.WebDataAvailable
     ) -> typing.Iterable[data.GatherDataRequest | data.GatherDataItem | None]:
-        items: dict = web_data.body_data
-        for rss_item in items.get("children", {}):
-            if rss_item.get("tag") != "channel":
-                continue
-
-            doc_info = {}
-            for info in rss_item.get("children", {}):
-                tag = info.get("tag")
-                text = info.get("text", "")
-                match tag:
-                    case "title":
-                        doc_info["doc_title"] = text
-                    case "description":
-                        doc_info["doc_descr"] = text
-                    case "pubDate":
-                        doc_info["doc_pub_date"] = text
-                    case "lastBuildDate":
-                        doc_info["doc_build_date"] = text
-                    case "item":
-                        item_data = self._get_item(
-                            {**doc_info}, info.get("children", [])
-                        )
-                        yield self._build(item_data)
-                    case _:
-                        pass
-
-    def _get_item(self, info: dict, item: list[dict]) -> dict:
-        for entry in item:
-            match entry.get("tag"):
-                case "title":
-                    info["title"] = entry.get("text").strip("⚠ⓘ☒").strip()
-                case "description":
-                    info["descr"] = entry.get("text").strip()
-                case "link":
-                    info["link"] = entry.get("text").strip()
-                case "guid":
-                    info["guid"] = entry.get("text").split("/")[-1].strip()
-                case "category":
-                    if "labels" not in info:
-                        info["labels"] = set()
-                    info["labels"].add(entry.get("text").strip())
-        return info
+        with web_data.open_body() as body:
+            for feed_item in stream.iter_feed_items(body):
+                item_data = self._get_item(feed_item)
+                yield self._build(item_data)
+
+    def _get_item(self, feed_item: stream.FeedItem) -> dict:
+        return {
+            "doc_title": feed_item.get("channel_title"),
+            "doc_descr": feed_item.get("channel_description"),
+            "doc_pub_date": feed_item.get("channel_pubDate"),
+            "doc_build_date": feed_item.get("channel_lastBuildDate"),
+            "title": feed_item.get("title", "").strip("⚠ⓘ☒").strip(),
+            "descr": feed_item.get("description", "").strip(),
+            "link": feed_item.get("link", "").strip(),
+            "guid": feed_item.get("guid", "").split("/")[-1].strip(),
+            "labels": {i.strip() for i in stream.feed_values(feed_item, "category")},
+        }
 
     def _build(self, info: dict) -> BrisbaneTranslinkNoticesItem | None:
         doc_title = info.get("doc_title")
@@ -281,8 +267,10 @@ class BrisbaneTranslinkNoticesWebData(data.WebData):
         date_now = BrisbaneTranslinkNoticesItem.datetime_now
 
         description = ""
-        start_date = date_parser(info_descr.get("start_date"), tz_bne)
-        stop_date = date_parser(info_descr.get("stop_date"), tz_bne)
+        start_date = date_parser(
+            info_descr.get("start_date"), tz_bne, field="start_date"
+        )
+        stop_date = date_parser(info_descr.get("stop_date"), tz_bne, field="stop_date")
         category = transport_models.Event.guess_category(
             "; ".join([*info_title_affected, *info_services])
         )
@@ -290,7 +278,7 @@ class BrisbaneTranslinkNoticesWebData(data.WebData):
             "; ".join([*labels, *info_title_changes])
         )
         groups = list(transport_models.Group.guess_categories(info_services))
-        locations = []
+        locations = explore_models.area_matcher.find(f"{title}\n{descr}")
 
         # build the result item
         areas = [area_au, area_qld, area_bcc, area_brisbane]
@@ -298,7 +286,7 @@ class BrisbaneTranslinkNoticesWebData(data.WebData):
             gather_name=self.name,
             title=title,
             retrieved_date=date_now(tz_bne),
-            issued_date=date_parser(doc_pub_date, tz_bne),
+            issued_date=date_parser(doc_pub_date, tz_bne, field="issued_date"),
             description=description,
             url=link,
             start_date=start_date,
@@ -312,26 +300,18 @@ class BrisbaneTranslinkNoticesWebData(data.WebData):
         )
 
     def _extract_descr_info(self, value: str) -> dict:
-        for descr_pattern in self._descr_patterns:
-            descr_match = descr_pattern.match(value)
-            if descr_match:
-                return descr_match.groupdict()
+        descr_match = self._descr_patterns.match(value)
+        if descr_match:
+            self._stats_inc(f"descr_pattern/{descr_match.index}")
+            return descr_match.groups
 
+        self._stats_inc("descr_pattern/none")
         logger.warning("No match for description '%s'.", value)
         return {}
 
     def _extract_title_info(self, value: str) -> dict:
-        current_title = str(value)
-        group_name = self._pattern_group_name
-        current_title, event_durations = self._extract_event_info(
-            current_title, group_name, self._event_durations
-        )
-        current_title, event_affected = self._extract_event_info(
-            current_title, group_name, self._event_affected
-        )
-        current_title, event_changes = self._extract_event_info(
-            current_title, group_name, self._event_changes
-        )
+        matches = self._title_keywords.extract(str(value))
+        current_title = matches.residual
 
         # known replacement to make in new title
         replacements = {" - ": " ", " for ": " ", " in ": " "}
@@ -340,9 +320,7 @@ class BrisbaneTranslinkNoticesWebData(data.WebData):
         current_title = self.str_collapse(current_title)
 
         return {
-            "event_durations": event_durations,
-            "event_affected": event_affected,
-            "event_changes": event_changes,
+            **matches.hits,
             "title_new": current_title,
         }
 
@@ -353,20 +331,3 @@ class BrisbaneTranslinkNoticesWebData(data.WebData):
         if services_more in services:
             services[services.index(services_more)] = "ELLIPSIS"
         return sorted(services)
-
-    def _extract_event_info(
-        self, value: str, name: str, pattern: re.Pattern
-    ) -> tuple[str, list[str]]:
-        out = str(value)
-        found = set()
-        while True:
-            match = pattern.search(out)
-            if not match:
-                return out, sorted(found)
-
-            group_value = match.group(name)
-            if group_value:
-                found.add(group_value.strip().lower())
-                index_start = match.start(name)
-                index_end = match.end(name)
-                out = out[0:index_start].strip() + " " + out[index_end:].strip()
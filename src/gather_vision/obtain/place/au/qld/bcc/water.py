@@ -1,12 +1,10 @@
 import dataclasses
 from datetime import datetime, timezone
-import io
 import typing
 from zoneinfo import ZoneInfo
 
 from gather_vision.apps.water import models as water_models
-from gather_vision.obtain.core import data
-from openpyxl import load_workbook
+from gather_vision.obtain.core import data, stream
 
 
 @dataclasses.dataclass(frozen=True)
@@ -49,6 +47,92 @@ class BrisbaneCityCouncilWaterLevelItem(data.GatherDataItem):
     pass
 
 
+@dataclasses.dataclass(frozen=True)
+class WaterQualitySite:
+    site_number: typing.Any = None
+    site_name: str | None = None
+    location_longitude: float | None = None
+    location_latitude: float | None = None
+    location_description: str | None = None
+
+
+@dataclasses.dataclass(frozen=True)
+class WaterQualityMeasure:
+    site: WaterQualitySite
+    measure_date: datetime
+    measure_value: typing.Union[str, int]
+
+
+_water_site_headers = {
+    "Site no.": "site_number",
+    "Site name": "site_name",
+    "Long": "location_longitude",
+    "Lat": "location_latitude",
+    "Location description": "location_description",
+}
+
+
+def _water_row_kind(cells: stream.SheetCells) -> str | None:
+    if len(cells) < 6:
+        if not any(
+            isinstance(value, datetime) or value in _water_site_headers
+            for _, value in cells
+        ):
+            return None
+
+    first = cells[0][1]
+    if isinstance(first, int) or str(first)[0].isnumeric():
+        return "body"
+    return "header"
+
+
+def iter_water_quality(
+    source: typing.BinaryIO,
+) -> typing.Iterator[WaterQualityMeasure]:
+    """Read the measurements from the water quality workbook, one row at a time.
+
+    Args:
+        source: The workbook as a binary file.
+
+    Returns:
+        An iterator of measurements.
+    """
+    for row in stream.iter_sheet_rows(source, _water_row_kind):
+        site = {}
+        measures = []
+        for header, value in row.cells:
+            site_field = _water_site_headers.get(header)
+            if site_field:
+                site[site_field] = value
+            elif isinstance(header, datetime):
+                measures.append((header, value))
+            else:
+                raise ValueError(f"Unknown header '{header}' with value '{value}'.")
+
+        water_site = WaterQualitySite(**site)
+        for measure_date, measure_value in measures:
+            yield WaterQualityMeasure(water_site, measure_date, measure_value)
+
+
+def read_water_quality(body_raw: bytes | None) -> list[WaterQualityMeasure]:
+    """Read the measurements from the water quality workbook.
+
+    This is run in the process pool.
+    The rows are still read one at a time,
+    but the result from the pool is sent back as a whole,
+    so all the measurements are kept in a list.
+    The list is much smaller than the workbook cells.
+
+    Args:
+        body_raw: The workbook bytes.
+
+    Returns:
+        The measurements.
+    """
+    with stream.open_body(body_raw) as f:
+        return list(iter_water_quality(f))
+
+
 class BrisbaneCityCouncilWaterWebData(data.WebData):
     _tz = ZoneInfo("Australia/Brisbane")
 
@@ -57,6 +141,8 @@ class BrisbaneCityCouncilWaterWebData(data.WebData):
 
     # water levels in dams
 
+    artifact_suffixes = (".xlsx", ".xls")
+
     @property
     def name(self):
         return "au-qld-bcc-water"
@@ -72,9 +158,12 @@ class BrisbaneCityCouncilWaterWebData(data.WebData):
             yield self._get_excel_file(web_data)
 
         elif ".xls" in url:
-            raw = self._get_rows(web_data)
-            for measure in self._get_measures(raw):
-                yield measure
+            # reading the workbook is slow, so it is run in the process pool
+            yield data.GatherDataOffload(
+                func=read_water_quality,
+                args=(web_data.body_raw,),
+                callback=self._get_measures,
+            )
 
     def _get_excel_file(
         self, web_data: data.WebDataAvailable
@@ -96,85 +185,13 @@ class BrisbaneCityCouncilWaterWebData(data.WebData):
             data={"link_text": link_text},
         )
 
-    def _get_rows(self, web_data: data.WebDataAvailable) -> dict:
-        filename = io.BytesIO(web_data.body_raw)
-
-        known_headers = ["Site no.", "Site name", "Long", "Lat", "Location description"]
-
-        wb = None
-        try:
-            wb = load_workbook(filename=filename, data_only=True, read_only=True)
-
-            result = {}
-            for sheet_name in wb.sheetnames:
-                ws = wb[sheet_name]
-
-                headers = []
-                body = []
-
-                for row in ws.rows:
-                    cells = [cell for cell in row if cell.value]
-                    cell_count = len(cells)
-
-                    if cell_count < 6:
-                        any_dates = any(
-                            [isinstance(cell.value, datetime) for cell in cells]
-                        )
-                        known_header = any(
-                            [cell.value in known_headers for cell in cells]
-                        )
-                        if not any_dates and not known_header:
-                            continue
-
-                    cell_first = cells[0]
-                    if (
-                        isinstance(cell_first.value, int)
-                        or str(cell_first.value)[0].isnumeric()
-                    ):
-                        body.append([(cell.column, cell.value) for cell in cells])
-                    else:
-                        headers.append([(cell.column, cell.value) for cell in cells])
-
-                result[sheet_name] = {"headers": headers, "body": body}
-
-        finally:
-            # Close the workbook after reading
-            if wb:
-                wb.close()
-
-        return result
-
     def _get_measures(
-        self, raw: dict[str, dict[str, list]]
+        self, measures: typing.Iterable[WaterQualityMeasure]
     ) -> typing.Iterable[BrisbaneCityCouncilWaterQualityItem]:
-        for name, info in raw.items():
-            headers = {}
-            for item in info["headers"]:
-                for col, header in item:
-                    headers[col] = header
-
-            site = {}
-            for body in info["body"]:
-                for col, value in body:
-                    header = headers[col]
-                    if header == "Site no.":
-                        site["site_number"] = value
-                    elif header == "Site name":
-                        site["site_name"] = value
-                    elif header == "Long":
-                        site["location_longitude"] = value
-                    elif header == "Lat":
-                        site["location_latitude"] = value
-                    elif header == "Location description":
-                        site["location_description"] = value
-                    elif isinstance(header, datetime):
-                        measure_date = header.replace(tzinfo=self._tz)
-                        yield None
-                        # TODO: item build
-                        # BrisbaneCityCouncilWaterQualityItem.build(
-                        #     site, measure_date, value
-                        # )
-                    else:
-                        raise ValueError(
-                            f"Unknown header '{header}' with value '{value}'."
-                        )
+        for measure in measures:
+            measure_date = measure.measure_date.replace(tzinfo=self._tz)
+            yield None
+            # TODO: item build
+            # BrisbaneCityCouncilWaterQualityItem.build(
+            #     dataclasses.asdict(measure.site), measure_date, measure.measure_value
+            # )
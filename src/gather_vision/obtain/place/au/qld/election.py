@@ -1,15 +1,13 @@
-import io
 import logging
 import typing
 from zipfile import ZipFile
 
-from gather_vision.obtain.core import data
+from gather_vision.obtain.core import data, extract, stream
 from gather_vision.obtain.core.data import (
     WebDataAvailable,
     GatherDataRequest,
     GatherDataItem,
 )
-from gather_vision.obtain.core.utils import xml_to_data
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +30,39 @@ class QueenslandGovernmentElectionsWebData(data.WebData):
     base_elections_resultsdata_url = "https://resultsdata.elections.qld.gov.au/"
     base_elections_results_url = "https://results.elections.qld.gov.au/"
 
+    # the index pages and elections.json send no validators
+    unchanged_response = "requests"
+
+    # the results archives are kept, so they can be parsed again later
+    artifact_suffixes = (".zip",)
+
+    # the result xml elements that are read as separate records
+    zip_xml_record_kinds = {
+        "district": "electorate",
+        "electorate": "electorate",
+        "booth": "booth",
+        "pollingPlace": "booth",
+    }
+
+    # the elections are read one at a time
+    json_items_paths = {list_elections_resultsdata_url: ("elections",)}
+
+    # the section and entry rows of the results index tables
+    ecq_result_index_rows = extract.ExtractSpec(
+        rows='//tr[td[@colspan="4"]] | //tr[td[@colspan="4"]]/following-sibling::tr',
+        fields={
+            "colspan": extract.ExtractField("td[1]/@colspan"),
+            "section_title": extract.ExtractField(
+                'td[@colspan="4"][1]/descendant-or-self::text()'
+            ),
+            "entry_title": extract.ExtractField("td[2]/descendant-or-self::text()"),
+            "summary_url": extract.ExtractField(
+                "(td[3]/descendant-or-self::a)[1]/@href"
+            ),
+            "index_url": extract.ExtractField("(td[4]/descendant-or-self::a)[1]/@href"),
+        },
+    )
+
     @property
     def name(self) -> str:
         return "au-qld-elections"
@@ -59,31 +90,19 @@ class QueenslandGovernmentElectionsWebData(data.WebData):
     def _parse_ecq_result_index(
         self, web_data: WebDataAvailable
     ) -> typing.Iterable[typing.Union[GatherDataRequest, GatherDataItem]]:
-        for section in web_data.selector.css('td[colspan="4"]'):
-            section_title = section.css("::text").get()
-            for following_sibling in section.xpath("../following-sibling::tr"):
-                tds = following_sibling.css("td")
-                first_td = tds[0]
-                if first_td.attrib.get("colspan") == "4":
-                    break
-                if first_td.attrib.get("colspan") == "3":
-                    continue
-                entry_title = tds[1].css("::text").get()
-
-                summary_url = tds[2].css("a").attrib.get("href")
-                if summary_url:
+        section_title = None
+        for row in self.ecq_result_index_rows.extract(web_data.selector):
+            if row["colspan"] == "4":
+                section_title = row["section_title"]
+                continue
+            if row["colspan"] == "3":
+                continue
+            entry_title = row["entry_title"]
+
+            for url in [row["summary_url"], row["index_url"]]:
+                if url:
                     yield data.GatherDataRequest(
-                        url=self._make_abs_url(self.base_ecq_results_url, summary_url),
-                        data={
-                            "section_title": section_title,
-                            "entry_title": entry_title,
-                        },
-                    )
-
-                index_url = tds[3].css("a").attrib.get("href")
-                if index_url:
-                    yield data.GatherDataRequest(
-                        url=self._make_abs_url(self.base_ecq_results_url, index_url),
+                        url=self._make_abs_url(self.base_ecq_results_url, url),
                         data={
                             "section_title": section_title,
                             "entry_title": entry_title,
@@ -93,7 +112,7 @@ class QueenslandGovernmentElectionsWebData(data.WebData):
     def _parse_elections_resultsdata(
         self, web_data: WebDataAvailable
     ) -> typing.Iterable[typing.Union[GatherDataRequest, GatherDataItem]]:
-        for election in web_data.body_data.get("elections"):
+        for election in web_data.json_items():
             el_stub = election.get("stub")
             el_data = {
                 "el_id": election.get("id"),
@@ -168,25 +187,32 @@ class QueenslandGovernmentElectionsWebData(data.WebData):
         else:
             raise ValueError(url, web_data)
 
-    def _parse_zip_xml(self, web_data: WebDataAvailable):
+    def _parse_zip_xml(
+        self, web_data: WebDataAvailable
+    ) -> typing.Iterator[stream.XmlRecord]:
         url = web_data.response_url
-        with io.BytesIO(web_data.body_raw) as zip_data:
+        with web_data.open_body() as zip_data:
             with ZipFile(zip_data, "r") as zip_reader:
                 if logger.isEnabledFor(logging.DEBUG):
                     zip_test = zip_reader.testzip()
                     if zip_test is not None:
                         raise ValueError(f"Bad zip file '{url}': {zip_test}")
 
+                # only the first xml file has the results
                 file_list = zip_reader.infolist()
                 for file_info in file_list:
                     if not file_info.filename.endswith("xml"):
                         continue
-                    file_data = zip_reader.read(file_info.filename).decode("utf-8")
-                    return xml_to_data(file_data)
+                    with zip_reader.open(file_info) as xml_data:
+                        yield from stream.iter_xml_records(
+                            xml_data, self.zip_xml_record_kinds
+                        )
+                    return
 
     def _parse_data_zip_xml(self, url: str, web_data: WebDataAvailable):
-        xml_data = self._parse_zip_xml(web_data)
-        yield None
+        for record in self._parse_zip_xml(web_data):
+            # TODO: build items from the electorate and booth records
+            yield None
 
     def _parse_data_html(self, url: str, web_data: WebDataAvailable):
         # TODO: parse 'https://results.elections.qld.gov.au/aurukun2020/01'
@@ -13,7 +13,7 @@ class QueenslandEnergexElectricityItem(data.GatherDataItem):
 class QueenslandEnergexElectricityWebData(data.WebData):
     @property
     def name(self) -> str:
-        return "au-qld-electricity"
+        return "au-qld-energex-electricity"
 
     def web_resources(
         self, web_data: data.WebDataAvailable
@@ -43,7 +43,7 @@ class QueenslandErgonEnergyElectricityItem(data.GatherDataItem):
 class QueenslandErgonEnergyElectricityWebData(data.WebData):
     @property
     def name(self) -> str:
-        return "au-qld-electricity"
+        return "au-qld-ergon-electricity"
 
     # "high"
     category_high_max = 5000
@@ -5,6 +5,7 @@ import json
 from zoneinfo import ZoneInfo
 
 from gather_vision.obtain.core import data
+from gather_vision.obtain.core.text import slug
 
 
 # https://www.data.qld.gov.au/dataset/find-a-charging-station-electric-vehicle/resource/a34d4b5f-8e3c-4995-8950-2e84fd7bb4d5
@@ -115,7 +116,7 @@ class QueenslandRailEvents:
 
         title = item.get("Title", "")
         description = self.get_description(item)
-        source_id = slugify(item.get("ID"))
+        source_id = slug(item.get("ID"))
         lines = self.get_lines(item)
         event_start = self._normalise.parse_date(item.get("EventDate"), self._tz)
         event_stop = self._normalise.parse_date(item.get("EndDate"), self._tz)
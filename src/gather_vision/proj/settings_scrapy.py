@@ -23,6 +23,9 @@ LOCAL_DIR = BASE_DIR / ".local"
 FEEDS_FILE_PATH = LOCAL_DIR / "feeds" / "feed_%(name)s_%(time)s.jsonl.gz"
 HTTP_CACHE_DIR_PATH = LOCAL_DIR / "http_cache"
 FILES_DIR_PATH = LOCAL_DIR / "files"
+STATE_DIR_PATH = LOCAL_DIR / "state"
+JOBS_DIR_PATH = LOCAL_DIR / "jobs"
+SEEN_DIR_PATH = LOCAL_DIR / "seen"
 
 env = DjangoCustomSettings(prefix="GATHER_VISION_SCRAPY")
 env.load_file(LOCAL_DIR / "gather_vision_scrapy.ini")
@@ -58,6 +61,9 @@ EXTENSIONS = env.get_dict(
     "EXTENSIONS",
     default={
         "scrapy.extensions.telnet.TelnetConsole": None,
+        # web data keeps its own state, see WEB_DATA_STATE_DIR
+        "scrapy.extensions.spiderstate.SpiderState": None,
+        "gather_vision.obtain.core.crawl.WebDataBudget": 500,
     },
 )
 
@@ -94,17 +100,68 @@ AUTOTHROTTLE_TARGET_CONCURRENCY = env.get_float(
     1.0,
 )
 
+# downloader middleware
+DOWNLOADER_MIDDLEWARES = env.get_dict(
+    "DOWNLOADER_MIDDLEWARES",
+    default={
+        # after the retry middleware, so each retry attempt is counted
+        "gather_vision.obtain.core.crawl.CircuitBreakerMiddleware": 560,
+    },
+)
+
+# stop requesting domains that keep failing, and probe again after a cool-down
+WEB_DATA_BREAKER_ENABLED = env.get_bool("WEB_DATA_BREAKER_ENABLED", True)
+WEB_DATA_BREAKER_FAILURES = env.get_int("WEB_DATA_BREAKER_FAILURES", 5)
+WEB_DATA_BREAKER_WINDOW = env.get_int("WEB_DATA_BREAKER_WINDOW", 10)
+WEB_DATA_BREAKER_COOLDOWN = env.get_float("WEB_DATA_BREAKER_COOLDOWN", 300.0)
+WEB_DATA_BREAKER_MODE = env.get_str("WEB_DATA_BREAKER_MODE", "defer")
+# drop the deferred requests for a domain after this many failed probes in a row
+WEB_DATA_BREAKER_PROBE_FAILURES = env.get_int("WEB_DATA_BREAKER_PROBE_FAILURES", 2)
+WEB_DATA_BREAKER_HTTP_CODES = env.get_list(
+    "WEB_DATA_BREAKER_HTTP_CODES",
+    default=["500", "502", "503", "504", "522", "524", "408", "429"],
+)
+
+# the default limits for each web data crawl, 0 is no limit
+WEB_DATA_BUDGET_SECONDS = env.get_float("WEB_DATA_BUDGET_SECONDS", 0)
+WEB_DATA_BUDGET_REQUESTS = env.get_int("WEB_DATA_BUDGET_REQUESTS", 0)
+WEB_DATA_BUDGET_BYTES = env.get_int("WEB_DATA_BUDGET_BYTES", 0)
+
 # pipelines
 ITEM_PIPELINES = env.get_dict(
     "ITEM_PIPELINES",
     default={
-        "scrapy.pipelines.files.FilesPipeline": 100,
         "gather_vision.obtain.core.data.GatherVisionStoreDjangoItemPipeline": 300,
     },
 )
 
+# raw downloaded files are kept in a content-addressed store
 FILES_STORE = make_scrapy_path(env.get_path("FILES_STORE", FILES_DIR_PATH))
-MEDIA_ALLOW_REDIRECTS = env.get_bool("MEDIA_ALLOW_REDIRECTS", True)
+WEB_DATA_ARTIFACTS_ENABLED = env.get_bool("WEB_DATA_ARTIFACTS_ENABLED", True)
+
+# web data state kept between runs
+WEB_DATA_STATE_ENABLED = env.get_bool("WEB_DATA_STATE_ENABLED", True)
+WEB_DATA_STATE_DIR = make_scrapy_path(
+    env.get_path("WEB_DATA_STATE_DIR", STATE_DIR_PATH)
+)
+
+# each web data crawl has a persisted queue and dupefilter, so it can be resumed
+WEB_DATA_JOBS_ENABLED = env.get_bool("WEB_DATA_JOBS_ENABLED", True)
+WEB_DATA_JOBS_DIR = make_scrapy_path(env.get_path("WEB_DATA_JOBS_DIR", JOBS_DIR_PATH))
+
+# urls marked as final by web data are not requested in later runs
+DUPEFILTER_CLASS = env.get_str(
+    "DUPEFILTER_CLASS",
+    "gather_vision.obtain.core.seen.SeenUrlDupeFilter",
+)
+WEB_DATA_SEEN_ENABLED = env.get_bool("WEB_DATA_SEEN_ENABLED", True)
+WEB_DATA_SEEN_DIR = make_scrapy_path(env.get_path("WEB_DATA_SEEN_DIR", SEEN_DIR_PATH))
+WEB_DATA_SEEN_CAPACITY = env.get_int("WEB_DATA_SEEN_CAPACITY", 100000)
+WEB_DATA_SEEN_ERROR_RATE = env.get_float("WEB_DATA_SEEN_ERROR_RATE", 0.0001)
+
+# CPU-bound parsing steps run in a shared process pool, 0 runs them in the crawl
+WEB_DATA_POOL_SIZE = env.get_int("WEB_DATA_POOL_SIZE", 2)
+WEB_DATA_POOL_TIMEOUT = env.get_float("WEB_DATA_POOL_TIMEOUT", 300.0)
 
 # Set settings whose default value is deprecated to a future-proof value
 REQUEST_FINGERPRINTER_IMPLEMENTATION = env.get_str(
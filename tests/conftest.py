@@ -1,3 +1,4 @@
+import asyncio
 import re
 import pytest
 import logging
@@ -7,6 +8,24 @@ logging.basicConfig(
 )
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run the benchmarks, use '-s' to see the timings.",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="Benchmarks only run with '--benchmark'.")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture()
 def equal_ignore_whitespace():
     def _equal_ignore_whitespace(value1: str, value2: str, ignore_case=False):
@@ -21,3 +40,14 @@ def equal_ignore_whitespace():
             assert replace1 == replace2
 
     return _equal_ignore_whitespace
+
+
+@pytest.fixture()
+def parse_all():
+    """Collect the results of an async web data parse."""
+    from scrapy.utils.asyncgen import collect_asyncgen
+
+    def _parse_all(results) -> list:
+        return asyncio.run(collect_asyncgen(results))
+
+    return _parse_all
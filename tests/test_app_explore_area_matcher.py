@@ -0,0 +1,153 @@
+import tempfile
+from unittest import mock
+
+from django.test import TestCase
+from scrapy.extensions.httpcache import FilesystemCacheStorage
+from scrapy.http import Request, XmlResponse
+from scrapy.settings import Settings
+from scrapy.utils.test import get_crawler
+
+from gather_vision.apps.explore import models as explore_models
+from gather_vision.apps.transport import models as transport_models
+from gather_vision.obtain.place.au.qld.bcc.transport import (
+    BrisbaneTranslinkNoticesItem,
+    BrisbaneTranslinkNoticesWebData,
+)
+from gather_vision.obtain.core.data import GatherDataArea
+from gather_vision.obtain.core.reparse import WebDataReparse
+from gather_vision.obtain.place.au.qld.bcc import area_brisbane, origin_bcc, tz_bne
+
+Area = explore_models.Area
+
+
+class AreaMatcherTests(TestCase):
+    async def test_area_matcher_refresh_and_resolve(self):
+        matcher = explore_models.AreaMatcher()
+        await Area.objects.acreate(
+            name="kelvin-grove", title="Kelvin Grove", level=Area.LEVEL_NEIGHBOURHOOD
+        )
+        await Area.objects.acreate(
+            name="brisbane", title="Brisbane", level=Area.LEVEL_LOCALITY
+        )
+
+        assert await matcher.arefresh() == 1
+        assert matcher.find("Kelvin Grove and Brisbane") == ["Kelvin Grove"]
+
+        # only the areas added since the previous refresh are loaded
+        red_hill = await Area.objects.acreate(
+            name="red-hill", title="Red Hill", level=Area.LEVEL_NEIGHBOURHOOD
+        )
+        assert matcher.find("RED HILL") == []
+        assert await matcher.arefresh() == 1
+        assert await matcher.arefresh() == 0
+
+        titles = matcher.find("Red Hill, kelvin grove, red hill")
+        assert titles == ["Red Hill", "Kelvin Grove"]
+        areas = await matcher.aresolve(titles)
+        assert [i.title for i in areas] == ["Kelvin Grove", "Red Hill"]
+        assert await matcher.aresolve(["Unknown"]) == []
+
+        assert matcher.add(red_hill) is False
+
+    @mock.patch.object(explore_models, "area_matcher", explore_models.AreaMatcher())
+    async def test_translink_event_location_areas(self):
+        matcher = explore_models.area_matcher
+        await Area.from_obtain_data(
+            [
+                area_brisbane,
+                GatherDataArea(level=Area.LEVEL_NEIGHBOURHOOD, title="Bowen Hills"),
+            ]
+        )
+        # the new area is added without a refresh
+        locations = matcher.find("Bowen Hills station closure")
+        assert locations == ["Bowen Hills"]
+
+        now = BrisbaneTranslinkNoticesItem.datetime_now(tz_bne)
+        item = BrisbaneTranslinkNoticesItem(
+            gather_name="au-qld-bcc-translink-notices",
+            title="Bowen Hills station closure",
+            retrieved_date=now,
+            issued_date=now,
+            description="",
+            url="https://translink.com.au/service-updates",
+            start_date=now,
+            stop_date=None,
+            category=transport_models.Event.CATEGORY_TRAIN_STATION,
+            severity=transport_models.Event.SEVERITY_MINOR,
+            locations=locations,
+            groups=[],
+            areas=[area_brisbane],
+            origin=origin_bcc,
+        )
+        await item.save_models()
+
+        event = await transport_models.Event.objects.aget()
+        assert event.locations == "Bowen Hills"
+        assert [i.title async for i in event.location_areas.all()] == ["Bowen Hills"]
+
+    async def test_translink_reparse_location_areas(self):
+        await Area.from_obtain_data(
+            [
+                area_brisbane,
+                GatherDataArea(level=Area.LEVEL_NEIGHBOURHOOD, title="Bowen Hills"),
+            ]
+        )
+
+        url = BrisbaneTranslinkNoticesWebData._notice_url
+        response = XmlResponse(
+            url=url,
+            body=(
+                "<rss><channel><pubDate>Mon, 01 Jan 2024 09:00:00 +1000</pubDate>"
+                "<item><title>Bowen Hills station closure</title>"
+                "<description>(Minor) Station closed. Starts affecting: 02/01/2024 4:00 AM"
+                " Finishes affecting: 03/01/2024 11:00 PM</description>"
+                "<link>https://translink.com.au/updates/1</link>"
+                "<category>Minor</category></item></channel></rss>"
+            ).encode("utf-8"),
+            headers={"Content-Type": "application/rss+xml; charset=utf-8"},
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = Settings(
+                {
+                    "HTTPCACHE_DIR": f"{temp_dir}/httpcache",
+                    "HTTPCACHE_STORAGE": (
+                        "scrapy.extensions.httpcache.FilesystemCacheStorage"
+                    ),
+                    "FILES_STORE": f"{temp_dir}/files",
+                    "ITEM_PIPELINES": {
+                        "gather_vision.obtain.core.data."
+                        "GatherVisionStoreDjangoItemPipeline": 300,
+                    },
+                }
+            )
+            crawler = get_crawler(BrisbaneTranslinkNoticesWebData, settings)
+            storage = FilesystemCacheStorage(settings)
+            spider = BrisbaneTranslinkNoticesWebData.from_crawler(crawler)
+            storage.open_spider(spider)
+            storage.store_response(spider, Request(url), response)
+
+            # the reparse loads the areas without the spider opened signal
+            with mock.patch.object(
+                explore_models, "area_matcher", explore_models.AreaMatcher()
+            ):
+                reparse = WebDataReparse(BrisbaneTranslinkNoticesWebData, settings)
+                result = await reparse.run()
+            assert result.items == 1
+
+            event = await transport_models.Event.objects.aget()
+            assert event.locations == "Bowen Hills"
+            areas = [i.title async for i in event.location_areas.all()]
+            assert areas == ["Bowen Hills"]
+
+            # no areas found does not remove the stored areas
+            matcher = explore_models.AreaMatcher()
+            with (
+                mock.patch.object(explore_models, "area_matcher", matcher),
+                mock.patch.object(matcher, "arefresh", mock.AsyncMock(return_value=0)),
+            ):
+                reparse = WebDataReparse(BrisbaneTranslinkNoticesWebData, settings)
+                await reparse.run()
+
+            areas = [i.title async for i in event.location_areas.all()]
+            assert areas == ["Bowen Hills"]
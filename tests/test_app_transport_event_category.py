@@ -1,6 +1,3 @@
-import random
-from random import shuffle
-
 from django.utils.text import slugify
 from hypothesis import given, example, strategies as st, assume
 
@@ -9,7 +6,10 @@ from hypothesis.extra.django import TestCase
 
 from gather_vision.apps.transport import models as transport_models
 from gather_vision.apps.transport.models import event_cat_options
-from gather_vision.obtain.core.data import GatherDataContainerCheck
+from gather_vision.obtain.core.data import (
+    GatherDataClassifier,
+    GatherDataContainerCheck,
+)
 
 # from hypothesis.extra import ghostwriter
 # output = ghostwriter.magic(transport_models.Event.guess_category)
@@ -23,16 +23,45 @@ C_FERRY_SERVICE = transport_models.Event.CATEGORY_FERRY_SERVICE
 C_TRAIN_CARPARK = transport_models.Event.CATEGORY_TRAIN_CARPARK
 
 
+def _ordered_label(
+    raw: str | None, options: list[GatherDataContainerCheck] = event_cat_options
+) -> str | None:
+    # the label from trying each check in order
+    value = slugify(raw or "").split("-")
+    for opt in options:
+        if opt.check(value):
+            return opt.label
+    return None
+
+
+_category_words = sorted(
+    {
+        item
+        for opt in event_cat_options
+        for items in [opt.required_one, opt.required_all, opt.forbidden, opt.allowed]
+        if isinstance(items, list)
+        for item in items
+    }
+    | {"ELLIPSIS", "timetable", "N199", "P332", "143W", "Beenleigh Line"}
+)
+
+
+event_category_raw = st.one_of(
+    st.text(),
+    st.lists(
+        st.one_of(
+            st.sampled_from(_category_words),
+            st.integers(min_value=1, max_value=9999).map(str),
+        ),
+        max_size=8,
+    ).map("; ".join),
+)
+
+
 @st.composite
 def event_category_examples(draw):
-    raw: str = draw(st.text())
-    random_option_order: list[GatherDataContainerCheck] = list(
-        random.sample(event_cat_options, len(event_cat_options))
-    )
-    for opt in random_option_order:
-        value = slugify(raw or "").split("-")
-        if opt.check(value):
-            return raw, opt.label
+    raw: str = draw(event_category_raw)
+    return raw, _ordered_label(raw)
 
 
 class TransportEventCategoryTests(TestCase):
@@ -309,5 +338,37 @@ class TransportEventCategoryTests(TestCase):
     def test_transport_event_category_guess(self, data: tuple[str, str]):
         if not data:
             return
-        raw, actual = data
-        assert transport_models.Event.guess_category(raw) == actual
+        raw, expected = data
+        assert transport_models.Event.guess_category(raw) == expected
+
+    @given(raw=event_category_raw, options=st.permutations(event_cat_options))
+    def test_transport_event_category_option_order(
+        self, raw: str, options: list[GatherDataContainerCheck]
+    ):
+        # the first check in the given order provides the label
+        classifier = GatherDataClassifier(options)
+        entries = slugify(raw).split("-")
+        assert classifier.classify(entries) == _ordered_label(raw, options)
+
+    def test_transport_event_category_overlapping_options(self):
+        raw = "stop; 904"
+        bus_stop = [i for i in event_cat_options if i.label == C_BUS_STOP]
+        others = [i for i in event_cat_options if i.label != C_BUS_STOP]
+        entries = slugify(raw).split("-")
+
+        assert transport_models.Event.guess_category(raw) == C_BUS_STOP
+        assert GatherDataClassifier(bus_stop + others).classify(entries) == C_BUS_STOP
+        assert GatherDataClassifier(others + bus_stop).classify(entries) == (
+            C_BUS_SERVICE
+        )
+
+
+def test_transport_event_join_locations_fits_field():
+    locations = [f"Suburb {i}" for i in range(100)]
+    joined = transport_models.Event.join_locations(locations)
+
+    assert len(joined) <= 500
+    assert joined.split("; ") == locations[: len(joined.split("; "))]
+    assert transport_models.Event.join_locations(["a", "b"]) == "a; b"
+    assert transport_models.Event.join_locations(["x" * 600]) == "x" * 500
+    assert transport_models.Event.join_locations([]) == ""
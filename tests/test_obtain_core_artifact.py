@@ -0,0 +1,72 @@
+import typing
+from unittest import mock
+
+from scrapy.http import Request, Response
+from scrapy.utils.test import get_crawler
+
+from gather_vision.obtain.core import data
+from gather_vision.obtain.core.artifact import ArtifactStore
+
+
+def test_artifact_store_deduplicates_content(tmp_path):
+    store = ArtifactStore(tmp_path)
+    first = store.put(b"zip content", "https://example.com/a.zip", "run1", "example")
+    second = store.put(b"zip content", "https://example.com/b.zip", "run2", "example")
+    store.put(b"other", "https://example.com/a.zip", "run2", "other")
+
+    assert first.sha256 == second.sha256
+    assert len(list((tmp_path / "objects").rglob("*"))) == 4
+    assert [(i.url, i.run) for i in store.records("example")] == [
+        ("https://example.com/a.zip", "run1"),
+        ("https://example.com/b.zip", "run2"),
+    ]
+
+    found = store.find("https://example.com/a.zip")
+    assert found.run == "run2"
+    with store.open(found) as f:
+        assert f.read() == b"other"
+
+    assert store.find("https://example.com/missing.zip") is None
+
+
+def test_artifact_store_find_reads_index_once(tmp_path):
+    store = ArtifactStore(tmp_path)
+    store.put(b"first", "https://example.com/a.zip", "run1", "example")
+
+    with mock.patch.object(store, "records", wraps=store.records) as records:
+        assert store.find("https://example.com/a.zip").run == "run1"
+        assert store.find("https://example.com/b.zip") is None
+        store.put(b"second", "https://example.com/a.zip", "run2", "example")
+        assert store.find("https://example.com/a.zip").run == "run2"
+
+    records.assert_called_once_with()
+
+
+class ArtifactWebData(data.WebData):
+    artifact_suffixes = (".zip",)
+
+    @property
+    def name(self) -> str:
+        return "example-artifact"
+
+    def initial_urls(self) -> typing.Iterable[str]:
+        return []
+
+    def web_resources(self, web_data: data.WebDataAvailable):
+        yield None
+
+
+def test_parse_stores_matching_responses(tmp_path, parse_all):
+    crawler = get_crawler(ArtifactWebData, {"FILES_STORE": str(tmp_path)})
+    crawler.stats.open_spider(None)
+    spider = ArtifactWebData.from_crawler(crawler)
+
+    for url in ["https://example.com/results.ZIP", "https://example.com/page"]:
+        response = Response(url, body=b"content", request=Request(url))
+        parse_all(spider.parse(response))
+
+    records = list(ArtifactStore(tmp_path).records())
+    assert [(i.url, i.name, i.size) for i in records] == [
+        ("https://example.com/results.ZIP", "example-artifact", 7)
+    ]
+    assert crawler.stats.get_value("gather_vision/artifact/stored") == 1
@@ -0,0 +1,246 @@
+from unittest import mock
+
+import pytest
+import scrapy
+from scrapy.exceptions import DontCloseSpider, IgnoreRequest
+from scrapy.http import Response
+from scrapy.statscollectors import MemoryStatsCollector
+from scrapy.utils.test import get_crawler
+
+from gather_vision.obtain.core.crawl import CircuitBreakerMiddleware, WebDataBudget
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _middleware(mode: str) -> tuple[CircuitBreakerMiddleware, FakeClock]:
+    clock = FakeClock()
+    stats = MemoryStatsCollector(get_crawler())
+    middleware = CircuitBreakerMiddleware(
+        stats=stats,
+        failures=3,
+        window=5,
+        cooldown=60,
+        mode=mode,
+        http_codes=[503],
+        probe_failures=2,
+        clock=clock,
+    )
+    return middleware, clock
+
+
+def _request(url: str = "https://results1.example.com/a") -> scrapy.Request:
+    return scrapy.Request(url)
+
+
+def _fail(middleware: CircuitBreakerMiddleware, request: scrapy.Request) -> None:
+    middleware.process_exception(request, TimeoutError(), None)
+
+
+def _stat(middleware: CircuitBreakerMiddleware, key: str):
+    return middleware._stats.get_value(f"gather_vision/breaker/{key}")
+
+
+def test_circuit_opens_drops_and_closes_after_probe():
+    middleware, clock = _middleware("drop")
+    request = _request()
+
+    for _ in range(3):
+        middleware.process_request(request, None)
+        _fail(middleware, request)
+    assert _stat(middleware, "opened") == 1
+    assert _stat(middleware, "state/results1.example.com") == "open"
+
+    # other domains are not affected
+    other = _request("https://example.com/b")
+    assert middleware.process_request(other, None) is None
+
+    with pytest.raises(IgnoreRequest):
+        middleware.process_request(request, None)
+    assert _stat(middleware, "dropped") == 1
+
+    # after the cool-down, one probe is sent and others are still dropped
+    clock.now = 61
+    assert middleware.process_request(request, None) is None
+    assert _stat(middleware, "state/results1.example.com") == "half-open"
+    with pytest.raises(IgnoreRequest):
+        middleware.process_request(request, None)
+
+    response = Response(request.url, status=200, request=request)
+    middleware.process_response(request, response, None)
+    assert _stat(middleware, "closed") == 1
+    assert _stat(middleware, "state/results1.example.com") == "closed"
+    assert middleware.process_request(request, None) is None
+
+
+def test_circuit_reopens_when_probe_fails():
+    middleware, clock = _middleware("drop")
+    request = _request()
+    for _ in range(3):
+        response = Response(request.url, status=503, request=request)
+        middleware.process_response(request, response, None)
+    assert _stat(middleware, "opened") == 1
+
+    clock.now = 61
+    middleware.process_request(request, None)
+    _fail(middleware, request)
+    assert _stat(middleware, "opened") == 2
+    assert _stat(middleware, "state/results1.example.com") == "open"
+    with pytest.raises(IgnoreRequest):
+        middleware.process_request(request, None)
+
+
+def test_circuit_defers_until_cooldown():
+    middleware, clock = _middleware("defer")
+    middleware._crawler = mock.Mock()
+    calls = []
+    middleware._call_later = lambda seconds, func, *args: calls.append(
+        (seconds, func, args)
+    )
+    request = _request()
+    for _ in range(3):
+        _fail(middleware, request)
+
+    # deferred requests do not wait in the downloader
+    clock.now = 20
+    with pytest.raises(IgnoreRequest):
+        middleware.process_request(request, None)
+    with pytest.raises(IgnoreRequest):
+        middleware.process_request(_request("https://results1.example.com/b"), None)
+    assert _stat(middleware, "deferred") == 2
+    assert [seconds for seconds, _, _ in calls] == [40]
+    with pytest.raises(DontCloseSpider):
+        middleware.spider_idle(None)
+
+    # after the cool-down, the requests are scheduled again
+    clock.now = 60
+    seconds, func, args = calls[0]
+    func(*args)
+    crawled = [i.args[0] for i in middleware._crawler.engine.crawl.call_args_list]
+    assert [i.url for i in crawled] == [
+        "https://results1.example.com/a",
+        "https://results1.example.com/b",
+    ]
+    assert all(i.dont_filter for i in crawled)
+    middleware.spider_idle(None)
+
+    # one is the probe, the other waits for the probe
+    assert middleware.process_request(crawled[0], None) is None
+    with pytest.raises(IgnoreRequest):
+        middleware.process_request(crawled[1], None)
+    assert _stat(middleware, "probes") == 1
+    assert calls[1][0] == 6
+
+
+class FakeCall:
+    def __init__(self, at: float, func, args) -> None:
+        self.at = at
+        self.func = func
+        self.args = args
+        self.cancelled = False
+
+    def active(self) -> bool:
+        return not self.cancelled
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+def test_circuit_drops_deferred_when_domain_does_not_recover():
+    middleware, clock = _middleware("defer")
+    calls: list[FakeCall] = []
+
+    def _call_later(seconds, func, *args):
+        calls.append(FakeCall(clock.now + seconds, func, args))
+        return calls[-1]
+
+    sent = []
+
+    def _crawl(request):
+        try:
+            if middleware.process_request(request, None) is None:
+                sent.append(request)
+        except IgnoreRequest:
+            pass
+
+    middleware._call_later = _call_later
+    middleware._crawler = mock.Mock()
+    middleware._crawler.engine.crawl.side_effect = _crawl
+
+    for _ in range(3):
+        _fail(middleware, _request())
+    for index in range(100):
+        _crawl(_request(f"https://results1.example.com/{index}"))
+
+    # the host never recovers, so every probe fails
+    while sent or any(i.active() for i in calls):
+        if sent:
+            _fail(middleware, sent.pop())
+            continue
+        call = min((i for i in calls if i.active()), key=lambda i: i.at)
+        call.cancel()
+        clock.now = max(clock.now, call.at)
+        call.func(*call.args)
+
+    # the spider can close
+    middleware.spider_idle(None)
+    assert clock.now < 60 * 3
+    assert _stat(middleware, "probes") == 2
+    assert _stat(middleware, "dropped") == 98
+
+    # later requests are dropped without waiting
+    with pytest.raises(IgnoreRequest):
+        middleware.process_request(_request(), None)
+    assert not middleware._deferred
+
+
+class BudgetSpider(scrapy.Spider):
+    name = "example-budget"
+    budget_seconds = 0
+    budget_requests = 2
+    budget_bytes = None
+
+
+def _budget(settings: dict) -> tuple[WebDataBudget, BudgetSpider]:
+    crawler = get_crawler(BudgetSpider, settings)
+    crawler.stats.open_spider(None)
+    crawler.engine = mock.Mock()
+    spider = BudgetSpider.from_crawler(crawler)
+    extension = WebDataBudget.from_crawler(crawler)
+    extension.spider_opened(spider)
+    return extension, spider
+
+
+def _received(extension: WebDataBudget, spider: BudgetSpider, size: int) -> None:
+    request = _request()
+    response = Response(request.url, body=b"a" * size, request=request)
+    extension.response_received(response, request, spider)
+
+
+def test_budget_requests_closes_once():
+    extension, spider = _budget({})
+    engine = spider.crawler.engine
+
+    _received(extension, spider, 10)
+    engine.close_spider.assert_not_called()
+
+    _received(extension, spider, 10)
+    _received(extension, spider, 10)
+    engine.close_spider.assert_called_once_with(spider, "budget_exceeded_requests")
+    stats = spider.crawler.stats
+    assert stats.get_value("gather_vision/budget/exceeded") == "requests"
+    assert stats.get_value("gather_vision/budget/requests/limit") == 2
+
+
+def test_budget_bytes_from_settings():
+    extension, spider = _budget({"WEB_DATA_BUDGET_BYTES": 100})
+
+    _received(extension, spider, 150)
+    spider.crawler.engine.close_spider.assert_called_once_with(
+        spider, "budget_exceeded_bytes"
+    )
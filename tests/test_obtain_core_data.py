@@ -0,0 +1,129 @@
+import io
+import json
+import typing
+import zipfile
+from unittest import mock
+
+from scrapy.http import Request, Response, TextResponse, XmlResponse
+from scrapy.utils.test import get_crawler
+
+from gather_vision.obtain.core import data
+
+
+class ExampleWebData(data.WebData):
+    @property
+    def name(self) -> str:
+        return "example"
+
+    def initial_urls(self) -> typing.Iterable[str]:
+        return []
+
+    def web_resources(self, web_data: data.WebDataAvailable):
+        self.seen.append(web_data)
+        with web_data.open_body() as f:
+            with zipfile.ZipFile(f) as zip_reader:
+                self.names = zip_reader.namelist()
+                self.content = zip_reader.read(self.names[0])
+        yield None
+
+
+def _zip_response(url: str) -> Response:
+    with io.BytesIO() as f:
+        with zipfile.ZipFile(f, "w") as zip_writer:
+            zip_writer.writestr("results.xml", "<results>" + "a" * 1000 + "</results>")
+        body = f.getvalue()
+    return Response(
+        url=url,
+        body=body,
+        headers={"Content-Type": "application/zip"},
+        request=Request(url),
+    )
+
+
+def _spider(settings: dict) -> ExampleWebData:
+    crawler = get_crawler(ExampleWebData, settings)
+    crawler.stats.open_spider(None)
+    spider = ExampleWebData.from_crawler(crawler)
+    spider.seen = []
+    return spider
+
+
+def test_parse_opens_binary_body(parse_all):
+    spider = _spider({})
+    parse_all(spider.parse(_zip_response("https://example.com/results.zip")))
+
+    web_data = spider.seen[0]
+    assert web_data.body_raw
+    assert spider.names == ["results.xml"]
+    assert spider.content.startswith(b"<results>aaa")
+
+
+class IgnoreBodyWebData(data.WebData):
+    @property
+    def name(self) -> str:
+        return "example-ignore-body"
+
+    def initial_urls(self) -> typing.Iterable[str]:
+        return []
+
+    def web_resources(self, web_data: data.WebDataAvailable):
+        self.seen.append(web_data)
+        yield None
+
+
+def _xml_response(count: int) -> XmlResponse:
+    url = "https://example.com/feed.xml"
+    items = "".join(f"<item><title>Item {i}</title></item>" for i in range(count))
+    return XmlResponse(
+        url=url,
+        body=f"<rss><channel>{items}</channel></rss>".encode(),
+        headers={"Content-Type": "application/xml; charset=utf-8"},
+        request=Request(url),
+    )
+
+
+def test_web_data_available_decodes_once(parse_all):
+    spider = IgnoreBodyWebData()
+    spider.seen = []
+    response = _xml_response(10)
+
+    with mock.patch.object(data, "xml_to_data", wraps=data.xml_to_data) as xml_to_data:
+        parse_all(spider.parse(response))
+        assert xml_to_data.call_count == 0
+
+        web_data = spider.seen[0]
+        first = web_data.body_data
+        assert web_data.body_data is first
+        assert web_data.body_text is web_data.body_text
+        assert web_data.selector is web_data.selector
+        assert xml_to_data.call_count == 1
+
+    assert first["children"][0]["tag"] == "channel"
+
+
+def test_web_data_json_items(parse_all):
+    from gather_vision.obtain.place.au.qld.election import (
+        QueenslandGovernmentElectionsWebData,
+    )
+
+    url = QueenslandGovernmentElectionsWebData.list_elections_resultsdata_url
+    body = json.dumps(
+        {"elections": [{"id": 1, "stub": "aurukun2020", "electionName": "Aurukun"}]}
+    ).encode()
+    response = TextResponse(
+        url=url,
+        body=body,
+        headers={"Content-Type": "application/json"},
+        request=Request(url),
+    )
+    spider = QueenslandGovernmentElectionsWebData()
+
+    with mock.patch.object(TextResponse, "json") as response_json:
+        requests = parse_all(spider.parse(response))
+        assert response_json.call_count == 0
+
+    assert [i.url for i in requests][-1] == (
+        "https://resultsdata.elections.qld.gov.au/aurukun2020-status.json"
+    )
+    assert requests[0].cb_kwargs["el_stub"] == "aurukun2020"
+    assert requests[0].cb_kwargs["entry_title"] == "Aurukun"
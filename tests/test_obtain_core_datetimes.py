@@ -0,0 +1,123 @@
+import logging
+import time
+import zoneinfo
+from datetime import datetime
+
+import pytest
+from django.utils.dateparse import parse_datetime
+
+from gather_vision.obtain.core.datetimes import DateTimeParser, format_pattern
+
+
+def _previous_parse(value, timezone, formats=None):
+    # the parsing that was done before the datetime parser
+    value = (value or "").strip()
+    if not value:
+        return None
+    tz = zoneinfo.ZoneInfo(timezone)
+    options = [
+        *(formats or []),
+        "%d/%m/%Y %I:%M %p",
+        "%I:%M %p",
+        "%a, %d %b %Y %H:%M:%S %z",
+        "%d/%m/%Y",
+    ]
+    for option in options:
+        try:
+            return datetime.strptime(value, option).replace(tzinfo=tz)
+        except ValueError:
+            continue
+    try:
+        parsed = parse_datetime(value)
+        if parsed:
+            return parsed.replace(tzinfo=tz)
+    except ValueError:
+        pass
+    raise ValueError(f"Cannot parse datetime '{value}'.")
+
+
+values = [
+    "",
+    "  ",
+    None,
+    "12/05/2024 3:00 PM",
+    "12/05/2024 03:00 am",
+    " 1/05/2024 11:59 PM ",
+    "3:15 PM",
+    "Tue, 14 May 2024 09:30:00 +1000",
+    "Tue, 14 May 2024 09:30:00 GMT",
+    "14/05/2024",
+    "31/02/2024",
+    "05/06/2024",
+    "2024-05-14 09:30:00",
+    "2024-05-14T09:30:00+10:00",
+    "2024-02-30 09:30:00",
+    "not a date",
+    "13:00 PM",
+]
+
+
+def _outcome(func, *args):
+    try:
+        return func(*args)
+    except ValueError as e:
+        return str(e)
+
+
+@pytest.mark.parametrize("formats", [None, ["%m/%d/%Y"], ["%Y-%m-%d %H:%M:%S"]])
+def test_datetime_parser_matches_previous(formats):
+    parser = DateTimeParser()
+    # twice, so the remembered formats are used, in two orders
+    for value in [*values, *values, *reversed(values)]:
+        expected = _outcome(_previous_parse, value, "Australia/Brisbane", formats)
+        actual = _outcome(parser.parse, value, "Australia/Brisbane", formats, "example")
+        assert actual == expected, value
+        if isinstance(actual, datetime):
+            assert actual.tzinfo == expected.tzinfo
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("%d/%m/%Y", True),
+        ("%d %% %H", True),
+        ("%Q", False),
+        ("%Y-%m-%d %", False),
+    ],
+)
+def test_format_pattern(value, expected):
+    assert (format_pattern(value) is not None) == expected
+
+
+def test_datetime_parser_matches_previous(caplog):
+    caplog.set_level(logging.ERROR)
+    # the translink dates are all the last default format
+    items = [f"{day:02}/05/2024" for day in range(1, 29)] * 2
+    timezone = "Australia/Brisbane"
+
+    expected = [_previous_parse(i, timezone) for i in items]
+
+    parser = DateTimeParser()
+    actual = [parser.parse(i, timezone, key="start_date") for i in items]
+
+    assert actual == expected
+
+
+@pytest.mark.benchmark
+def test_datetime_parser_benchmark(caplog):
+    caplog.set_level(logging.ERROR)
+    # the translink dates are all the last default format
+    items = [f"{day:02}/05/2024" for day in range(1, 29)] * 500
+    timezone = "Australia/Brisbane"
+
+    start = time.perf_counter()
+    expected = [_previous_parse(i, timezone) for i in items]
+    previous_duration = time.perf_counter() - start
+
+    parser = DateTimeParser()
+    start = time.perf_counter()
+    actual = [parser.parse(i, timezone, key="start_date") for i in items]
+    duration = time.perf_counter() - start
+
+    assert actual == expected
+    print(f"\nprevious {previous_duration:.3f}s, parser {duration:.3f}s")
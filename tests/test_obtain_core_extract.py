@@ -0,0 +1,148 @@
+from datetime import datetime
+
+from parsel import Selector
+from scrapy.http import HtmlResponse
+
+from gather_vision.obtain.core import data
+from gather_vision.obtain.core.extract import ExtractField, ExtractSpec
+from gather_vision.obtain.place.au.qld.bcc.petition import (
+    BrisbaneCityCouncilPetitionsWebData,
+)
+from gather_vision.obtain.place.au.qld.election import (
+    QueenslandGovernmentElectionsWebData,
+)
+
+
+def _web_data(url: str, body: str) -> data.WebDataAvailable:
+    response = HtmlResponse(url, body=body.encode(), encoding="utf-8")
+    return data.WebDataAvailable(
+        request_url=url,
+        request_method="GET",
+        response_url=url,
+        body_raw=response.body,
+        status=200,
+        headers={},
+        response=response,
+    )
+
+
+def test_extract_spec_rows():
+    spec = ExtractSpec(
+        rows="//li",
+        fields={
+            "text": ExtractField("descendant-or-self::text()"),
+            "href": ExtractField("a/@href"),
+            "words": ExtractField("count(b)"),
+            "parts": ExtractSpec("b", {"text": ExtractField("text()", many=True)}),
+        },
+    )
+    selector = Selector(
+        text='<ul><li>one <a href="/1">link</a></li><li><b>x</b><b>y</b></li></ul>'
+    )
+    assert spec.extract(selector) == [
+        {"text": "one ", "href": "/1", "words": "0.0", "parts": []},
+        {
+            "text": "x",
+            "href": None,
+            "words": "2.0",
+            "parts": [{"text": ["x"]}, {"text": ["y"]}],
+        },
+    ]
+
+
+ecq_index = """
+<table>
+<tr><td colspan="4">State elections</td></tr>
+<tr><td colspan="3">Heading</td></tr>
+<tr><td></td><td>2020 State</td>
+<td><a href="state/2020/summary.html">Summary</a></td>
+<td><a href="state/2020/index.html">Index</a></td></tr>
+<tr><td></td><td>2017 State</td><td></td>
+<td><a href="state/2017/index.html">Index</a></td></tr>
+<tr><td colspan="4">By-elections</td></tr>
+<tr><td></td><td>Stretton</td>
+<td><a href="by/stretton/summary.html">Summary</a></td><td></td></tr>
+</table>
+<table><tr><td></td><td>Other</td><td><a href="other.html">x</a></td></tr></table>
+"""
+
+
+def _previous_ecq_index(web_data_source, web_data):
+    # the selector loops that were used before the extract spec
+    for section in web_data.selector.css('td[colspan="4"]'):
+        section_title = section.css("::text").get()
+        for following_sibling in section.xpath("../following-sibling::tr"):
+            tds = following_sibling.css("td")
+            first_td = tds[0]
+            if first_td.attrib.get("colspan") == "4":
+                break
+            if first_td.attrib.get("colspan") == "3":
+                continue
+            entry_title = tds[1].css("::text").get()
+            for td in tds[2:4]:
+                url = td.css("a").attrib.get("href")
+                if url:
+                    yield (
+                        web_data_source._make_abs_url(
+                            web_data_source.base_ecq_results_url, url
+                        ),
+                        section_title,
+                        entry_title,
+                    )
+
+
+def test_ecq_result_index_matches_previous():
+    web_data_source = QueenslandGovernmentElectionsWebData()
+    web_data = _web_data(web_data_source.list_ecq_results_index_url, ecq_index)
+
+    expected = list(_previous_ecq_index(web_data_source, web_data))
+    actual = [
+        (i.url, i.data["section_title"], i.data["entry_title"])
+        for i in web_data_source._parse_ecq_result_index(web_data)
+    ]
+    assert len(actual) == 4
+    assert actual == expected
+
+
+def _petitions_page(count: int) -> str:
+    rows = "".join(
+        f'<tr><td><a href="/petition/view/pid/{i}">Petition {i}\n title</a></td>'
+        f"<td>Principal {i}</td><td>Mon, 13 May 2024</td></tr>"
+        for i in range(count)
+    )
+    return f'<table class="petitions"><tr><th>Title</th></tr>{rows}</table>'
+
+
+def _previous_petitions_table(web_data_source, web_data):
+    # the selector loops that were used before the extract spec
+    for table_petition in web_data.selector.css("table.petitions"):
+        for table_row in table_petition.css("tr"):
+            table_cells = table_row.css("td")
+            if len(table_cells) < 3:
+                continue
+            item_id = table_cells[0].css("a").attrib.get("href").split("/")[-1]
+            listing = [
+                web_data_source.str_collapse(" ".join(i.css("::text").getall()))
+                for i in table_cells
+            ]
+            yield {
+                "title": table_cells[0].css("::text").get(),
+                "item_id": item_id,
+                "principal": table_cells[1].css("::text").get(),
+                "closed_at": datetime.strptime(
+                    table_cells[2].css("::text").get(), web_data_source.closed_fmt
+                ),
+                "listing_key": f"listing:{item_id}",
+                "listing_fingerprint": "|".join(listing),
+            }
+
+
+def test_petitions_table_matches_previous():
+    web_data_source = BrisbaneCityCouncilPetitionsWebData()
+    web_data = _web_data(web_data_source.list_url, _petitions_page(20))
+
+    expected = list(_previous_petitions_table(web_data_source, web_data))
+    actual = list(web_data_source._parse_petitions_table(web_data))
+
+    assert len(actual) == 20
+    assert actual == expected
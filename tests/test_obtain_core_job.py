@@ -0,0 +1,57 @@
+import scrapy
+from scrapy.core.scheduler import Scheduler
+from scrapy.settings import Settings
+from scrapy.utils.test import get_crawler
+
+from gather_vision.obtain.core.job import WebDataJob
+
+
+class ExampleSpider(scrapy.Spider):
+    name = "example-job"
+
+    def parse(self, response, **kwargs):
+        pass
+
+
+def _write_job(path) -> None:
+    crawler = get_crawler(ExampleSpider, {"JOBDIR": str(path)})
+    crawler.spider = ExampleSpider.from_crawler(crawler)
+    scheduler = Scheduler.from_crawler(crawler)
+    scheduler.open(crawler.spider)
+    for index in range(5):
+        scheduler.enqueue_request(
+            scrapy.Request(
+                f"https://example.com/{index}",
+                callback=crawler.spider.parse,
+                priority=index % 2,
+            )
+        )
+    scheduler.next_request()
+    scheduler.close("shutdown")
+
+
+def test_job_info_and_discard(tmp_path):
+    settings = Settings({"WEB_DATA_JOBS_DIR": str(tmp_path)})
+    job = WebDataJob.from_settings(settings, "example-job")
+    assert not job.exists()
+    assert WebDataJob.find_all(settings) == []
+
+    _write_job(job.path)
+
+    assert job.exists()
+    assert [i.name for i in WebDataJob.find_all(settings)] == ["example-job"]
+    info = job.info()
+    assert info.pending_requests == 4
+    assert info.seen_requests == 5
+    assert info.size_bytes > 0
+
+    job.discard()
+    assert not job.exists()
+    assert WebDataJob.find_all(settings) == []
+
+
+def test_job_disabled(tmp_path):
+    settings = Settings(
+        {"WEB_DATA_JOBS_DIR": str(tmp_path), "WEB_DATA_JOBS_ENABLED": False}
+    )
+    assert WebDataJob.from_settings(settings, "example-job") is None
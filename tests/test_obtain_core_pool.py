@@ -0,0 +1,102 @@
+import io
+import time
+import typing
+from datetime import datetime
+
+import pytest
+from openpyxl import Workbook
+from scrapy.http import HtmlResponse, Request
+from scrapy.utils.test import get_crawler
+
+from gather_vision.obtain.core import data, pool
+from gather_vision.obtain.place.au.qld.bcc import water
+
+
+class OffloadWebData(data.WebData):
+    @property
+    def name(self) -> str:
+        return "example-offload"
+
+    def initial_urls(self) -> typing.Iterable[str]:
+        return []
+
+    def web_resources(self, web_data: data.WebDataAvailable):
+        yield data.GatherDataOffload(
+            func=self.offload_func,
+            args=self.offload_args,
+            callback=self._requests,
+        )
+
+    def _requests(self, value):
+        yield data.GatherDataRequest(url=f"https://example.com/{value}", data={})
+
+
+def _spider(settings: dict, func, args) -> OffloadWebData:
+    crawler = get_crawler(OffloadWebData, settings)
+    crawler.stats.open_spider(None)
+    spider = OffloadWebData.from_crawler(crawler)
+    spider.offload_func = func
+    spider.offload_args = args
+    return spider
+
+
+def _response() -> HtmlResponse:
+    url = "https://example.com/"
+    return HtmlResponse(url=url, body=b"<html></html>", request=Request(url))
+
+
+@pytest.mark.parametrize("size", [0, 1])
+def test_offload_result_to_callback(parse_all, size):
+    spider = _spider({"WEB_DATA_POOL_SIZE": size}, sum, ([1, 2, 3],))
+    try:
+        requests = parse_all(spider.parse(_response()))
+    finally:
+        pool.shutdown_pool()
+
+    assert [i.url for i in requests] == ["https://example.com/6"]
+    assert spider.crawler.stats.get_value("gather_vision/offload/count") == 1
+
+
+def test_offload_timeout(parse_all):
+    settings = {"WEB_DATA_POOL_SIZE": 1, "WEB_DATA_POOL_TIMEOUT": 0.1}
+    spider = _spider(settings, time.sleep, (1,))
+    try:
+        with pytest.raises(TimeoutError):
+            parse_all(spider.parse(_response()))
+    finally:
+        pool.shutdown_pool()
+
+    assert spider.crawler.stats.get_value("gather_vision/offload/timeout") == 1
+
+
+def test_water_read_workbook_rows():
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sites"
+    ws.append(["Water quality"])
+    ws.append(
+        ["Site no.", "Site name", "Long", "Lat", "Location description"]
+        + [datetime(2024, 1, 2), datetime(2024, 1, 9)]
+    )
+    ws.append([1, "Creek", 153.0, -27.4, "Under the bridge", 10, "NT"])
+    body = io.BytesIO()
+    wb.save(body)
+
+    # the workbook is read in the process pool
+    try:
+        result = pool.get_pool(1).submit(water.read_water_quality, body.getvalue())
+        measures = result.result()
+    finally:
+        pool.shutdown_pool()
+
+    site = water.WaterQualitySite(
+        site_number=1,
+        site_name="Creek",
+        location_longitude=153.0,
+        location_latitude=-27.4,
+        location_description="Under the bridge",
+    )
+    assert measures == [
+        water.WaterQualityMeasure(site, datetime(2024, 1, 2), 10),
+        water.WaterQualityMeasure(site, datetime(2024, 1, 9), "NT"),
+    ]
@@ -0,0 +1,56 @@
+import os
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+import gather_vision
+from gather_vision.obtain.core.utils import GatherVisionException
+from gather_vision.obtain.place import web_data_registry
+
+
+def test_registry_select_glob():
+    assert web_data_registry.select(["au-qld-bcc-p*", "au-election"]) == [
+        "au-qld-bcc-petitions",
+        "au-election",
+    ]
+
+
+def test_registry_select_unknown():
+    with pytest.raises(GatherVisionException, match="No web data matched 'nope'"):
+        web_data_registry.select(["nope"])
+
+
+@pytest.mark.parametrize("name", web_data_registry.names())
+def test_registry_load(name):
+    assert web_data_registry.load(name).web_data_name() == name
+
+
+def test_registry_load_items():
+    assert len(web_data_registry.load_items()) == 15
+
+
+def test_registry_load_does_not_import_openpyxl(tmp_path):
+    # a new process, as other tests import openpyxl
+    src_dir = pathlib.Path(gather_vision.__file__).parent.parent
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(src_dir),
+        "DJANGO_SETTINGS_MODULE": "gather_vision.proj.settings",
+    }
+    code = (
+        "import sys, django; django.setup()\n"
+        "from gather_vision.obtain.place import web_data_registry\n"
+        "web_data_registry.load('au-qld-fuel')\n"
+        "print('openpyxl' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=tmp_path,
+        env=env,
+    )
+    assert result.stdout.strip() == "False"
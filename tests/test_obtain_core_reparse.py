@@ -0,0 +1,180 @@
+import asyncio
+import dataclasses
+import typing
+
+from scrapy import signals
+from scrapy.exceptions import DropItem
+from scrapy.extensions.httpcache import FilesystemCacheStorage
+from scrapy.http import HtmlResponse, Request
+from scrapy.settings import Settings
+from scrapy.utils.test import get_crawler
+
+from gather_vision.obtain.core import data
+from gather_vision.obtain.core.artifact import ArtifactStore
+from gather_vision.obtain.core.reparse import WebDataReparse
+
+saved = []
+
+
+@dataclasses.dataclass(frozen=True)
+class ReparseItem(data.GatherDataItem):
+    url: str
+    title: str
+
+    async def save_models(self) -> None:
+        saved.append(self)
+
+
+class ReparseWebData(data.WebData):
+    unchanged_response = "skip"
+
+    @property
+    def name(self) -> str:
+        return "example-reparse"
+
+    def initial_urls(self) -> typing.Iterable[str]:
+        return ["https://example.com/index"]
+
+    def web_resources(self, web_data: data.WebDataAvailable):
+        if web_data.request_url.endswith("/index"):
+            for href in web_data.selector.css("a::attr(href)").getall():
+                yield data.GatherDataRequest(url=href, data={"page": href})
+        else:
+            title = web_data.selector.css("title::text").get()
+            yield ReparseItem(self.name, web_data.request_url, title)
+
+
+def _settings(tmp_path) -> Settings:
+    return Settings(
+        {
+            "HTTPCACHE_DIR": str(tmp_path / "httpcache"),
+            "HTTPCACHE_STORAGE": "scrapy.extensions.httpcache.FilesystemCacheStorage",
+            "FILES_STORE": str(tmp_path / "files"),
+            "WEB_DATA_STATE_DIR": str(tmp_path / "state"),
+            "ITEM_PIPELINES": {
+                "gather_vision.obtain.core.data.GatherVisionStoreDjangoItemPipeline": 300,
+            },
+        }
+    )
+
+
+def _html(url: str, body: str) -> HtmlResponse:
+    return HtmlResponse(url, body=body.encode(), encoding="utf-8")
+
+
+def test_reparse_reads_cache_and_artifacts(tmp_path):
+    saved.clear()
+    settings = _settings(tmp_path)
+
+    index = _html(
+        "https://example.com/index",
+        '<a href="https://example.com/a">a</a>'
+        '<a href="https://example.com/b">b</a>'
+        '<a href="https://example.com/a">a again</a>'
+        '<a href="https://example.com/missing">missing</a>',
+    )
+    page_a = _html("https://example.com/a", "<title>Page A</title>")
+
+    # responses a crawl would have stored in the http cache
+    crawler = get_crawler(ReparseWebData, settings.copy_to_dict())
+    spider = ReparseWebData.from_crawler(crawler)
+    storage = FilesystemCacheStorage(settings)
+    storage.open_spider(spider)
+    for response in [index, page_a]:
+        storage.store_response(spider, Request(response.url), response)
+
+    # a response that is only in the artifact store
+    ArtifactStore(tmp_path / "files").put(
+        b"<title>Page B</title>",
+        "https://example.com/b",
+        "run1",
+        "example-reparse",
+        "text/html",
+    )
+
+    reparse = WebDataReparse(ReparseWebData, settings)
+    result = asyncio.run(reparse.run())
+
+    assert result.name == "example-reparse"
+    assert result.responses == 3
+    assert result.missing == 1
+    assert result.items == 2
+    assert sorted((i.url, i.title) for i in saved) == [
+        ("https://example.com/a", "Page A"),
+        ("https://example.com/b", "Page B"),
+    ]
+
+    # reparsing does not change the state or store artifacts
+    assert not (tmp_path / "state").exists()
+    assert len(list(ArtifactStore(tmp_path / "files").records())) == 1
+
+
+events = []
+
+
+class DropTitlePipeline:
+    def open_spider(self, spider) -> None:
+        events.append("pipeline opened")
+
+    def close_spider(self, spider) -> None:
+        events.append("pipeline closed")
+
+    async def process_item(self, item, spider):
+        if item.title == "Drop":
+            raise DropItem("dropped")
+        return item
+
+
+class SignalsWebData(ReparseWebData):
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        crawler.signals.connect(spider.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(spider.spider_closed, signal=signals.spider_closed)
+        return spider
+
+    def spider_opened(self, spider) -> None:
+        events.append("spider opened")
+
+    def spider_closed(self, spider, reason) -> None:
+        events.append(f"spider closed {reason}")
+
+
+def test_reparse_sends_signals_and_uses_item_pipelines(tmp_path):
+    saved.clear()
+    events.clear()
+    settings = _settings(tmp_path)
+    settings.set(
+        "ITEM_PIPELINES",
+        {
+            f"{__name__}.DropTitlePipeline": 100,
+            "gather_vision.obtain.core.data.GatherVisionStoreDjangoItemPipeline": 300,
+        },
+    )
+
+    index = _html(
+        "https://example.com/index",
+        '<a href="https://example.com/a">a</a><a href="https://example.com/b">b</a>',
+    )
+    crawler = get_crawler(SignalsWebData, settings.copy_to_dict())
+    spider = SignalsWebData.from_crawler(crawler)
+    storage = FilesystemCacheStorage(settings)
+    storage.open_spider(spider)
+    for response in [
+        index,
+        _html("https://example.com/a", "<title>Keep</title>"),
+        _html("https://example.com/b", "<title>Drop</title>"),
+    ]:
+        storage.store_response(spider, Request(response.url), response)
+    events.clear()
+
+    result = asyncio.run(WebDataReparse(SignalsWebData, settings).run())
+
+    assert result.items == 2
+    assert [i.title for i in saved] == ["Keep"]
+    assert events == [
+        "pipeline opened",
+        "spider opened",
+        "pipeline closed",
+        "spider closed finished",
+    ]
@@ -0,0 +1,71 @@
+import typing
+
+import scrapy
+from scrapy.utils.test import get_crawler
+
+from gather_vision.obtain.core import data
+from gather_vision.obtain.core.seen import BloomFilter, SeenUrlDupeFilter, WebDataSeen
+
+
+def test_bloom_filter_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    urls = [f"https://example.com/petition/{i}" for i in range(1000)]
+    for url in urls:
+        bloom.add(url)
+    assert all(url in bloom for url in urls)
+    assert not bloom.add(urls[0])
+
+    false_positives = sum(
+        f"https://example.com/other/{i}" in bloom for i in range(10000)
+    )
+    assert false_positives < 300
+
+
+def test_bloom_filter_bytes_round_trip():
+    bloom = BloomFilter(capacity=100, error_rate=0.001)
+    bloom.add("https://example.com/a")
+    restored = BloomFilter.from_bytes(bloom.to_bytes(), 100)
+    assert "https://example.com/a" in restored
+    assert "https://example.com/b" not in restored
+    assert len(restored) == 1
+
+
+def test_seen_save_and_load(tmp_path):
+    seen = WebDataSeen(tmp_path / "example.bloom", capacity=100)
+    seen.add("https://example.com/a")
+    seen.save()
+
+    seen = WebDataSeen(tmp_path / "example.bloom", capacity=100)
+    assert "https://example.com/a" in seen
+    assert "https://example.com/b" not in seen
+
+
+class FinalWebData(data.WebData):
+    @property
+    def name(self) -> str:
+        return "example-final"
+
+    def initial_urls(self) -> typing.Iterable[str]:
+        return []
+
+    def web_resources(self, web_data: data.WebDataAvailable):
+        yield None
+
+
+def _crawler(tmp_path):
+    crawler = get_crawler(FinalWebData, {"WEB_DATA_SEEN_DIR": str(tmp_path)})
+    crawler.stats.open_spider(None)
+    crawler.spider = FinalWebData.from_crawler(crawler)
+    return crawler
+
+
+def test_dupefilter_drops_final_urls_in_later_runs(tmp_path):
+    crawler = _crawler(tmp_path)
+    crawler.spider.mark_final("https://example.com/archive/1")
+    crawler.spider.closed("finished")
+
+    crawler = _crawler(tmp_path)
+    dupefilter = SeenUrlDupeFilter.from_crawler(crawler)
+    assert dupefilter.request_seen(scrapy.Request("https://example.com/archive/1"))
+    assert not dupefilter.request_seen(scrapy.Request("https://example.com/archive/2"))
+    assert crawler.stats.get_value("gather_vision/seen/dropped") == 1
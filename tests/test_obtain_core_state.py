@@ -0,0 +1,155 @@
+import dataclasses
+from datetime import datetime
+import typing
+
+import pytest
+from scrapy.http import HtmlResponse, Request
+from scrapy.utils.test import get_crawler
+
+from gather_vision.obtain.core import data
+from gather_vision.obtain.core.state import WebDataState
+from gather_vision.obtain.place.au.qld.bcc.petition import (
+    BrisbaneCityCouncilPetitionsWebData,
+)
+
+LIST_HTML = b"""
+<table class="petitions">
+<tr><th>Title</th><th>Principal</th><th>Closing</th></tr>
+<tr>
+<td><a href="/petition/view/pid/123">Fix the footpath</a></td>
+<td>A Person</td>
+<td>Mon, 02 Jan 2023</td>
+</tr>
+</table>
+"""
+
+
+def _list_response():
+    url = BrisbaneCityCouncilPetitionsWebData.list_url
+    return HtmlResponse(
+        url=url,
+        body=LIST_HTML,
+        headers={"Content-Type": "text/html; charset=utf-8"},
+        request=Request(url),
+    )
+
+
+def test_state_round_trip(tmp_path):
+    path = tmp_path / "example.json"
+    state = WebDataState(path)
+    assert state.get("key") is None
+    state.set("key", "value")
+    state.save()
+
+    assert WebDataState(path).get("key") == "value"
+
+
+def test_state_in_memory_does_not_save(tmp_path):
+    state = WebDataState()
+    state.set("key", "value")
+    state.save()
+    assert state.path is None
+    assert state.get("key") == "value"
+
+
+def test_petitions_skip_unchanged_listing(tmp_path, parse_all):
+    settings = {"WEB_DATA_STATE_DIR": str(tmp_path)}
+    crawler = get_crawler(BrisbaneCityCouncilPetitionsWebData, settings)
+    crawler.stats.open_spider(None)
+    spider = BrisbaneCityCouncilPetitionsWebData.from_crawler(crawler)
+
+    requests = parse_all(spider.parse(_list_response()))
+    assert len(requests) == 1
+
+    # the detail page was parsed, so the listing is recorded
+    meta = requests[0].cb_kwargs
+    spider.state.set(meta["listing_key"], meta["listing_fingerprint"])
+    spider.closed("finished")
+
+    crawler = get_crawler(BrisbaneCityCouncilPetitionsWebData, settings)
+    crawler.stats.open_spider(None)
+    spider = BrisbaneCityCouncilPetitionsWebData.from_crawler(crawler)
+    assert parse_all(spider.parse(_list_response())) == []
+    # the listing row is skipped, and the listing page body is unchanged
+    assert crawler.stats.get_value("gather_vision/state/skipped") == 1
+    assert crawler.stats.get_value("gather_vision/unchanged/requests") == 1
+
+
+class UnchangedWebData(data.WebData):
+    @property
+    def name(self) -> str:
+        return "example-unchanged"
+
+    def initial_urls(self) -> typing.Iterable[str]:
+        return []
+
+    def web_resources(self, web_data: data.WebDataAvailable):
+        yield data.GatherDataRequest(url="https://example.com/child", data={})
+        yield ExampleItem(gather_name=self.name)
+
+
+@dataclasses.dataclass(frozen=True)
+class ExampleItem(data.GatherDataItem):
+    async def save_models(self) -> None:
+        pass
+
+
+def _unchanged_spider(tmp_path, mode: str) -> UnchangedWebData:
+    crawler = get_crawler(UnchangedWebData, {"WEB_DATA_STATE_DIR": str(tmp_path)})
+    crawler.stats.open_spider(None)
+    spider = UnchangedWebData.from_crawler(crawler)
+    spider.unchanged_response = mode
+    return spider
+
+
+@pytest.mark.parametrize(
+    "mode,expected",
+    [
+        ("parse", [Request, ExampleItem]),
+        ("requests", [Request]),
+        ("skip", []),
+    ],
+)
+def test_unchanged_response_body(tmp_path, parse_all, mode, expected):
+    spider = _unchanged_spider(tmp_path, mode)
+    first = parse_all(spider.parse(_list_response()))
+    assert [type(i) for i in first] == [Request, ExampleItem]
+    spider.closed("finished")
+
+    spider = _unchanged_spider(tmp_path, mode)
+    second = parse_all(spider.parse(_list_response()))
+    assert [type(i) for i in second] == expected
+
+    # a changed body is parsed as usual
+    response = _list_response().replace(body=LIST_HTML + b"<p>changed</p>")
+    third = parse_all(spider.parse(response))
+    assert [type(i) for i in third] == [Request, ExampleItem]
+
+
+def test_petition_without_listing_key_does_not_set_state(tmp_path, parse_all):
+    settings = {"WEB_DATA_STATE_DIR": str(tmp_path)}
+    crawler = get_crawler(BrisbaneCityCouncilPetitionsWebData, settings)
+    crawler.stats.open_spider(None)
+    spider = BrisbaneCityCouncilPetitionsWebData.from_crawler(crawler)
+    spider.state.set("other", "value")
+
+    url = f"{BrisbaneCityCouncilPetitionsWebData.item_url}/123"
+    meta = {
+        "title": "Fix the footpath",
+        "item_id": "123",
+        "principal": "A Person",
+        "closed_at": datetime(2023, 1, 2),
+        "listing_fingerprint": "abc",
+    }
+    response = HtmlResponse(
+        url=url,
+        body=b'<div class="page-title"><h1>Fix the footpath</h1></div>',
+        headers={"Content-Type": "text/html; charset=utf-8"},
+        request=Request(url, cb_kwargs=meta),
+    )
+
+    items = parse_all(spider.parse(response, **meta))
+    assert len(items) == 1
+
+    # the state can still be saved, as no None key was set
+    spider.closed("finished")
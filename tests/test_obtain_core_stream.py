@@ -0,0 +1,261 @@
+import io
+import json
+import zipfile
+from unittest import mock
+
+import pytest
+from defusedxml import EntitiesForbidden
+
+from gather_vision.obtain.core import stream
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>ParlInfo Search</title>
+    <pubDate>Thu, 31 Mar 2022 00:00:00 +1000</pubDate>
+    <item>
+      <title>HVP No 170 - 31 March 2022</title>
+      <link>https://example.com/1</link>
+      <category>One</category>
+      <category>Two</category>
+    </item>
+    <item>
+      <title>SJ No. 139 - 30 March 2022</title>
+      <guid isPermaLink="true">https://example.com/2</guid>
+    </item>
+  </channel>
+</rss>
+"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Example Feed</title>
+  <entry>
+    <title>Entry one</title>
+    <link href="https://example.com/entry/1"/>
+    <updated>2003-12-13T18:30:02Z</updated>
+  </entry>
+</feed>
+"""
+
+
+def test_iter_feed_items_rss():
+    items = list(stream.iter_feed_items(io.BytesIO(RSS)))
+    assert items == [
+        {
+            "channel_title": "ParlInfo Search",
+            "channel_pubDate": "Thu, 31 Mar 2022 00:00:00 +1000",
+            "title": "HVP No 170 - 31 March 2022",
+            "link": "https://example.com/1",
+            "category": ["One", "Two"],
+        },
+        {
+            "channel_title": "ParlInfo Search",
+            "channel_pubDate": "Thu, 31 Mar 2022 00:00:00 +1000",
+            "title": "SJ No. 139 - 30 March 2022",
+            "guid": "https://example.com/2",
+        },
+    ]
+    assert stream.feed_values(items[0], "category") == ["One", "Two"]
+    assert stream.feed_values(items[1], "title") == ["SJ No. 139 - 30 March 2022"]
+    assert stream.feed_values(items[1], "category") == []
+
+
+def test_iter_feed_items_atom():
+    items = list(stream.iter_feed_items(io.BytesIO(ATOM)))
+    assert items == [
+        {
+            "channel_title": "Example Feed",
+            "title": "Entry one",
+            "link": "https://example.com/entry/1",
+            "updated": "2003-12-13T18:30:02Z",
+        }
+    ]
+
+
+def test_iter_feed_items_rejects_entities():
+    body = b"""<?xml version="1.0"?>
+<!DOCTYPE rss [<!ENTITY a "aaaaaaaaaa">]>
+<rss><channel><item><title>&a;</title></item></channel></rss>
+"""
+    with pytest.raises(EntitiesForbidden):
+        list(stream.iter_feed_items(io.BytesIO(body)))
+
+
+RESULTS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<election name="State 2020">
+  <districts>
+    <district number="1">
+      <districtName>Algester</districtName>
+      <booths>
+        <booth id="10"><boothName>Algester</boothName><votes>120</votes></booth>
+        <booth id="11"><boothName>Calamvale</boothName><votes>95</votes></booth>
+      </booths>
+    </district>
+    <district number="2">
+      <districtName>Aspley</districtName>
+    </district>
+  </districts>
+</election>
+"""
+
+
+def test_iter_xml_records_from_zip():
+    body = io.BytesIO()
+    with zipfile.ZipFile(body, "w") as zip_writer:
+        zip_writer.writestr("results.xml", RESULTS)
+
+    with zipfile.ZipFile(body) as zip_reader:
+        with zip_reader.open("results.xml") as xml_data:
+            records = list(
+                stream.iter_xml_records(
+                    xml_data, {"district": "electorate", "booth": "booth"}
+                )
+            )
+
+    assert [(i.kind, i.context) for i in records] == [
+        ("booth", {"electorate": {"number": "1"}}),
+        ("booth", {"electorate": {"number": "1"}}),
+        ("electorate", {}),
+        ("electorate", {}),
+    ]
+    booth = records[0].data
+    assert booth["attrs"] == {"id": "10"}
+    assert [(i["tag"], i["text"]) for i in booth["children"]] == [
+        ("boothName", "Algester"),
+        ("votes", "120"),
+    ]
+
+    # the completed booths are not kept in the electorate
+    electorate = records[2].data
+    assert electorate["attrs"] == {"number": "1"}
+    assert [i["tag"] for i in electorate["children"]] == ["districtName", "booths"]
+    assert electorate["children"][1]["children"] == []
+
+
+def test_iter_xml_records_releases_other_elements():
+    body = (
+        b"<election><summary><total>215</total></summary>"
+        b'<districts><district number="1"><districtName>Algester</districtName>'
+        b"</district></districts><notes><note>a</note></notes></election>"
+    )
+    roots = []
+    iterparse = stream.iterparse
+
+    def _iterparse(source, events):
+        for event, element in iterparse(source, events=events):
+            if not roots:
+                roots.append(element)
+            yield event, element
+
+    with mock.patch.object(stream, "iterparse", _iterparse):
+        records = list(
+            stream.iter_xml_records(io.BytesIO(body), {"district": "electorate"})
+        )
+
+    assert [i.data["attrs"] for i in records] == [{"number": "1"}]
+    assert [i["tag"] for i in records[0].data["children"]] == ["districtName"]
+    # the elements outside the records are not kept
+    assert len(roots[0]) == 0
+
+
+def test_iter_csv_chunks():
+    body = (
+        "2022 Federal Election Downloads\r\n"
+        "\r\n"
+        "Name,Count,Name\r\n"
+        '"Smith, J",1,x\r\n'
+        "\r\n"
+        "Jones,2,y\r\n"
+        "Brown,3,z\r\n"
+    ).encode("utf-8-sig")
+    source = io.BytesIO(body)
+
+    chunks = list(stream.iter_csv_chunks(source, chunk_size=2, required=["Count"]))
+
+    assert [rows for _, rows in chunks] == [
+        [["Smith, J", "1", "x"], ["Jones", "2", "y"]],
+        [["Brown", "3", "z"]],
+    ]
+    header = chunks[0][0]
+    assert header.names == ("Name", "Count", "Name")
+    assert header.index == {"Name": 0, "Count": 1}
+    assert not source.closed
+
+    assert list(stream.iter_csv_chunks(io.BytesIO(body), required=["Other"])) == []
+
+
+@pytest.mark.parametrize("read_size", [1, 3, 65536])
+def test_iter_json_items(read_size):
+    document = {
+        "skipped": {"a": [1, 2, {"b": "]}"}], "c": 12345.5e3},
+        "results": [
+            {"items": []},
+            {"items": [1, -23456, 'x,é\\"]', None, True, [{}], {"k": [1.5]}]},
+        ],
+        "after": [1],
+    }
+    body = json.dumps(document, indent=2).encode("utf-8")
+
+    def _items(path):
+        return list(stream.iter_json_items(io.BytesIO(body), path, read_size=read_size))
+
+    assert _items(("results", 1, "items")) == document["results"][1]["items"]
+    assert _items(("results", 0, "items")) == []
+    assert _items(("results",)) == document["results"]
+    assert _items(("skipped", "a")) == [1, 2, {"b": "]}"}]
+
+    with pytest.raises(ValueError, match="Cannot find 'missing'"):
+        _items(("missing",))
+    with pytest.raises(ValueError, match="Cannot find '2'"):
+        _items(("results", 2))
+    with pytest.raises(ValueError, match="Expected one of"):
+        _items(("skipped", "c"))
+
+
+def test_iter_json_items_matches_previous():
+    elections = [
+        {
+            "id": i,
+            "electionName": f"Election {i}",
+            "stub": f"election{i}",
+            "archiveXML": f"election{i}.zip",
+            "visible": True,
+        }
+        for i in range(20)
+    ]
+    body = json.dumps({"elections": elections}).encode("utf-8")
+
+    # previously the whole document was decoded before reading the elections
+    previous = [i["stub"] for i in json.loads(body)["elections"]]
+    stubs = [
+        i["stub"] for i in stream.iter_json_items(io.BytesIO(body), ("elections",))
+    ]
+
+    assert stubs == previous
+
+
+def test_election_zip_reads_first_xml_member():
+    from gather_vision.obtain.core.data import WebDataAvailable
+    from gather_vision.obtain.place.au.qld.election import (
+        QueenslandGovernmentElectionsWebData,
+    )
+
+    body = io.BytesIO()
+    with zipfile.ZipFile(body, "w") as zip_writer:
+        zip_writer.writestr("readme.txt", "results")
+        zip_writer.writestr("results.xml", RESULTS)
+        zip_writer.writestr("other.xml", RESULTS)
+    url = "https://resultsdata.elections.qld.gov.au/state2020.zip"
+    web_data = WebDataAvailable(
+        request_url=url,
+        request_method="GET",
+        response_url=url,
+        body_raw=body.getvalue(),
+        status=200,
+        headers={},
+    )
+
+    records = list(QueenslandGovernmentElectionsWebData()._parse_zip_xml(web_data))
+
+    assert [i.kind for i in records] == ["booth", "booth", "electorate", "electorate"]
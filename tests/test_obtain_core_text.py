@@ -0,0 +1,222 @@
+import re
+
+import pytest
+from django.utils.text import slugify
+
+from gather_vision.obtain.core.text import (
+    KeywordExtractor,
+    PatternDispatch,
+    TermMatcher,
+    slug,
+)
+from gather_vision.obtain.place.au.qld.bcc.transport import (
+    BrisbaneTranslinkNoticesWebData,
+)
+
+
+def _previous_extract(value, categories):
+    # the repeated search that was used before the keyword extractor
+    out = str(value)
+    hits = {}
+    for category, values in categories.items():
+        pattern = re.compile(rf"\b(?P<found>{'|'.join(values)})\b", flags=re.IGNORECASE)
+        found = set()
+        while True:
+            match = pattern.search(out)
+            if not match:
+                break
+            found.add(match.group("found").strip().lower())
+            out = out[0 : match.start()].strip() + " " + out[match.end() :].strip()
+        hits[category] = sorted(found)
+    return out, hits
+
+
+categories = {
+    "durations": ["temporary", "weekend", "late night"],
+    "affected": [r"bus\s*stops?", "stops?", r"park\s*('?n'?|and)\s*rides?"],
+    "changes": ["closures?", "re-?opened", r"free\s*travel"],
+}
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "",
+        "Timetable changes",
+        "Temporary stop closure - Adelaide Street",
+        "  Weekend bus stop closures and Park 'n' Ride reopened  ",
+        "Late night free travel for Stops 12, 13 in the city",
+        "Stopping pattern changes",
+        "Closure: Closure of stop - stop 5 (temporary)",
+    ],
+)
+def test_keyword_extractor_matches_previous(value):
+    expected_residual, expected_hits = _previous_extract(value, categories)
+    actual = KeywordExtractor(categories).extract(value)
+    assert actual.residual == expected_residual
+    assert actual.hits == expected_hits
+
+
+def test_keyword_extractor_title_matches_previous():
+    web_data = BrisbaneTranslinkNoticesWebData()
+    title = " - ".join(
+        ["Temporary stop closure", "Weekend bus service changes", "Extra words"] * 3
+    )
+
+    expected = _previous_extract(
+        title,
+        {
+            "durations": ["temporary", "weekend"],
+            "affected": [r"bus\s*services?", "stops?"],
+            "changes": ["closures?", "changes?"],
+        },
+    )
+    actual = web_data._extract_title_info(title)
+
+    assert actual["event_durations"] == expected[1]["durations"]
+    assert actual["event_affected"] == expected[1]["affected"]
+    assert actual["event_changes"] == expected[1]["changes"]
+
+
+def test_keyword_extractor_ignores_joined_keywords():
+    # removing 'weekend' does not make a new 'bus stop' keyword
+    actual = KeywordExtractor(categories).extract("bus weekend stop")
+    assert actual.residual == "bus "
+    assert actual.hits == {
+        "durations": ["weekend"],
+        "affected": ["stop"],
+        "changes": [],
+    }
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "(Bus) Stop moved. Starts affecting: 12/05/2024 "
+        "Finishes affecting: 19/05/2024",
+        "(Train) Track work. Starts affecting: 12/05/2024",
+        "Start date: 12/05/2024, End date: 19/05/2024, Services: 100, 200",
+        "Start date: 12/05/2024, Services: 100",
+        "Affects services: 12/05/2024 Services: 100",
+        "Something else",
+    ],
+)
+def test_pattern_dispatch_matches_previous(value):
+    patterns = BrisbaneTranslinkNoticesWebData._descr_patterns.patterns
+    expected = next(
+        (
+            (index, i.match(value).groupdict())
+            for index, i in enumerate(patterns)
+            if i.match(value)
+        ),
+        None,
+    )
+
+    dispatch = PatternDispatch(patterns)
+    actual = dispatch.match(value)
+    if expected is None:
+        assert actual is None
+        assert dispatch.misses == 1
+    else:
+        assert (actual.index, actual.groups) == expected
+        assert dispatch.hits == {expected[0]: 1}
+
+
+def test_pattern_dispatch_back_references():
+    dispatch = PatternDispatch(
+        [re.compile(r"(?P<a>\w)(?P=a)"), re.compile(r"(\w)-\1(?P<a>\w)")]
+    )
+    assert dispatch.match("xx").groups == {"a": "x"}
+    assert dispatch.match("y-yz").groups == {"a": "z"}
+    assert dispatch.match("y-z") is None
+    assert dispatch.hits == {0: 1, 1: 1}
+    assert dispatch.misses == 1
+
+
+def test_slug_matches_slugify_and_counts_hits():
+    values = ["Brisbane City", "  Ünïcode Line  ", "park 'n' ride; 526", "", None]
+    slug.cache_clear()
+    for value in values * 3:
+        assert slug(value) == slugify(value)
+    info = slug.cache_info()
+    assert (info.hits, info.misses) == (10, 5)
+
+
+def _regex_terms(value, terms):
+    # a pattern per term, with the first and then longest match kept
+    found = []
+    for term in terms:
+        words = r"\s+".join(re.escape(i) for i in term.split())
+        for match in re.finditer(rf"(?<!\w){words}(?!\w)", value, re.IGNORECASE):
+            found.append((match.start(), -match.end(), TermMatcher.normalise(term)))
+    results = []
+    position = 0
+    for start, end, term in sorted(found):
+        if start >= position:
+            position = -end
+            results.append((start, position, term))
+    return results
+
+
+def test_term_matcher():
+    matcher = TermMatcher([("Brisbane", 1), ("South Brisbane", 2), ("Roma Street", 3)])
+
+    value = "Closures at SOUTH  brisbane, Roma\nStreet and Brisbaneville; Brisbane."
+    assert [(i.term, i.values) for i in matcher.find(value)] == [
+        ("south brisbane", (2,)),
+        ("roma street", (3,)),
+        ("brisbane", (1,)),
+    ]
+    assert value[12:27] == "SOUTH  brisbane"
+    assert (matcher.find(value)[0].start, matcher.find(value)[0].end) == (12, 27)
+
+    # terms can be added after searching
+    assert matcher.add("Brisbaneville", 4) is True
+    assert matcher.add("brisbaneville", 4) is False
+    assert matcher.add("Brisbane", 5) is True
+    assert [(i.term, i.values) for i in matcher.find(value)][2:] == [
+        ("brisbaneville", (4,)),
+        ("brisbane", (1, 5)),
+    ]
+    assert len(matcher) == 4
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "Station closures at Kelvin Grove and Kelvin Grove Road, Red Hill",
+        "hill red hill redhill red hills Red Hill-Paddington",
+        "Ashgrove Ashgrove Ash grove ash  grove, the grove",
+        "",
+    ],
+)
+def test_term_matcher_matches_regex(value):
+    terms = [
+        "Kelvin Grove",
+        "Kelvin Grove Road",
+        "Red Hill",
+        "Hill",
+        "Paddington",
+        "Ash Grove",
+        "Ashgrove",
+        "Grove",
+    ]
+    matcher = TermMatcher((term, index) for index, term in enumerate(terms))
+
+    found = [(i.start, i.end, i.term) for i in matcher.find(value)]
+
+    assert found == _regex_terms(value, terms)
+
+
+def test_term_matcher_many_terms_matches_regex():
+    terms = [f"Suburb{i} Heights" for i in range(300)]
+    value = " ".join(
+        f"Closed at Suburb{i * 7} Heights station, see Suburb{i} Park"
+        for i in range(20)
+    )
+    matcher = TermMatcher((term, index) for index, term in enumerate(terms))
+
+    found = [(i.start, i.end, i.term) for i in matcher.find(value)]
+
+    assert found == _regex_terms(value, terms)
+    assert len(found) == 20
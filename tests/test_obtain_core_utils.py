@@ -0,0 +1,50 @@
+import pytest
+from defusedxml import EntitiesForbidden
+
+from gather_vision.obtain.core.utils import xml_to_data
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        '<a x="1">x<!--c-->y<b y="2">t</b>tail<?pi z?>more<c/><![CDATA[cd]]></a>',
+        '<?xml version="1.0" encoding="ISO-8859-1"?>'
+        '<r xmlns="http://n" xmlns:p="http://p"><p:i p:a="v">é</p:i> </r>'.encode(
+            "iso-8859-1"
+        ),
+        "<r>" + "".join(f'<i n="{i}"><t>{i}</t><u/></i>' for i in range(50)) + "</r>",
+    ],
+)
+def test_xml_to_data_fast_matches(value):
+    expected = xml_to_data(value)
+    actual = xml_to_data(value, fast=True)
+    assert actual == expected
+
+
+def test_xml_to_data_structure():
+    assert xml_to_data('<a k="v">t<b/>z</a>') == {
+        "attrs": {"k": "v"},
+        "tag": "a",
+        "tail": None,
+        "text": "t",
+        "children": [
+            {"attrs": {}, "tag": "b", "tail": "z", "text": None, "children": []}
+        ],
+    }
+
+
+def test_xml_to_data_deep():
+    depth = 5000
+    result = xml_to_data("<a>" * depth + "</a>" * depth)
+    count = 0
+    while result["children"]:
+        result = result["children"][0]
+        count += 1
+    assert count == depth - 1
+
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_xml_to_data_entities(fast):
+    value = '<!DOCTYPE a [<!ENTITY e "boom">]><a>&e;</a>'
+    with pytest.raises(EntitiesForbidden):
+        xml_to_data(value, fast=fast)
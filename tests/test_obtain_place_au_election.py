@@ -0,0 +1,118 @@
+import csv
+import io
+import time
+
+import pytest
+from scrapy.http import Request, TextResponse
+from scrapy.utils.test import get_crawler
+
+from gather_vision.obtain.core import data
+from gather_vision.obtain.place.au.election import (
+    AustraliaElectionItem,
+    AustraliaElectionWebData,
+)
+
+url = (
+    "https://results.aec.gov.au/13745/Website/Downloads/"
+    "HouseVotesCountedByDivisionDownload-13745.csv"
+)
+columns = (
+    "StateAb,DivisionID,DivisionNm,OrdinaryVotes,AbsentVotes,ProvisionalVotes,"
+    "PrePollVotes,PostalVotes,TotalVotes,TotalPercentage"
+)
+
+
+def _csv_body(count: int) -> bytes:
+    lines = ["2007 Federal Election House of Representatives Downloads", columns]
+    for i in range(count):
+        lines.append(f"QLD,{i},Division {i},{i},2,3,4,5,{i + 14},{i % 100}.5")
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
+def _previous_items(body: bytes) -> list[dict]:
+    # without streaming, the body was decoded and read as a whole
+    return list(csv.DictReader(io.StringIO(body.decode("utf-8").split("\r\n", 1)[1])))
+
+
+def test_australia_election_items(parse_all):
+    crawler = get_crawler(AustraliaElectionWebData)
+    crawler.stats.open_spider(None)
+    web_data = AustraliaElectionWebData.from_crawler(crawler)
+    web_data.csv_chunk_size = 2
+    response = TextResponse(
+        url, body=_csv_body(3), encoding="utf-8", request=Request(url)
+    )
+
+    items = parse_all(web_data.parse(response))
+
+    assert items[1] == AustraliaElectionItem(
+        gather_name="au-election",
+        election_id="13745",
+        state="QLD",
+        division_id="1",
+        division_name="Division 1",
+        ordinary_votes=1,
+        absent_votes=2,
+        provisional_votes=3,
+        pre_poll_votes=4,
+        postal_votes=5,
+        total_votes=15,
+        total_percentage=1.5,
+    )
+    assert len(items) == 3
+    assert crawler.stats.get_value("gather_vision/csv/rows") == 3
+
+
+def test_australia_election_matches_previous():
+    body = _csv_body(50)
+    response = TextResponse(url, body=body, encoding="utf-8", request=Request(url))
+    web_data_available = data.WebDataAvailable(
+        request_url=url,
+        request_method="GET",
+        response_url=url,
+        body_raw=body,
+        status=200,
+        headers={"Content-Type": b"text/csv"},
+        response=response,
+    )
+    web_data = AustraliaElectionWebData()
+
+    items = list(web_data.web_resources(web_data_available))
+
+    expected = _previous_items(body)
+    assert [(i.division_id, i.total_votes) for i in items] == [
+        (i["DivisionID"], int(i["TotalVotes"])) for i in expected
+    ]
+
+
+@pytest.mark.benchmark
+def test_australia_election_throughput():
+    count = 200000
+    body = _csv_body(count)
+    response = TextResponse(url, body=body, encoding="utf-8", request=Request(url))
+    web_data_available = data.WebDataAvailable(
+        request_url=url,
+        request_method="GET",
+        response_url=url,
+        body_raw=body,
+        status=200,
+        headers={"Content-Type": b"text/csv"},
+        response=response,
+    )
+    web_data = AustraliaElectionWebData()
+
+    start = time.perf_counter()
+    previous = sum(int(i["TotalVotes"]) for i in _previous_items(body))
+    previous_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    total = sum(i.total_votes for i in web_data.web_resources(web_data_available))
+    duration = time.perf_counter() - start
+
+    assert total == previous
+    megabytes = len(body) / 1024 / 1024
+    print(
+        f"\nstreamed {count} rows ({megabytes:.1f} MB) in {duration:.3f}s, "
+        f"{count / duration:.0f} rows/s, {megabytes / duration:.1f} MB/s; "
+        f"previous whole body {previous_duration:.3f}s"
+    )
@@ -0,0 +1,70 @@
+from unittest import mock
+
+from scrapy.http import Request, XmlResponse
+
+from gather_vision.apps.explore import models as explore_models
+from gather_vision.apps.transport import models as transport_models
+from gather_vision.obtain.place.au.qld.bcc.transport import (
+    BrisbaneTranslinkNoticesItem,
+    BrisbaneTranslinkNoticesWebData,
+)
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>Translink service notices</title>
+    <pubDate>Mon, 01 Jan 2024 09:00:00 +1000</pubDate>
+    <item>
+      <title>⚠ Temporary stop closure - Adelaide Street</title>
+      <description>(Minor) Stop 45 is closed. Starts affecting: 02/01/2024 4:00 AM Finishes affecting: 03/01/2024 11:00 PM</description>
+      <link>https://translink.com.au/updates/1</link>
+      <guid>https://translink.com.au/updates/1</guid>
+      <category>Minor</category>
+      <category>Bus</category>
+    </item>
+    <item>
+      <title>Timetable changes</title>
+      <description>Start date: 05/01/2024, End date: 06/01/2024, Services: 100, 111</description>
+      <link>https://translink.com.au/updates/2</link>
+      <guid>https://translink.com.au/updates/2</guid>
+      <category>Informative</category>
+    </item>
+  </channel>
+</rss>
+"""
+
+
+def _parse(parse_all) -> list[BrisbaneTranslinkNoticesItem]:
+    url = BrisbaneTranslinkNoticesWebData._notice_url
+    response = XmlResponse(
+        url=url,
+        body=RSS.encode("utf-8"),
+        headers={"Content-Type": "application/rss+xml; charset=utf-8"},
+        request=Request(url),
+    )
+    # the areas are loaded from the database before the first parse
+    with mock.patch.object(
+        explore_models.area_matcher, "arefresh", mock.AsyncMock(return_value=0)
+    ) as arefresh:
+        web_data = BrisbaneTranslinkNoticesWebData()
+        items = parse_all(web_data.parse(response))
+        parse_all(web_data.parse(response))
+    arefresh.assert_awaited_once_with()
+    return items
+
+
+def test_translink_notices_items(parse_all):
+    first, second = _parse(parse_all)
+
+    assert first.title == "Temporary stop closure - Adelaide Street"
+    assert first.url == "https://translink.com.au/updates/1"
+    assert first.issued_date.isoformat() == "2024-01-01T09:00:00+10:00"
+    assert first.start_date.isoformat() == "2024-01-02T04:00:00+10:00"
+    assert first.stop_date.isoformat() == "2024-01-03T23:00:00+10:00"
+    assert first.severity == transport_models.Event.SEVERITY_MINOR
+    assert first.category == transport_models.Event.CATEGORY_BUS_STOP
+
+    assert second.title == "Timetable changes"
+    assert second.start_date.isoformat() == "2024-01-05T00:00:00+10:00"
+    assert second.severity == transport_models.Event.SEVERITY_INFO
+    assert second.category == transport_models.Event.CATEGORY_BUS_SERVICE
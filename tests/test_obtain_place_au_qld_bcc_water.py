@@ -0,0 +1,129 @@
+import dataclasses
+import io
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from gather_vision.obtain.place.au.qld.bcc import water
+
+
+def _workbook(sites: int, dates: int) -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sites"
+    ws.append(["Water quality"])
+    ws.append(
+        ["Site no.", "Site name", "Long", "Lat", "Location description"]
+        + [datetime(2024, 1, 1) + timedelta(days=i) for i in range(dates)]
+    )
+    for site in range(1, sites + 1):
+        ws.append(
+            [site, f"Creek {site}", 153.0, -27.4, f"Under bridge {site}"]
+            + [("NT" if i % 7 == 0 else site + i) for i in range(dates)]
+        )
+    body = io.BytesIO()
+    wb.save(body)
+    return body.getvalue()
+
+
+def _previous_measures(body: bytes) -> list[tuple]:
+    """The previous approach, which read every cell into lists first."""
+    known_headers = ["Site no.", "Site name", "Long", "Lat", "Location description"]
+    wb = load_workbook(filename=io.BytesIO(body), data_only=True, read_only=True)
+    raw = {}
+    for sheet_name in wb.sheetnames:
+        headers = []
+        rows = []
+        for row in wb[sheet_name].rows:
+            cells = [cell for cell in row if cell.value]
+            if len(cells) < 6:
+                any_dates = any([isinstance(cell.value, datetime) for cell in cells])
+                known_header = any([cell.value in known_headers for cell in cells])
+                if not any_dates and not known_header:
+                    continue
+            first = cells[0]
+            if isinstance(first.value, int) or str(first.value)[0].isnumeric():
+                rows.append([(cell.column, cell.value) for cell in cells])
+            else:
+                headers.append([(cell.column, cell.value) for cell in cells])
+        raw[sheet_name] = {"headers": headers, "body": rows}
+    wb.close()
+
+    fields = {
+        "Site no.": "site_number",
+        "Site name": "site_name",
+        "Long": "location_longitude",
+        "Lat": "location_latitude",
+        "Location description": "location_description",
+    }
+    result = []
+    for info in raw.values():
+        header_map = {}
+        for item in info["headers"]:
+            for col, header in item:
+                header_map[col] = header
+        site = {}
+        for row in info["body"]:
+            for col, value in row:
+                header = header_map[col]
+                if header in fields:
+                    site[fields[header]] = value
+                else:
+                    result.append((dict(site), header, value))
+    return result
+
+
+def test_water_quality_rows():
+    measures = list(water.iter_water_quality(io.BytesIO(_workbook(2, 3))))
+
+    assert len(measures) == 6
+    first = measures[0]
+    assert first.site == water.WaterQualitySite(
+        site_number=1,
+        site_name="Creek 1",
+        location_longitude=153.0,
+        location_latitude=-27.4,
+        location_description="Under bridge 1",
+    )
+    assert first.measure_date == datetime(2024, 1, 1)
+    assert first.measure_value == "NT"
+    assert measures[1].measure_value == 2
+
+
+def test_water_quality_matches_previous():
+    body = _workbook(30, 12)
+
+    expected = _previous_measures(body)
+    actual = water.read_water_quality(body)
+
+    assert [
+        (dataclasses.asdict(i.site), i.measure_date, i.measure_value) for i in actual
+    ] == expected
+
+
+@pytest.mark.benchmark
+def test_water_quality_benchmark():
+    body = _workbook(300, 52)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    expected = _previous_measures(body)
+    previous_duration = time.perf_counter() - start
+    _, previous_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    actual = water.read_water_quality(body)
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(actual) == len(expected)
+    print(
+        f"\nprevious {previous_duration:.3f}s, peak {previous_peak} bytes; "
+        f"streaming {duration:.3f}s, peak {peak} bytes"
+    )